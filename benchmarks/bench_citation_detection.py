@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+ATIF TESPİTİ HIZ VE DOĞRULUK ÖLÇÜMÜ
+===================================
+Sentetik korpus (synthetic_corpus.py) üzerinde atıf bulma aşamalarının
+süresini ve doğru cevaba göre isabetini ölçer
+
+Her belge CitationFinder ile, boş bir geçici çıkarma önbelleğiyle ve
+sonuç önbelleği kapalı olarak (ilk çalıştırma koşulları) işlenir. Aşama
+süreleri CitationFinder'ın PDF başına ölçüm kaydından (metrics.py) alınır;
+tablo özet sütunları gösterir:
+- load:     load_pdf (sayfa sayısı; metin tembel çıkarılır)
+- extract:  pdfplumber metin + kelime çıkarma
+- refs:     PHASE 1 kaynakça eşleştirme (DOI, Yazar + Yıl, yakınlık)
+- markers:  PHASE 2 gövde atıf işareti taraması
+- bbox:     atıf işareti ve kaynakça girişi koordinatları
+
+Sayfa/saniye, belgenin toplam sayfa sayısının process_pdf süresine
+oranıdır. Doğruluk: kaynakça sayfası ve referans numarası isabeti, atıf
+sayfalarında kesinlik/duyarlılık. --json çıktısı tüm aşamaları içerir.
+
+--json ile sonuçlar kaydedilir; --baseline ile önceki bir kayıtla
+karşılaştırılır. Doğruluk düşerse veya sayfa/saniye toleranstan fazla
+gerilerse çıkış kodu 1'dir.
+
+Kullanım:
+    python benchmarks/bench_citation_detection.py
+    python benchmarks/bench_citation_detection.py --quick --json sonuc.json
+    python benchmarks/bench_citation_detection.py --baseline sonuc.json --tolerance 0.3
+    python benchmarks/bench_citation_detection.py --quick --profile-dir profiller/
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from synthetic_corpus import (
+    COLUMNS, DEFAULT_SIZES, ROOT, SOURCE_ARTICLE, STYLES,
+    DocumentSpec, GroundTruth, default_corpus, generate_document
+)
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from caching import ExtractionCache
+from config import CitingArticle
+from metrics import PHASES
+from pdf_processor import CitationFinder
+
+# Tabloda gösterilen özet sütunlar -> toplanan aşamalar
+COLUMN_PHASES = {
+    "load": ("load",),
+    "extract": ("extract_text", "extract_words"),
+    "refs": ("references", "reference_doi", "reference_author_year", "reference_proximity"),
+    "markers": ("markers",),
+    "bbox": ("bbox",),
+}
+
+# --quick: yalnızca küçük belgeler (tam korpus tek çekirdekte ~15 dk sürer)
+QUICK_SIZES = (5, 20)
+
+# Karşılaştırılan doğruluk metrikleri (deterministik; hiç düşmemeli)
+ACCURACY_METRICS = ("reference_page", "reference_number", "precision", "recall")
+
+
+def analyze(pdf_path: Path, cache: ExtractionCache, profile_path: Optional[Path] = None) -> dict:
+    """Belgeyi CitationFinder ile işle; ölçüm kaydı ve sonuç"""
+    finder = CitationFinder(SOURCE_ARTICLE, use_result_cache=False, cache=cache)
+
+    # Analizin emoji çıktısı ölçüme karışmaz
+    with contextlib.redirect_stdout(io.StringIO()):
+        article = finder.process_pdf(str(pdf_path), CitingArticle(),
+                                     profile_path=str(profile_path) if profile_path else None)
+
+    return {
+        "metrics": finder.metrics.as_dict(),
+        "result": {
+            "reference_page": article.reference_page,
+            "reference_number": article.reference_number,
+            # Gövdede işaret bulunamazsa kaynakça sayfası döner; bu da ölçülür
+            "citation_pages": article.citation_pages,
+        },
+    }
+
+
+def score(result: dict, truth: GroundTruth) -> Dict[str, Optional[float]]:
+    """Sonucu doğru cevapla karşılaştır (uygulanamayan metrik None)"""
+    detected = set(result["citation_pages"])
+    expected = set(truth.citation_pages)
+    hits = len(detected & expected)
+    return {
+        "reference_page": float(result["reference_page"] == truth.reference_page),
+        "reference_number": (None if truth.reference_number is None
+                             else float(result["reference_number"] == truth.reference_number)),
+        "precision": hits / len(detected) if detected else 0.0,
+        "recall": hits / len(expected) if expected else 1.0,
+    }
+
+
+def _mean(values) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(sum(values) / len(values), 4) if values else None
+
+
+def summarize(records: List[dict], key: str) -> Dict[str, dict]:
+    """Kayıtları key alanına göre (ve 'all' altında toplu) özetle"""
+    groups: Dict[str, List[dict]] = {"all": records}
+    for record in records:
+        groups.setdefault(str(record[key]), []).append(record)
+
+    summary = {}
+    for name, group in groups.items():
+        pages = sum(r["page_count"] for r in group)
+        seconds = sum(r["metrics"]["total_ms"] for r in group) / 1000
+        names = "\n".join(sorted(r["name"] for r in group))
+        summary[name] = {
+            "corpus": hashlib.sha1(names.encode("utf-8")).hexdigest()[:12],
+            "documents": len(group),
+            "pages": pages,
+            "seconds": round(seconds, 3),
+            "pages_per_sec": round(pages / seconds, 1) if seconds else None,
+            "phases_ms": {
+                phase: round(sum(r["metrics"]["phases_ms"][phase] for r in group), 1) for phase in PHASES
+            },
+            **{metric: _mean(r["score"][metric] for r in group) for metric in ACCURACY_METRICS},
+        }
+    return summary
+
+
+def compare(summary: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Önceki kayda göre gerilemeler (boş liste: gerileme yok)
+
+    Yalnızca aynı belgelerden oluşan gruplar karşılaştırılır.
+    """
+    problems = []
+    for name, current in summary.items():
+        previous = baseline.get(name)
+        if previous is None or previous.get("corpus") != current["corpus"]:
+            print(f"⚠️  {name}: önceki ölçümle aynı korpus değil, karşılaştırılmadı")
+            continue
+        for metric in ACCURACY_METRICS:
+            before, after = previous.get(metric), current.get(metric)
+            if before is not None and after is not None and after < before - 1e-9:
+                problems.append(f"{name}: {metric} {before:.3f} -> {after:.3f}")
+        before, after = previous.get("pages_per_sec"), current.get("pages_per_sec")
+        if before and after and after < before * (1 - tolerance):
+            problems.append(f"{name}: sayfa/sn {before:.1f} -> {after:.1f}")
+    return problems
+
+
+def _fmt(value: Optional[float]) -> str:
+    return "   -" if value is None else f"{value:4.2f}"
+
+
+def _column_ms(metrics: dict, column: str) -> float:
+    return sum(metrics["phases_ms"][phase] for phase in COLUMN_PHASES[column])
+
+
+def run(specs: List[DocumentSpec], corpus_dir: Path, profile_dir: Optional[Path] = None) -> List[dict]:
+    """Korpusu (gerekirse) üret ve her belgeyi ölç"""
+    records = []
+    if profile_dir:
+        profile_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = ExtractionCache(Path(cache_dir) / "extraction.sqlite3")
+        for spec in specs:
+            pdf_path, truth = generate_document(spec, corpus_dir)
+            profile_path = profile_dir / f"{spec.name}.prof" if profile_dir else None
+            measured = analyze(pdf_path, cache, profile_path)
+            record = {
+                "name": spec.name,
+                "style": spec.style,
+                "columns": spec.columns,
+                "page_count": truth.page_count,
+                "metrics": measured["metrics"],
+                "result": measured["result"],
+                "truth": {"reference_page": truth.reference_page,
+                          "reference_number": truth.reference_number,
+                          "citation_pages": truth.citation_pages},
+                "score": score(measured["result"], truth),
+            }
+            records.append(record)
+
+            metrics = record["metrics"]
+            total = metrics["total_ms"] / 1000
+            s = record["score"]
+            print(f"{spec.style:<12} {spec.columns}s {truth.page_count:>4}p "
+                  f"{truth.page_count / total if total else 0:>7.1f} s/sn  "
+                  + " ".join(f"{_column_ms(metrics, column):>8.1f}" for column in COLUMN_PHASES)
+                  + f"   ks {_fmt(s['reference_page'])} no {_fmt(s['reference_number'])}"
+                  f" P {_fmt(s['precision'])} R {_fmt(s['recall'])}")
+    return records
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Atıf tespiti hız/doğruluk ölçümü (sentetik korpus)")
+    parser.add_argument("--corpus-dir", type=Path, default=None,
+                        help="Korpus dizini (varsa yeniden kullanılır; verilmezse geçici)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--quick", action="store_true", help=f"Yalnızca {QUICK_SIZES} sayfalık belgeler")
+    parser.add_argument("--styles", nargs="+", choices=STYLES, default=list(STYLES))
+    parser.add_argument("--columns", type=int, nargs="+", choices=COLUMNS, default=list(COLUMNS))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="Sonuçları bu dosyaya yaz")
+    parser.add_argument("--baseline", type=Path, help="Karşılaştırılacak önceki --json çıktısı")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="İzin verilen sayfa/sn düşüşü (oran, varsayılan 0.25)")
+    parser.add_argument("--profile-dir", type=Path,
+                        help="Her belgenin cProfile dökümünü (<ad>.prof) bu dizine yaz")
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else args.sizes
+    specs = default_corpus(sizes, args.styles, args.columns, args.seed)
+    print(f"{'stil':<12} sütun sayfa   hız     " + " ".join(f"{c:>8}" for c in COLUMN_PHASES) + "   (ms)")
+
+    if args.corpus_dir:
+        records = run(specs, args.corpus_dir, args.profile_dir)
+    else:
+        with tempfile.TemporaryDirectory() as corpus_dir:
+            records = run(specs, Path(corpus_dir), args.profile_dir)
+
+    summary = summarize(records, "style")
+    print()
+    for name, s in summary.items():
+        print(f"{name:<12} {s['documents']:>3} belge {s['pages']:>6} sayfa {s['pages_per_sec'] or 0:>8.1f} s/sn  "
+              f"ks {_fmt(s['reference_page'])} no {_fmt(s['reference_number'])} "
+              f"P {_fmt(s['precision'])} R {_fmt(s['recall'])}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "documents": records}, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            problems = compare(summary, json.load(f)["summary"], args.tolerance)
+        for problem in problems:
+            print(f"FAIL {problem}")
+        if problems:
+            return 1
+        print("Önceki ölçüme göre gerileme yok")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+İÇE AKTARMA SÜRESİ ÖLÇÜMÜ
+=========================
+CLI ve işçi giriş modüllerinin açılış maliyetini ölçer
+
+Her modül ayrı ve temiz bir Python sürecinde birkaç kez içe aktarılır; en
+iyi süre bütçeyle karşılaştırılır. Ayrıca ağır kütüphanelerin (pdfplumber,
+pypdf, reportlab, openpyxl) içe aktarma sırasında yüklenmediği kontrol
+edilir. Bütçe aşılırsa veya ağır bir kütüphane yüklenirse çıkış kodu 1'dir.
+
+Kullanım:
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --budget-ms 300 --repeat 7
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Web arayüzünün ve CLI'nın süreç başına açtığı giriş modülleri
+ENTRY_MODULES = ("main", "check_citation_cli", "worker_cli", "extract_doi", "import_utils")
+
+# Giriş modülleri içe aktarılırken yüklenmemesi gereken kütüphaneler
+HEAVY_MODULES = ("pdfplumber", "pypdf", "reportlab", "openpyxl", "PIL")
+
+DEFAULT_BUDGET_MS = 150.0
+
+_PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Modülü temiz süreçlerde içe aktar; en iyi süre ve yüklenen ağır kütüphaneler"""
+    best = None
+    heavy = set()
+    for _ in range(repeat):
+        code = _PROBE.format(root=str(ROOT), module=module, heavy=HEAVY_MODULES)
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=str(ROOT),
+            capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        best = result["ms"] if best is None else min(best, result["ms"])
+        heavy.update(result["heavy"])
+    return {"module": module, "ms": round(best, 1), "heavy": sorted(heavy)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Giriş modüllerinin içe aktarma süresi")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Modül başına izin verilen en uzun süre (ms)")
+    parser.add_argument("--repeat", type=int, default=5, help="Modül başına ölçüm sayısı")
+    parser.add_argument("modules", nargs="*", default=list(ENTRY_MODULES))
+    args = parser.parse_args()
+
+    failed = False
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        ok = result["ms"] <= args.budget_ms and not result["heavy"]
+        failed |= not ok
+        status = "OK  " if ok else "FAIL"
+        heavy = f"  ağır: {', '.join(result['heavy'])}" if result["heavy"] else ""
+        print(f"{status} {module:<20} {result['ms']:>8.1f} ms{heavy}")
+
+    print(f"Bütçe: {args.budget_ms:.0f} ms / modül")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+"""
+SENTETİK ATIF YAPAN MAKALE ÜRETECİ
+==================================
+Gerçek (telifli) PDF'ler olmadan atıf tespitini ölçmek için, doğru cevabı
+bilinen atıf yapan makaleler üretir (reportlab ile)
+
+Her belge için:
+- Atıf stili: köşeli parantez [12], üslü ¹² veya yazar-yıl (Gül et al., 2019)
+- Tek veya iki sütunlu düzen, 5-400 sayfa
+- Farklı uzunlukta kaynakça (numaralı veya alfabetik)
+- Gövde metninde başka kaynaklara gruplu/aralıklı atıflar ve sayısal
+  çeldiriciler (p < 0.05, n = 42, Tablo numaraları)
+
+Yerleşim satır satır hesaplandığı için doğru cevap (kaynakça sayfası,
+referans numarası, hedef atıf işaretlerinin düştüğü sayfalar) çizim
+sırasında kaydedilir; PDF okunarak tahmin edilmez.
+
+Kullanım:
+    python benchmarks/synthetic_corpus.py çıktı_dizini
+    python benchmarks/synthetic_corpus.py çıktı_dizini --sizes 5 40 --styles bracket
+"""
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from config import SourceArticle
+
+# Üretim mantığı değiştiğinde artırılmalı (diskteki korpus yeniden üretilir)
+CORPUS_VERSION = 1
+
+STYLES = ("bracket", "superscript", "author-year")
+COLUMNS = (1, 2)
+DEFAULT_SIZES = (5, 20, 80, 400)
+
+# Atıf yapılan (hedef) kaynak makale; Türkçe karakterli soyadı bilinçli seçildi
+SOURCE_ARTICLE = SourceArticle(
+    title="Adaptive sampling strategies for sparse sensor networks",
+    authors=["Ahmet Gül", "Elif Şahin", "Mark Peterson"],
+    journal="Journal of Applied Sensing",
+    year=2019,
+    volume="14",
+    issue="3",
+    pages="211-229",
+    doi="10.1016/j.jas.2019.04.012",
+)
+
+# Sayfa geometrisi (A4, pt)
+PAGE_WIDTH, PAGE_HEIGHT = 595.27, 841.89
+MARGIN = 64.0
+COLUMN_GAP = 18.0
+FONT_SIZE = 9.5
+LEADING = 12.0
+SUPER_SCALE = 0.7
+SUPER_RISE = 3.5
+
+_WORDS = (
+    "analysis data model results method approach performance network sensor "
+    "signal sampling estimation error variance distribution measurement system "
+    "framework parameter observed proposed significant robust adaptive sparse "
+    "efficient accuracy dataset experiment baseline evaluation bias noise "
+    "structure temporal spatial dynamic optimal algorithm process previous "
+    "recent study studies evidence field condition response effect factor "
+    "control population sample cohort treatment outcome rate level increase "
+    "decrease compared across within between under during using based shows "
+    "suggest indicate consistent reported found demonstrate improve reduce "
+    "the of and in to for with on that this these which were was is are "
+    "by from as an a be has have been also however moreover further"
+).split()
+
+_SURNAMES = (
+    "Smith Chen Müller Kaya Yılmaz Demir Rossi Tanaka Novak Silva Andersen "
+    "Kowalski Ivanova Haddad Okafor Nguyen Garcia Dubois Larsen Öztürk Çelik "
+    "Arslan Fischer Moreau Bianchi Costa Lindqvist Horvath Petrov Kim Park "
+    "Sato Wang Li Zhang Brown Taylor Wilson Martin Lee Walker Hall Allen Young"
+).split()
+
+_JOURNALS = (
+    "Sensors and Systems", "Journal of Applied Statistics", "Signal Processing Letters",
+    "Environmental Monitoring Review", "Computational Methods in Engineering",
+    "International Journal of Network Science", "Measurement", "Data in Brief",
+)
+
+
+@dataclass
+class DocumentSpec:
+    """Üretilecek bir belgenin tanımı"""
+    style: str              # bracket | superscript | author-year
+    columns: int            # 1 | 2
+    pages: int              # Hedef toplam sayfa sayısı
+    ref_count: int          # Kaynakça uzunluğu
+    citations: int          # Hedef kaynağa atıf yapılan gövde sayfası sayısı
+    seed: int
+
+    @property
+    def name(self) -> str:
+        return (f"v{CORPUS_VERSION}_{self.style}_{self.columns}col_{self.pages}p_"
+                f"{self.ref_count}r_{self.citations}c_s{self.seed}")
+
+
+@dataclass
+class GroundTruth:
+    """Belge üretilirken kaydedilen doğru cevap"""
+    page_count: int
+    reference_page: int                  # Hedef kaynakça girişinin başladığı sayfa
+    reference_number: Optional[int]      # Yazar-yıl stilinde None
+    citation_pages: List[int] = field(default_factory=list)
+
+
+# ============================================================================
+# KORPUS TANIMI
+# ============================================================================
+
+def default_corpus(sizes=DEFAULT_SIZES, styles=STYLES, columns=COLUMNS, seed: int = 7) -> List[DocumentSpec]:
+    """
+    Stil × sütun × sayfa matrisi; kaynakça uzunluğu sayfa sayısıyla ölçeklenir
+
+    Her belgenin tohumu yalnızca kendi tanımından türetilir; matrisin bir
+    alt kümesi (örn. --sizes 400) tam korpustaki belgelerin aynısını üretir.
+    """
+    specs = []
+    for style in styles:
+        for cols in columns:
+            for pages in sizes:
+                rng = random.Random(f"{seed}-{style}-{cols}-{pages}")
+                ref_count = rng.randint(max(8, pages // 4), max(30, min(300, pages * 3)))
+                citations = min(rng.randint(1, 4), max(1, pages // 3))
+                specs.append(DocumentSpec(style, cols, pages, ref_count, citations, rng.randrange(10**6)))
+    return specs
+
+
+# ============================================================================
+# METİN ÜRETİMİ
+# ============================================================================
+
+# Bir satır parçası: (metin, üslü mü, hedef atıf işareti mi)
+Segment = Tuple[str, bool, bool]
+
+
+class _TextGenerator:
+    """Belge başına tohumlanmış metin ve atıf işareti üreteci"""
+
+    def __init__(self, spec: DocumentSpec, target: int, entries: List[dict]):
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.target = target          # Hedef kaynağın kaynakçadaki sırası (1 tabanlı)
+        self.entries = entries
+
+    def sentence(self) -> str:
+        words = [self.rng.choice(_WORDS) for _ in range(self.rng.randint(8, 22))]
+        if self.rng.random() < 0.25:
+            words.insert(self.rng.randrange(len(words)), self._distractor())
+        text = " ".join(words)
+        return text[0].upper() + text[1:]
+
+    def _distractor(self) -> str:
+        """Atıf işaretine benzeyebilen sayısal ifadeler"""
+        n = self.rng.randint(1, self.spec.ref_count + 20)
+        return self.rng.choice((
+            f"(n = {n})", f"(p < 0.0{self.rng.randint(1, 5)})", f"Table {self.rng.randint(1, 6)}",
+            f"in {self.rng.randint(1990, 2023)}", f"{n}%", f"Fig. {self.rng.randint(1, 9)}",
+        ))
+
+    def _other_refs(self, count: int) -> List[int]:
+        pool = [n for n in range(1, self.spec.ref_count + 1) if n != self.target]
+        return sorted(self.rng.sample(pool, min(count, len(pool))))
+
+    def _numeric_marker(self, refs: List[int], use_range: bool) -> str:
+        if use_range:
+            return f"{refs[0]}–{refs[-1]}"
+        # Üslü gruplar boşluksuz yazılır: ³,¹²
+        sep = ", " if self.spec.style == "bracket" else ","
+        return sep.join(str(n) for n in refs)
+
+    def marker(self, cite_target: bool) -> Tuple[str, bool]:
+        """(işaret metni, üslü mü)"""
+        style = self.spec.style
+        if style == "author-year":
+            entry = self.entries[self.target - 1] if cite_target else self.entries[self._other_refs(1)[0] - 1]
+            surname = entry["surnames"][0]
+            if len(entry["surnames"]) > 2:
+                who = f"{surname} et al."
+            elif len(entry["surnames"]) == 2:
+                who = f"{surname} and {entry['surnames'][1]}"
+            else:
+                who = surname
+            return f"({who}, {entry['year']})", False
+
+        kind = self.rng.random()
+        if cite_target and kind < 0.5:
+            refs, use_range = [self.target], False
+        elif cite_target and kind < 0.8:
+            refs, use_range = sorted(self._other_refs(self.rng.randint(1, 3)) + [self.target]), False
+        elif cite_target:
+            lo = max(1, self.target - self.rng.randint(1, 3))
+            hi = min(self.spec.ref_count, self.target + self.rng.randint(1, 3))
+            refs, use_range = [lo, hi] if lo < hi else [self.target], lo < hi
+        else:
+            refs = self._other_refs(self.rng.randint(1, 3))
+            use_range = False
+            # Hedefi kapsamayan ardışık bir aralık
+            if kind < 0.2 and refs[0] + 2 < self.target:
+                refs, use_range = [refs[0], min(refs[0] + self.rng.randint(2, 5), self.target - 1)], True
+        text = self._numeric_marker(refs, use_range)
+        if style == "bracket":
+            return f"[{text}]", False
+        return text, True
+
+    def paragraph(self, cite_target: bool) -> List[Segment]:
+        """
+        Kelime/işaret parçalarından oluşan paragraf
+
+        Köşeli parantez ve yazar-yıl işaretleri cümle noktasından önce,
+        üslü işaretler noktadan hemen sonra gelir.
+        """
+        segments: List[Segment] = []
+        sentences = self.rng.randint(3, 7)
+        target_at = self.rng.randrange(min(2, sentences)) if cite_target else -1
+        for i in range(sentences):
+            words = self.sentence().split(" ")
+            is_target = i == target_at
+            has_marker = is_target or self.rng.random() < 0.35
+            for word in words[:-1]:
+                segments.append((word, False, False))
+            last = words[-1]
+            if not has_marker:
+                segments.append((last + ".", False, False))
+                continue
+            text, sup = self.marker(is_target)
+            if sup:
+                segments.append((last + ".", False, False))
+                segments.append((text, True, is_target))
+            else:
+                segments.append((last, False, False))
+                segments.append((text + ".", False, is_target))
+        return segments
+
+
+def _initials(first_names: str) -> str:
+    return "".join(part[0] for part in first_names.split())
+
+
+def _make_entries(spec: DocumentSpec, rng: random.Random) -> Tuple[List[dict], int]:
+    """Kaynakça girişleri ve hedef kaynağın (1 tabanlı) sırası"""
+    source_first = SOURCE_ARTICLE.authors[0].split()[-1]
+    entries = []
+    for _ in range(spec.ref_count - 1):
+        surnames = rng.sample([s for s in _SURNAMES if s != source_first], rng.randint(1, 5))
+        entries.append({
+            "surnames": surnames,
+            "initials": [rng.choice("ABCDEFGHJKLMNPRSTVWY") for _ in surnames],
+            "year": rng.randint(1988, 2024),
+            "title": " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 14))).capitalize(),
+            "journal": rng.choice(_JOURNALS),
+            "volume": str(rng.randint(1, 90)),
+            "issue": str(rng.randint(1, 12)),
+            "pages": f"{(p := rng.randint(1, 900))}-{p + rng.randint(5, 30)}",
+            "doi": f"10.{rng.randint(1000, 9999)}/{rng.choice('abcdefgh')}{rng.randint(10000, 99999)}"
+                   if rng.random() < 0.7 else "",
+            "target": False,
+        })
+
+    source = SOURCE_ARTICLE
+    entries.append({
+        "surnames": [a.split()[-1] for a in source.authors],
+        "initials": [_initials(" ".join(a.split()[:-1])) for a in source.authors],
+        "year": source.year,
+        "title": source.title,
+        "journal": source.journal,
+        "volume": source.volume,
+        "issue": source.issue,
+        "pages": source.pages,
+        "doi": source.doi if rng.random() < 0.75 else "",
+        "target": True,
+    })
+
+    if spec.style == "author-year":
+        entries.sort(key=lambda e: (e["surnames"][0], e["year"]))
+    else:
+        rng.shuffle(entries)
+    target = next(i for i, e in enumerate(entries, 1) if e["target"])
+    return entries, target
+
+
+def _format_entry(entry: dict, number: int, style: str) -> str:
+    if style == "author-year":
+        names = [f"{s}, {i}." for s, i in zip(entry["surnames"], entry["initials"])]
+        authors = names[0] if len(names) == 1 else ", ".join(names[:-1]) + ", & " + names[-1]
+        text = (f"{authors} ({entry['year']}). {entry['title']}. {entry['journal']}, "
+                f"{entry['volume']}({entry['issue']}), {entry['pages']}.")
+        if entry["doi"]:
+            text += f" https://doi.org/{entry['doi']}"
+        return text
+
+    authors = ", ".join(f"{s} {i}" for s, i in zip(entry["surnames"], entry["initials"]))
+    text = (f"{authors}. {entry['title']}. {entry['journal']}. "
+            f"{entry['year']};{entry['volume']}({entry['issue']}):{entry['pages']}.")
+    if entry["doi"]:
+        text += f" doi:{entry['doi']}"
+    prefix = f"[{number}]" if style == "bracket" else f"{number}."
+    return f"{prefix} {text}"
+
+
+# ============================================================================
+# YERLEŞİM
+# ============================================================================
+
+@dataclass
+class _Line:
+    x: float
+    y: float
+    segments: List[Segment]
+    bold: bool = False
+    size: float = FONT_SIZE
+
+
+class _Layout:
+    """Satırları sütunlara ve sayfalara yerleştirir (çizim ayrı yapılır)"""
+
+    def __init__(self, columns: int, font: str):
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+        self._width = stringWidth
+        self.font = font
+        self.columns = columns
+        self.col_width = (PAGE_WIDTH - 2 * MARGIN - (columns - 1) * COLUMN_GAP) / columns
+        self.pages: List[List[_Line]] = []
+        self.new_page()
+
+    def new_page(self, top: float = PAGE_HEIGHT - MARGIN):
+        self.pages.append([])
+        self.column = 0
+        self.top = top
+        self.y = top
+
+    @property
+    def page_number(self) -> int:
+        return len(self.pages)
+
+    def _advance(self, leading: float):
+        if self.y - leading < MARGIN:
+            if self.column + 1 < self.columns:
+                self.column += 1
+                self.y = self.top
+            else:
+                self.new_page()
+        self.y -= leading
+
+    def seg_width(self, seg: Segment, size: float = FONT_SIZE) -> float:
+        text, sup, _ = seg
+        return self._width(text, self.font, size * SUPER_SCALE if sup else size)
+
+    def add_full_width(self, text: str, size: float, bold: bool = False):
+        """Sütunlardan önce sayfa genişliğinde satırlar (başlık, özet)"""
+        words = text.split(" ")
+        width = PAGE_WIDTH - 2 * MARGIN
+        line: List[str] = []
+        for word in words + [None]:
+            candidate = " ".join(line + [word]) if word else None
+            if word and self._width(candidate, self.font, size) <= width:
+                line.append(word)
+                continue
+            self.y -= size * 1.3
+            self.pages[-1].append(_Line(MARGIN, self.y, [(" ".join(line), False, False)], bold, size))
+            line = [word] if word else []
+        self.top = self.y - LEADING
+
+    def add_paragraph(self, segments: List[Segment], indent: float = 0.0,
+                      max_pages: Optional[int] = None) -> Tuple[List[int], bool]:
+        """
+        Paragrafı satırlara böl ve yerleştir
+
+        max_pages aşılırsa taşan sayfa atılır ve paragraf yarıda kalır.
+
+        Returns:
+            (hedef parçaların düştüğü sayfalar, paragraf tamamlandı mı)
+        """
+        target_pages = []
+        space = self._width(" ", self.font, FONT_SIZE)
+        line: List[Segment] = []
+        first = True
+        width = indent
+        for seg in segments + [None]:
+            if seg is not None:
+                w = self.seg_width(seg)
+                # Üslü işaret önceki kelimeye boşluksuz yapışır
+                gap = 0.0 if (not line or seg[1]) else space
+                if width + gap + w <= self.col_width or not line:
+                    line.append(seg)
+                    width += gap + w
+                    continue
+            self._advance(LEADING)
+            if max_pages and self.page_number > max_pages:
+                self.pages.pop()
+                return target_pages, False
+            x = MARGIN + self.column * (self.col_width + COLUMN_GAP) + (indent if first else 0.0)
+            self.pages[-1].append(_Line(x, self.y, line))
+            target_pages.extend(self.page_number for s in line if s[2])
+            first = False
+            line, width = ([seg], self.seg_width(seg)) if seg is not None else ([], 0.0)
+        self.y -= LEADING * 0.4
+        return target_pages, True
+
+
+def _render(path: Path, pages: List[List[_Line]], font: str, bold_font: str, running_head: str):
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(str(path), pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    for number, lines in enumerate(pages, 1):
+        c.setFont(font, 7.5)
+        c.drawString(MARGIN, PAGE_HEIGHT - MARGIN + 20, running_head)
+        c.drawCentredString(PAGE_WIDTH / 2, MARGIN - 28, str(number))
+        for line in lines:
+            x = line.x
+            for i, (text, sup, _) in enumerate(line.segments):
+                if i and not sup:
+                    x += c.stringWidth(" ", font, line.size)
+                size = line.size * SUPER_SCALE if sup else line.size
+                face = bold_font if line.bold else font
+                c.setFont(face, size)
+                c.drawString(x, line.y + (SUPER_RISE if sup else 0.0), text)
+                x += c.stringWidth(text, face, size)
+        c.showPage()
+    c.save()
+
+
+def _fonts() -> Tuple[str, str]:
+    """Türkçe karakterleri gömülü fontla yaz (DejaVu yoksa standart Times)"""
+    from document_builder import StyleManager
+    if StyleManager.register_fonts():
+        return "DejaVuSerif", "DejaVuSerif-Bold"
+    return "Times-Roman", "Times-Bold"
+
+
+def generate_document(spec: DocumentSpec, output_dir: Path) -> Tuple[Path, GroundTruth]:
+    """
+    Belgeyi ve doğru cevap dosyasını (<ad>.json) üret
+
+    Aynı adla (sürüm + tanım) üretilmiş belge varsa yeniden üretilmez.
+    """
+    output_dir = Path(output_dir)
+    pdf_path = output_dir / f"{spec.name}.pdf"
+    truth_path = output_dir / f"{spec.name}.json"
+    if pdf_path.exists() and truth_path.exists():
+        with open(truth_path, "r", encoding="utf-8") as f:
+            return pdf_path, GroundTruth(**json.load(f)["truth"])
+
+    rng = random.Random(spec.seed)
+    entries, target = _make_entries(spec, rng)
+    font, bold_font = _fonts()
+    text = _TextGenerator(spec, target, entries)
+
+    # Önce kaynakça dizilir: gövdeye kalan sayfa sayısı buna göre belirlenir.
+    # Hedef girişin ilk parçası işaretlenir; düştüğü sayfa kaynakça sayfasıdır
+    refs = _Layout(spec.columns, font)
+    refs.add_full_width("References", 12, bold=True)
+    ref_start = 0
+    for number, entry in enumerate(entries, 1):
+        words = _format_entry(entry, number, spec.style).split(" ")
+        segments = [(w, False, number == target and i == 0) for i, w in enumerate(words)]
+        landed, _ = refs.add_paragraph(segments)
+        ref_start = landed[0] if landed else ref_start
+    body_pages = max(1, spec.pages - len(refs.pages))
+
+    body = _Layout(spec.columns, font)
+    body.add_full_width(f"A synthetic study of {text.sentence().lower()}", 15, bold=True)
+    body.add_full_width("Jane Doe, Mehmet Yıldız, Carlos Ortega", 10)
+    body.add_full_width("Abstract. " + " ".join(text.sentence() + "." for _ in range(4)), FONT_SIZE)
+
+    # Gövde tam body_pages sayfayı dolduracak kadar paragrafla yazılır
+    target_set = set(rng.sample(range(1, body_pages + 1), min(spec.citations, body_pages)))
+    citation_pages = set()
+    complete = True
+    while complete:
+        page = body.page_number
+        cite = page in target_set and page not in citation_pages
+        landed, complete = body.add_paragraph(text.paragraph(cite), indent=12.0, max_pages=body_pages)
+        citation_pages.update(landed)
+
+    pages = body.pages + refs.pages
+    truth = GroundTruth(
+        page_count=len(pages),
+        reference_page=len(body.pages) + ref_start,
+        reference_number=None if spec.style == "author-year" else target,
+        citation_pages=sorted(citation_pages),
+    )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    running_head = f"Synthetic Journal of Benchmarks · {spec.style} · {spec.columns} col"
+    _render(pdf_path, pages, font, bold_font, running_head)
+    with open(truth_path, "w", encoding="utf-8") as f:
+        json.dump({"spec": asdict(spec), "truth": asdict(truth)}, f, ensure_ascii=False, indent=2)
+    return pdf_path, truth
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sentetik atıf yapan makale korpusu üret")
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--styles", nargs="+", choices=STYLES, default=list(STYLES))
+    parser.add_argument("--columns", type=int, nargs="+", choices=COLUMNS, default=list(COLUMNS))
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for spec in default_corpus(args.sizes, args.styles, args.columns, args.seed):
+        path, truth = generate_document(spec, args.output_dir)
+        print(f"{path.name}: {truth.page_count} sayfa, kaynakça s.{truth.reference_page}, "
+              f"atıf sayfaları {truth.citation_pages}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+ÖNBELLEK MODÜLÜ
+===============
+PDF metin çıkarma sonuçlarının diskte saklanması
+
+İşlevler:
+- PDF içerik hash'i hesaplama
+- Sayfa metinleri ve referans sayfası işaretlerinin saklanması
+- Sayfa kelimeleri ve koordinatlarının (bbox) saklanması
+- Boyut sınırı aşıldığında en eski kullanılan kayıtların silinmesi
+- Atıf analizi sonuçlarının (PDF hash'i + kaynak makale + algoritma
+  sürümü anahtarıyla) saklanması
+- Final doküman atıf segmentlerinin (PDF dosyaları) girdi hash'i ile saklanması
+
+Anahtar, PDF'in içerik hash'i (SHA-256) ve çıkarıcı sürümünden oluşur;
+dosya adı veya konumu değişse de aynı PDF önbellekten okunur. Veritabanı
+WAL modunda açılır, böylece paralel işçiler aynı anda yazabilir.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import (
+    EXTRACTION_CACHE_PATH, EXTRACTION_CACHE_MAX_BYTES,
+    SEGMENT_CACHE_DIR, SEGMENT_CACHE_MAX_BYTES
+)
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Dosya içeriğinin SHA-256 hash'ini döndür"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_hash_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def cached_file_sha256(path: str) -> str:
+    """
+    file_sha256, süreç içinde (yol, boyut, mtime) ile hatırlanır
+
+    Aynı dosya bir oturumda defalarca hash'lenmez; dosya değişirse boyut
+    veya mtime değişeceği için yeniden hesaplanır.
+    """
+    st = os.stat(path)
+    memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    digest = _hash_memo.get(memo_key)
+    if digest is None:
+        digest = _hash_memo[memo_key] = file_sha256(path)
+    return digest
+
+
+class ExtractionCache:
+    """
+    PDF metin çıkarma önbelleği (SQLite, WAL modu)
+
+    Her belge için sayfa sayısı, toplam boyut ve son erişim zamanı;
+    her sayfa için metin, referans sayfası işareti ve (ihtiyaç olursa)
+    kelime koordinatları saklanır. Atıf analizi sonuçları ayrı bir tabloda,
+    girdilerden üretilen anahtarla tutulur; boyutları sınıra dahildir ve
+    belgelerle birlikte son erişim sırasına göre silinirler.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            doc_key TEXT PRIMARY KEY,
+            page_count INTEGER NOT NULL,
+            size_bytes INTEGER NOT NULL DEFAULT 0,
+            last_access REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS pages (
+            doc_key TEXT NOT NULL,
+            page_number INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            is_reference_page INTEGER NOT NULL,
+            PRIMARY KEY (doc_key, page_number)
+        );
+        CREATE TABLE IF NOT EXISTS page_words (
+            doc_key TEXT NOT NULL,
+            page_number INTEGER NOT NULL,
+            words TEXT NOT NULL,
+            PRIMARY KEY (doc_key, page_number)
+        );
+        CREATE TABLE IF NOT EXISTS analysis_results (
+            result_key TEXT PRIMARY KEY,
+            fields TEXT NOT NULL,
+            last_access REAL NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.db_path = Path(db_path) if db_path else EXTRACTION_CACHE_PATH
+        self.max_bytes = max_bytes if max_bytes is not None else EXTRACTION_CACHE_MAX_BYTES
+        self._local = threading.local()
+
+    # fork() ile devralınan bağlantılar: alt süreçte kullanılmaz, kapatılmaz da
+    # (kapatmak üst sürecin WAL/kilit durumunu bozabilir); yalnızca tutulur
+    _inherited_connections: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        İş parçacığına özel bağlantıyı döndür (gerekirse oluştur)
+
+        SQLite bağlantıları fork() üzerinden taşınamaz; bağlantı başka bir
+        süreçte (üst süreçte) açıldıysa bu süreç için yenisi açılır.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid != os.getpid():
+            ExtractionCache._inherited_connections.append(conn)
+            conn = None
+        if conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def make_key(pdf_path: str, version: str) -> str:
+        """İçerik hash'i + çıkarıcı sürümünden önbellek anahtarı oluştur"""
+        return f"{cached_file_sha256(pdf_path)}:{version}"
+
+    def get_pages(self, doc_key: str) -> Optional[Tuple[int, Dict[int, Tuple[str, bool]]]]:
+        """
+        Önbellekteki sayfaları getir
+
+        Returns:
+            (page_count, {page_number: (text, is_reference_page)}) veya None
+        """
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT page_count FROM documents WHERE doc_key = ?", (doc_key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            conn.execute(
+                "UPDATE documents SET last_access = ? WHERE doc_key = ?",
+                (time.time(), doc_key)
+            )
+            pages = {
+                page_number: (text, bool(is_ref))
+                for page_number, text, is_ref in conn.execute(
+                    "SELECT page_number, text, is_reference_page FROM pages WHERE doc_key = ?",
+                    (doc_key,)
+                )
+            }
+            return row[0], pages
+        except sqlite3.Error as e:
+            print(f"⚠️  Önbellek okuma hatası: {e}")
+            return None
+
+    def put_pages(self, doc_key: str, page_count: int,
+                  pages: Iterable[Tuple[int, str, bool]]) -> None:
+        """Sayfaları tek bir işlemde önbelleğe yaz"""
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = 0
+                for page_number, text, is_ref in pages:
+                    # Yeniden yazılan sayfanın eski boyutu düşülür
+                    added -= self._stored_bytes(conn, "pages", "text", doc_key, page_number)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?)",
+                        (doc_key, page_number, text, int(is_ref))
+                    )
+                    added += len(text.encode('utf-8'))
+                conn.execute(
+                    """
+                    INSERT INTO documents (doc_key, page_count, size_bytes, last_access)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(doc_key) DO UPDATE SET
+                        page_count = excluded.page_count,
+                        size_bytes = documents.size_bytes + excluded.size_bytes,
+                        last_access = excluded.last_access
+                    """,
+                    (doc_key, page_count, added, time.time())
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️  Önbellek yazma hatası: {e}")
+
+    def get_words(self, doc_key: str, page_number: int) -> Optional[List[dict]]:
+        """Sayfanın kelime/koordinat listesini getir"""
+        try:
+            row = self._connect().execute(
+                "SELECT words FROM page_words WHERE doc_key = ? AND page_number = ?",
+                (doc_key, page_number)
+            ).fetchone()
+            if row is None:
+                return None
+            return [
+                {'text': text, 'x0': x0, 'top': top, 'x1': x1, 'bottom': bottom}
+                for text, x0, top, x1, bottom in json.loads(row[0])
+            ]
+        except sqlite3.Error as e:
+            print(f"⚠️  Önbellek okuma hatası: {e}")
+            return None
+
+    def put_words(self, doc_key: str, page_number: int, words: List[dict]) -> None:
+        """Sayfanın kelime/koordinat listesini yaz (belge kaydı önceden olmalı)"""
+        payload = json.dumps(
+            [[w['text'], w['x0'], w['top'], w['x1'], w['bottom']] for w in words],
+            ensure_ascii=False
+        )
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                replaced = self._stored_bytes(conn, "page_words", "words", doc_key, page_number)
+                conn.execute(
+                    "INSERT OR REPLACE INTO page_words VALUES (?, ?, ?)",
+                    (doc_key, page_number, payload)
+                )
+                conn.execute(
+                    "UPDATE documents SET size_bytes = size_bytes + ? WHERE doc_key = ?",
+                    (len(payload.encode('utf-8')) - replaced, doc_key)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️  Önbellek yazma hatası: {e}")
+
+    @staticmethod
+    def _stored_bytes(conn: sqlite3.Connection, table: str, column: str,
+                      doc_key: str, page_number: int) -> int:
+        """Satırda kayıtlı içeriğin UTF-8 bayt boyutu (satır yoksa 0)"""
+        row = conn.execute(
+            f"SELECT length(CAST({column} AS BLOB)) FROM {table} WHERE doc_key = ? AND page_number = ?",
+            (doc_key, page_number)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Toplam boyut sınırı aşıldıysa en eski kullanılan belgeleri/sonuçları sil"""
+        total = conn.execute(
+            """
+            SELECT (SELECT COALESCE(SUM(size_bytes), 0) FROM documents)
+                 + (SELECT COALESCE(SUM(length(CAST(fields AS BLOB))), 0) FROM analysis_results)
+            """
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                """
+                SELECT 0, doc_key, size_bytes, last_access FROM documents
+                UNION ALL
+                SELECT 1, result_key, length(CAST(fields AS BLOB)), last_access FROM analysis_results
+                ORDER BY last_access
+                """
+            ).fetchall()
+            for is_result, key, size, _ in rows:
+                if total <= self.max_bytes:
+                    break
+                if is_result:
+                    conn.execute("DELETE FROM analysis_results WHERE result_key = ?", (key,))
+                else:
+                    conn.execute("DELETE FROM pages WHERE doc_key = ?", (key,))
+                    conn.execute("DELETE FROM page_words WHERE doc_key = ?", (key,))
+                    conn.execute("DELETE FROM documents WHERE doc_key = ?", (key,))
+                total -= size
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get_analysis(self, result_key: str) -> Optional[dict]:
+        """Önbellekteki atıf analizi sonucunu ({alan adı: değer}) getir"""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT fields FROM analysis_results WHERE result_key = ?", (result_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE analysis_results SET last_access = ? WHERE result_key = ?",
+                (time.time(), result_key)
+            )
+            return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            print(f"⚠️  Önbellek okuma hatası: {e}")
+            return None
+
+    def put_analysis(self, result_key: str, fields: dict) -> None:
+        """Atıf analizi sonucunu yaz"""
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO analysis_results VALUES (?, ?, ?)",
+                (result_key, json.dumps(fields, ensure_ascii=False), time.time())
+            )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️  Önbellek yazma hatası: {e}")
+
+    def clear(self) -> None:
+        """Tüm önbelleği temizle"""
+        conn = self._connect()
+        conn.execute("DELETE FROM pages")
+        conn.execute("DELETE FROM page_words")
+        conn.execute("DELETE FROM documents")
+        conn.execute("DELETE FROM analysis_results")
+
+
+_default_cache: Optional[ExtractionCache] = None
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Süreç genelinde paylaşılan önbellek nesnesini döndür"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExtractionCache()
+    return _default_cache
+
+
+class SegmentCache:
+    """
+    Final doküman atıf segmentleri için içerik adresli dosya önbelleği
+
+    Anahtar, segmenti belirleyen tüm girdilerin (PDF ve kapak hash'leri,
+    sayfa numaraları, bbox'lar, başlık metinleri, sürüm) hash'idir. Her
+    kayıt <anahtar>.pdf ve başlık düzenini tutan <anahtar>.json dosyasıdır;
+    girdileri değişmeyen segment aynı dosyadan bayt bayt yeniden kullanılır.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory) if directory else SEGMENT_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else SEGMENT_CACHE_MAX_BYTES
+
+    @staticmethod
+    def make_key(inputs: dict) -> str:
+        """Girdi sözlüğünden (sıralı JSON) anahtar oluştur"""
+        payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.directory / f"{key}.pdf", self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, List[Tuple[int, str]]]]:
+        """
+        Önbellekteki segmenti getir
+
+        Returns:
+            (segment PDF yolu, [(sayfa konumu, başlık metni), ...]) veya None
+        """
+        pdf_path, layout_path = self._paths(key)
+        try:
+            with open(layout_path, 'r', encoding='utf-8') as f:
+                layout = [tuple(item) for item in json.load(f)]
+            if not pdf_path.exists():
+                return None
+            # Son kullanım zamanı (LRU silme için)
+            os.utime(pdf_path)
+            return str(pdf_path), layout
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, segment_path: str, layout: List[Tuple[int, str]],
+            evict: bool = True) -> str:
+        """
+        Segment dosyasını önbelleğe taşı ve yeni yolunu döndür
+
+        Yazılamazsa segment olduğu yerde kalır ve o yol döner.
+        evict=False: boyut sınırı kontrolü çağırana bırakılır (örn. birleştirme
+        sürerken dönen segmentler silinmesin diye evict() sonra çağrılır).
+        """
+        pdf_path, layout_path = self._paths(key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_pdf = pdf_path.with_suffix(f".{os.getpid()}.tmp")
+            shutil.move(segment_path, tmp_pdf)
+            os.replace(tmp_pdf, pdf_path)
+
+            tmp_layout = layout_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_layout, 'w', encoding='utf-8') as f:
+                json.dump([list(item) for item in layout], f, ensure_ascii=False)
+            os.replace(tmp_layout, layout_path)
+        except OSError as e:
+            print(f"⚠️  Segment önbelleğine yazılamadı: {e}")
+            return segment_path if os.path.exists(segment_path) else str(pdf_path)
+
+        if evict:
+            self.evict()
+        return str(pdf_path)
+
+    def evict(self) -> None:
+        """Toplam boyut sınırı aşıldıysa en eski kullanılan segmentleri sil"""
+        try:
+            entries = []
+            total = 0
+            for path in self.directory.glob("*.pdf"):
+                st = path.stat()
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return
+
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                path.with_suffix(".json").unlink(missing_ok=True)
+                total -= size
+        except OSError as e:
+            print(f"⚠️  Segment önbelleği temizlenemedi: {e}")
+
+    def clear(self) -> None:
+        """Tüm segmentleri sil"""
+        for pattern in ("*.pdf", "*.json"):
+            for path in self.directory.glob(pattern):
+                path.unlink(missing_ok=True)
+
+
+_default_segment_cache: Optional[SegmentCache] = None
+
+
+def get_segment_cache() -> SegmentCache:
+    """Süreç genelinde paylaşılan segment önbelleğini döndür"""
+    global _default_segment_cache
+    if _default_segment_cache is None:
+        _default_segment_cache = SegmentCache()
+    return _default_segment_cache
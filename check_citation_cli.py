@@ -9,46 +9,103 @@ from pathlib import Path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
 
 from config import SourceArticle, CitingArticle
-from pdf_processor import CitationFinder
+from pdf_processor import CitationFinder, MultiSourceCitationFinder
 
-def check_citation(pdf_path, article_data):
+def source_from_article_data(article_data):
+    """
+    Create source article object from metadata
+    """
+    return SourceArticle(
+        title=article_data.get('source_title', ''),
+        doi=article_data.get('source_doi', ''),
+        authors=article_data.get('source_authors', []),
+        year=article_data.get('source_year', 0)
+    )
+
+def source_key(article_data):
+    """Kaynak makaleyi belirleyen alanlardan (source_*) sözlük anahtarı üret"""
+    return (
+        article_data.get('source_title', ''),
+        article_data.get('source_doi', ''),
+        tuple(article_data.get('source_authors') or []),
+        article_data.get('source_year', 0),
+    )
+
+def citation_result(article):
+    """Doldurulmuş CitingArticle'dan JSON sonuç alanlarını üret"""
+    return {
+        "found": bool(article.citation_pages),
+        "citation_pages": article.citation_pages,
+        "citation_bboxes": article.citation_bboxes or [],
+        "reference_page": article.reference_page,
+        "reference_number": article.reference_number,
+        "reference_bbox": article.reference_bbox
+    }
+
+def check_citation(pdf_path, article_data, finder=None, include_metrics=False, profile_path=None):
     """
     Checks for citation in the given PDF for the source article
+    
+    A shared finder can be passed in when many PDFs are checked for the
+    same source article (batch mode). include_metrics adds the per-phase
+    timing record under "metrics"; profile_path writes a cProfile dump.
     """
     # Redirect stdout to stderr to prevent pollution of the final JSON output
     original_stdout = sys.stdout
     sys.stdout = sys.stderr
     
     try:
-        # Create source article object from metadata
-        source_article = SourceArticle(
-            title=article_data.get('source_title', ''),
-            doi=article_data.get('source_doi', ''),
-            authors=article_data.get('source_authors', []),
-            year=article_data.get('source_year', 0)
-        )
-        
         # Create citing article object (target)
         citing_article = CitingArticle(
             title=article_data.get('title', ''),
             doi=article_data.get('doi', '')
         )
         
-        finder = CitationFinder(source_article)
-        result_article = finder.process_pdf(pdf_path, citing_article)
+        if finder is None:
+            finder = CitationFinder(source_from_article_data(article_data))
+        result_article = finder.process_pdf(pdf_path, citing_article, profile_path=profile_path)
         
         # Restore stdout before returning result
         sys.stdout = original_stdout
         
+        result = {"status": "success", **citation_result(result_article)}
+        if include_metrics:
+            result["metrics"] = finder.metrics.as_dict()
+        return result
+    except Exception as e:
+        sys.stdout = original_stdout
         return {
+            "status": "error",
+            "message": str(e)
+        }
+
+def check_citation_multi(pdf_path, sources_data, article_data, include_metrics=False, profile_path=None):
+    """
+    PDF'i bir kez tarayıp birden çok kaynak makale için atıfları kontrol et
+    
+    sources_data: [{"source_title": ..., "source_doi": ..., "source_authors": [...], "source_year": ...}, ...]
+    Sonuçlar "results" altında, kaynaklarla aynı sırada döner.
+    """
+    original_stdout = sys.stdout
+    sys.stdout = sys.stderr
+    
+    try:
+        finder = MultiSourceCitationFinder([source_from_article_data(data) for data in sources_data])
+        citing_articles = [
+            CitingArticle(title=article_data.get('title', ''), doi=article_data.get('doi', ''))
+            for _ in sources_data
+        ]
+        results = finder.process_pdf(pdf_path, citing_articles, profile_path=profile_path)
+        
+        sys.stdout = original_stdout
+        result = {
             "status": "success",
-            "found": bool(result_article.citation_pages),
-            "citation_pages": result_article.citation_pages,  # Array of page numbers
-            "citation_bboxes": result_article.citation_bboxes or [],  # Bounding boxes for highlights
-            "reference_page": result_article.reference_page,
-            "reference_number": result_article.reference_number,
-            "reference_bbox": result_article.reference_bbox  # Bounding box for reference highlight
+            "found": any(article.citation_pages for article in results),
+            "results": [citation_result(article) for article in results]
         }
+        if include_metrics:
+            result["metrics"] = finder.metrics.as_dict()
+        return result
     except Exception as e:
         sys.stdout = original_stdout
         return {
@@ -56,11 +113,96 @@ def check_citation(pdf_path, article_data):
             "message": str(e)
         }
 
+def run_check(input_data):
+    """
+    Tek bir istek yükünü ({pdf_path, article_data}) işle ve JSON sonucunu döndür
+    
+    İstekte "sources" listesi varsa PDF tüm kaynak makaleler için tek
+    geçişte taranır (check_citation_multi).
+    
+    İsteğe bağlı alanlar:
+        "include_metrics": true  -> sonuca aşama süreleri ("metrics") eklenir
+        "profile_path": "..."    -> analizin cProfile dökümü bu dosyaya yazılır
+    """
+    pdf_path = input_data.get('pdf_path')
+    article_data = input_data.get('article_data') or {}
+    options = {
+        "include_metrics": bool(input_data.get('include_metrics')),
+        "profile_path": input_data.get('profile_path'),
+    }
+    
+    if not pdf_path or not os.path.exists(pdf_path):
+        return {"status": "error", "message": f"File not found: {pdf_path}"}
+    
+    if input_data.get('sources'):
+        return check_citation_multi(pdf_path, input_data['sources'], article_data, **options)
+    
+    return check_citation(pdf_path, article_data, **options)
+
+def iter_batch(manifest):
+    """
+    Manifest modundaki her PDF için sonucu, PDF bittiği anda üret
+    
+    Manifest formatı:
+        {
+            "article_data": {"source_title": ..., "source_doi": ..., "source_authors": [...], "source_year": ...},
+            "pdfs": [{"id": ..., "pdf_path": ..., "article_data": {"title": ..., "doi": ...}}, ...]
+        }
+    
+    Öğe düzeyindeki article_data, üst düzeydekinin üzerine yazılır; öğe
+    source_* alanlarıyla farklı bir kaynak makale verirse o kaynak için ayrı
+    bir CitationFinder kurulur (aynı kaynağı paylaşan öğeler onu yeniden
+    kullanır). Hatalar PDF bazında raporlanır; bozuk bir dosya toplu işlemi
+    durdurmaz.
+    Manifestte "include_metrics": true ise her satıra "metrics" eklenir;
+    öğede "profile_path" varsa yalnızca o PDF profillenir.
+    """
+    shared_data = manifest.get('article_data') or {}
+    include_metrics = bool(manifest.get('include_metrics'))
+    finders = {}
+    
+    for index, item in enumerate(manifest.get('pdfs') or []):
+        pdf_path = item.get('pdf_path')
+        article_data = {**shared_data, **(item.get('article_data') or {})}
+        
+        if not pdf_path or not os.path.exists(pdf_path):
+            result = {"status": "error", "message": f"File not found: {pdf_path}"}
+        else:
+            key = source_key(article_data)
+            finder = finders.get(key)
+            if finder is None:
+                finder = finders[key] = CitationFinder(source_from_article_data(article_data))
+            result = check_citation(pdf_path, article_data, finder, include_metrics, item.get('profile_path'))
+            # Önbellekten gelen sonuçlarda PDF hiç yüklenmez
+            loaded = finder.metrics.result_cache_hit or finder.metrics.page_count
+            if result.get("status") == "success" and not loaded:
+                result = {"status": "error", "message": f"PDF could not be read: {pdf_path}"}
+        
+        yield {"index": index, "id": item.get('id'), "pdf_path": pdf_path, **result}
+
+def run_batch(manifest, emit):
+    """
+    Manifest sonuçlarını emit(satır) ile tek tek ilet ve özet döndür
+    """
+    summary = {"event": "done", "total": 0, "found": 0, "errors": 0}
+    for line in iter_batch(manifest):
+        summary["total"] += 1
+        summary["found"] += bool(line.get("found"))
+        summary["errors"] += line.get("status") == "error"
+        emit(line)
+    return summary
+
+def write_ndjson(line):
+    """Tek bir NDJSON satırını stdout'a yaz ve hemen flush et"""
+    sys.stdout.write(json.dumps(line) + "\n")
+    sys.stdout.flush()
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"status": "error", "message": "Missing arguments"}))
         sys.exit(1)
         
+    batch = False
     try:
         arg = sys.argv[1]
         if os.path.exists(arg):
@@ -68,19 +210,28 @@ if __name__ == "__main__":
                 input_data = json.load(f)
         else:
             input_data = json.loads(arg)
+        
+        # Toplu mod: tek kaynak makale için çok sayıda PDF, NDJSON çıktı
+        if 'pdfs' in input_data:
+            batch = True
+            write_ndjson(run_batch(input_data, write_ndjson))
+            sys.exit(0)
             
         pdf_path = input_data.get('pdf_path')
-        article_data = input_data.get('article_data')
         
         if not os.path.exists(pdf_path):
              print(json.dumps({"status": "error", "message": f"File not found: {pdf_path}"}))
              sys.exit(1)
 
-        result = check_citation(pdf_path, article_data)
+        result = run_check(input_data)
         # Ensure only JSON is printed to stdout
         sys.stdout.write(json.dumps(result))
         sys.stdout.flush()
         
     except Exception as e:
-        sys.stdout.write(json.dumps({"status": "error", "message": str(e)}))
-        sys.stdout.flush()
+        if batch:
+            # NDJSON okuyucuları satır sonunu bekler
+            write_ndjson({"status": "error", "message": str(e)})
+        else:
+            sys.stdout.write(json.dumps({"status": "error", "message": str(e)}))
+            sys.stdout.flush()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+ATIF DESEN TARAYICISI
+=====================
+Kaynakça sayfası tespiti ve atıf işareti arama için önceden derlenmiş desenler
+
+Desenler kaynak makale başına bir kez derlenir; sayfa başına, aşama başına
+veya çağrı başına yeniden regex oluşturulmaz. Kaynakça sayfası tespiti tüm
+başlık desenlerini tek bir alternasyonda birleştirir; başlık yoksa numaralı
+girişler sayılır ve yeterli sayıya ulaşıldığında tarama durur.
+
+CitationMarkerIndex, bir PDF'in köşeli parantezli atıf işaretlerini bir
+kez ayrıştırıp referans numarasından sayfalara ters indeks kurar; gruplu
+listeler ([3, 5, 7]) ve aralıklar ([30–33]) açılarak indekslenir.
+
+MultiSourceScanner, bir adayın birden çok kaynak makalesini tek geçişte
+tarar: tüm DOI'ler ve yazar soyadları birer alternasyonda birleştirilir,
+sayfa başına yalnızca eşleşen kaynakların ayrıntılı desenleri çalıştırılır.
+"""
+
+import re
+from typing import Dict, Iterator, List, NamedTuple, Optional, Pattern, Set, Tuple
+
+from config import SourceArticle
+
+
+_TR_MAP = str.maketrans("ğĞüÜşŞıİöÖçÇ", "gGuUsSiIoOcC")
+
+
+def normalize_text(text: str) -> str:
+    """Türkçe karakterleri normalize et (Lowercase + ASCII)"""
+    if not text: return ""
+    return text.translate(_TR_MAP).lower()
+
+
+class CitationScanner:
+    """
+    Kaynak makaleye özel, önceden derlenmiş desen tarayıcısı
+
+    Kaynakça sayfası tespiti kaynaktan bağımsızdır (sınıf düzeyinde);
+    DOI, yazar/yıl ve atıf işareti desenleri kaynak makale başına kurulur.
+    """
+
+    # Başlıklar tek alternasyonda (büyük/küçük harf duyarsız). Numaralı
+    # başlıklar ("6. References") giriş deseniyle de eşleştiği için başlık
+    # araması girişlerden ayrı ve önce yapılır.
+    REFERENCE_HEADER_RE = re.compile(
+        r'\b(?:References|Bibliography|Literature\s+Cited|Kaynakça|Kaynaklar|Works\s+Cited)\b',
+        re.IGNORECASE
+    )
+    REFERENCE_ENTRY_RE = re.compile(r'^\s*\[\d+\]|\s+\d+\.\s+[A-Z][a-z]+', re.MULTILINE)
+    MIN_REFERENCE_ENTRIES = 5  # En az bu kadardan fazla numaralı giriş
+
+    WHITESPACE_RE = re.compile(r'\s+')
+    BRACKET_BEFORE_RE = re.compile(r'\[(\d+)\]\s*$')
+    DOT_BEFORE_RE = re.compile(r'(\d+)\s*\.\s*$')
+
+    def __init__(self, source_article: SourceArticle):
+        self.source = source_article
+
+        self.clean_doi = ""
+        if source_article.doi:
+            self.clean_doi = self.WHITESPACE_RE.sub('', source_article.doi).lower()
+
+        self.first_author = ""
+        self.first_author_norm = ""
+        if source_article.authors:
+            self.first_author = source_article.authors[0].split()[-1]
+            self.first_author_norm = normalize_text(self.first_author)
+
+        self.year_str = str(source_article.year) if source_article.year else ""
+
+        # YEAR TOLERANCE
+        years_pattern = self.year_str
+        if source_article.year:
+            y = source_article.year
+            years_pattern = f"({y}|{y-1}|{y+1})"
+        self.years_re: Pattern = re.compile(years_pattern)
+
+        self.author_re: Optional[Pattern] = None
+        self.author_year_re: Optional[Pattern] = None
+        if self.first_author_norm:
+            norm_author_esc = re.escape(self.first_author_norm)
+            self.author_re = re.compile(norm_author_esc, re.IGNORECASE)
+            if self.year_str:
+                # Pattern: Must start at line beginning, number then dot, NOT followed by digit
+                self.author_year_re = re.compile(
+                    rf'(?:^|\n)\s*(\d+)\s*\.\s*(?!\s*\d)(?:(?!\n\d+\s*\.\s).)*?{norm_author_esc}.*?{years_pattern}',
+                    re.IGNORECASE | re.DOTALL
+                )
+
+        self._marker_patterns: Dict[int, Tuple[Pattern, Pattern]] = {}
+
+    @classmethod
+    def is_reference_page(cls, text: str) -> bool:
+        """Metnin referans sayfası olup olmadığını kontrol et (başlık, sonra giriş sayısı)"""
+        if cls.REFERENCE_HEADER_RE.search(text):
+            return True
+        entries = 0
+        for _ in cls.REFERENCE_ENTRY_RE.finditer(text):
+            entries += 1
+            if entries > cls.MIN_REFERENCE_ENTRIES:
+                return True
+        return False
+
+    def contains_doi(self, text: str) -> bool:
+        """Boşluklardan arındırılmış metinde kaynak DOI'si geçiyor mu?"""
+        return bool(self.clean_doi) and self.clean_doi in self.WHITESPACE_RE.sub('', text).lower()
+
+    def match_author_year(self, text_norm: str) -> Optional[int]:
+        """Numaralı kaynakça girişinde Yazar + Yıl eşleşmesi ara, numarayı döndür"""
+        if not self.author_year_re:
+            return None
+        match = self.author_year_re.search(text_norm)
+        if match and match.group(0).count('\n') < 15:
+            return int(match.group(1))
+        return None
+
+    def iter_proximity_matches(self, text_norm: str) -> Iterator[Tuple[str, int]]:
+        """
+        Yazar adının hemen önündeki numaraya bak (iki sütunlu düzenler için)
+
+        Yields:
+            ('bracket' | 'dot', referans numarası)
+        """
+        if not self.author_re:
+            return
+
+        for m in self.author_re.finditer(text_norm):
+            start_idx = m.start()
+            # Wider window for two-column layouts (100 chars back)
+            window_text = text_norm[max(0, start_idx - 100):start_idx].strip()
+            after_text = text_norm[start_idx:start_idx + 300]
+
+            # Try [31] format first (bracket style), then 31. format (dot style)
+            for style, back_re in (('bracket', self.BRACKET_BEFORE_RE), ('dot', self.DOT_BEFORE_RE)):
+                match_back = back_re.search(window_text)
+                if match_back and self.years_re.search(after_text):
+                    yield style, int(match_back.group(1))
+
+    def marker_patterns(self, ref_num: int) -> Tuple[Pattern, Pattern]:
+        """
+        Referans numarası için (köşeli parantez, üslü) atıf desenleri
+
+        Köşeli parantez deseni şu biçimleri yakalar:
+        [33], [33, 34...], [..., 33, ...], [..., 33], [33-35], [30–33]
+        """
+        patterns = self._marker_patterns.get(ref_num)
+        if patterns is None:
+            patterns = (
+                re.compile(rf'\[(?:[^\]]*[,\s–-])?{ref_num}(?:[,\s–-][^\]]*|\s*)?\]'),
+                # Superscript often appears near punctuation: "text.21" or "text,21" or "text21"
+                re.compile(rf'(?<=[.,;:)\s]){ref_num}(?=[\s.,;:\[]|$)'),
+            )
+            self._marker_patterns[ref_num] = patterns
+        return patterns
+
+
+class MultiSourceScanner:
+    """
+    Birden çok kaynak makale için birleşik ön filtre
+
+    Sayfa metni, K kaynak için K ayrı arama yerine tek DOI ve tek yazar
+    alternasyonu ile taranır; dönen indeksler CitationScanner listesine
+    karşılık gelir.
+    """
+
+    def __init__(self, scanners: List[CitationScanner]):
+        self.scanners = list(scanners)
+
+        self._doi_sources: Dict[str, List[int]] = {}
+        self._author_sources: Dict[str, List[int]] = {}
+        for i, scanner in enumerate(self.scanners):
+            if scanner.clean_doi:
+                self._doi_sources.setdefault(scanner.clean_doi, []).append(i)
+            if scanner.author_year_re:
+                self._author_sources.setdefault(scanner.first_author_norm, []).append(i)
+
+        self.doi_re = self._alternation(self._doi_sources)
+        self.author_re = self._alternation(self._author_sources)
+
+    @staticmethod
+    def _alternation(sources: Dict[str, List[int]]) -> Optional[Pattern]:
+        """
+        Anahtarlardan tek bir alternasyon deseni kur
+
+        Desen her konumda (ileri bakışla, çakışan eşleşmeler dahil) en uzun
+        anahtarı yakalar; başka bir anahtarın içinde geçen kısa anahtarların
+        kaynakları da o anahtara eklenir, böylece sonuç kaynak bazlı ayrı
+        aramaların birleşimiyle aynıdır.
+        """
+        if not sources:
+            return None
+        for key in list(sources):
+            for other, indices in list(sources.items()):
+                if other != key and other in key:
+                    sources[key] = sorted(set(sources[key]) | set(indices))
+        ordered = sorted(sources, key=len, reverse=True)
+        return re.compile('(?=(' + '|'.join(re.escape(k) for k in ordered) + '))')
+
+    def candidates(self, text: str, text_norm: str) -> Set[int]:
+        """Sayfada DOI'si veya yazar soyadı geçen kaynakların indeksleri"""
+        found: Set[int] = set()
+        if self.doi_re:
+            compact = CitationScanner.WHITESPACE_RE.sub('', text).lower()
+            for m in self.doi_re.finditer(compact):
+                found.update(self._doi_sources[m.group(1)])
+        if self.author_re:
+            for m in self.author_re.finditer(text_norm):
+                found.update(self._author_sources[m.group(1)])
+        return found
+
+
+class MarkerHit(NamedTuple):
+    """İndekslenmiş bir atıf işaretinin konumu"""
+    page_number: int
+    start: int      # Sayfa metnindeki karakter konumu
+    end: int
+    marker: str     # İşaretin kendisi, örn. "[30–33]"
+
+
+class CitationMarkerIndex:
+    """
+    Referans numarası -> atıf yapılan sayfalar (ve konumlar) ters indeksi
+
+    Sayfalar add_page ile bir kez ayrıştırılır; sonraki her referans
+    numarası sorgusu bir sözlük aramasıdır.
+    """
+
+    # Gruplu işaretler çıkarılan metinde satır sonuna bölünebilir: "[12,\n13]"
+    BRACKET_GROUP_RE = re.compile(r'\[([^\[\]]{1,200})\]')
+    WHITESPACE_RE = re.compile(r'\s+')
+    # Sayı veya aralık; öncesi/sonrası ayraç (boşluk, virgül, tire) olmalı
+    NUMBER_TOKEN_RE = re.compile(r'(?<![^\s,;–—-])(\d+)(?:\s*[–—-]\s*(\d+))?(?![^\s,;–—-])')
+    MAX_RANGE_SPAN = 50  # Daha geniş "aralıklar" (örn. yıllar) açılmaz
+
+    def __init__(self):
+        self._hits: Dict[int, List[MarkerHit]] = {}
+        self._page_refs: Dict[int, Set[int]] = {}
+
+    @classmethod
+    def expand_marker(cls, content: str) -> List[int]:
+        """Köşeli parantez içeriğindeki numaraları aralıkları açarak döndür"""
+        numbers = []
+        for m in cls.NUMBER_TOKEN_RE.finditer(content):
+            first = int(m.group(1))
+            if m.group(2):
+                last = int(m.group(2))
+                if first < last and last - first <= cls.MAX_RANGE_SPAN:
+                    numbers.extend(range(first, last + 1))
+                    continue
+                numbers.extend((first, last))
+            else:
+                numbers.append(first)
+        return numbers
+
+    def add_page(self, page_number: int, text: str) -> None:
+        """Sayfadaki atıf işaretlerini indekse ekle (her sayfa bir kez)"""
+        if page_number in self._page_refs:
+            return
+
+        refs: Set[int] = set()
+        for m in self.BRACKET_GROUP_RE.finditer(text):
+            marker = self.WHITESPACE_RE.sub(' ', m.group(0))
+            hit = MarkerHit(page_number, m.start(), m.end(), marker)
+            for ref_num in set(self.expand_marker(marker[1:-1])):
+                self._hits.setdefault(ref_num, []).append(hit)
+                refs.add(ref_num)
+        self._page_refs[page_number] = refs
+
+    def is_indexed(self, page_number: int) -> bool:
+        return page_number in self._page_refs
+
+    def cites(self, page_number: int, ref_num: int) -> bool:
+        """Sayfa, referans numarasına atıf yapıyor mu? (sayfa indekslenmiş olmalı)"""
+        return ref_num in self._page_refs.get(page_number, ())
+
+    def pages_for(self, ref_num: int) -> List[int]:
+        """Referans numarasına atıf yapılan (indekslenmiş) sayfalar"""
+        return sorted({hit.page_number for hit in self._hits.get(ref_num, [])})
+
+    def hits(self, ref_num: int, page_number: Optional[int] = None) -> List[MarkerHit]:
+        """Referans numarasının işaret konumları (isteğe bağlı sayfa filtresiyle)"""
+        hits = self._hits.get(ref_num, [])
+        if page_number is not None:
+            hits = [h for h in hits if h.page_number == page_number]
+        return hits
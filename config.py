@@ -38,14 +38,53 @@ from pathlib import Path
 # AYARLAR
 # ============================================================================
 
-# Proje dizini
+# Proje dizinleri (içe aktarmada değil, ilk yazmada oluşturulur: ensure_dir)
 BASE_DIR = Path(__file__).parent.absolute()
 DOWNLOADS_DIR = BASE_DIR / "downloads"
 OUTPUT_DIR = BASE_DIR / "output"
+CACHE_DIR = BASE_DIR / "cache"
 
-# Dizinleri oluştur
-DOWNLOADS_DIR.mkdir(exist_ok=True)
-OUTPUT_DIR.mkdir(exist_ok=True)
+# PDF metin çıkarma önbelleği (SQLite, içerik hash'i ile anahtarlanır)
+EXTRACTION_CACHE_ENABLED = True
+EXTRACTION_CACHE_PATH = CACHE_DIR / "extraction.sqlite3"
+EXTRACTION_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+# Atıf analizi sonuç önbelleği: PDF ve kaynak makale değişmediyse analiz atlanır
+ANALYSIS_CACHE_ENABLED = True
+
+# PDF başına aşama süreleri bu dosyaya NDJSON olarak eklenir (None = kapalı)
+# Örn: METRICS_LOG_PATH = OUTPUT_DIR / "metrics.ndjson"
+METRICS_LOG_PATH = None
+
+# İndirilen PDF'lerin DOI -> dosya indeksi (boyut/mtime ile artımlı güncellenir)
+DOI_INDEX_PATH = CACHE_DIR / "doi_index.json"
+
+# Paralel PDF analizi için işçi süreç sayısı (1 = sıralı işleme)
+PDF_PROCESS_WORKERS = os.cpu_count() or 1
+
+# Final doküman her atıf bölümü diske yazılarak akışlı birleştirilir
+# (bellek kullanımı toplam dosya yerine en büyük tek atıfla sınırlı kalır)
+STREAMING_ASSEMBLY = True
+
+# Birleştirme sonrası optimizasyon (yinelenen nesneler, kullanılmayan kaynaklar).
+# Belgenin tamamını belleğe yüklediği için varsayılan olarak kapalı
+OPTIMIZE_FINAL_PDF = False
+
+# Atıf segmenti önbelleği: girdileri değişmeyen segmentler yeniden üretilmez
+SEGMENT_CACHE_ENABLED = True
+SEGMENT_CACHE_DIR = CACHE_DIR / "segments"
+SEGMENT_CACHE_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+# Kapak görselleri A4 sayfaya yetecek çözünürlüğe indirilip yeniden sıkıştırılır
+COVER_IMAGE_DPI = 150           # Hedef çözünürlük (72'den küçük olmamalı)
+COVER_JPEG_QUALITY = 85
+COVER_CACHE_DIR = CACHE_DIR / "covers"
+
+# CLI oturum deposu (SQLite; her makale sonucu hesaplandığı anda kaydedilir)
+SESSION_DB_PATH = OUTPUT_DIR / "session.sqlite3"
+
+# İzleme modunda indirme klasörünün yoklanma aralığı (saniye)
+WATCH_POLL_INTERVAL = 2.0
 
 # Web of Science URL'leri
 WOS_BASE_URL = "https://www.webofscience.com"
@@ -137,6 +176,16 @@ class CandidateInfo:
 # YARDIMCI FONKSİYONLAR
 # ============================================================================
 
+def ensure_dir(path: Path) -> Path:
+    """
+    Dizini (gerekirse) oluşturup döndür
+
+    Dizinler içe aktarma sırasında değil, ilk yazma anında oluşturulur.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
 def sanitize_filename(filename: str) -> str:
     """Dosya adını güvenli hale getir"""
     invalid_chars = '<>:"/\\|?*'
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+KAPAK GÖRSELİ ÖN İŞLEME MODÜLÜ
+==============================
+Kapak görsellerini A4 sayfa için küçültme ve yeniden sıkıştırma
+
+Kullanıcıların yüklediği kapaklar çoğu zaman 12 MP telefon fotoğrafı veya
+büyük PNG ekran görüntüleridir; olduğu gibi gömüldüklerinde final doküman
+yüzlerce MB'a ulaşır. Bu modül her görseli:
+- Sayfadaki çizim kutusunun COVER_IMAGE_DPI'da gerektirdiği piksel
+  boyutuna indirir (asla büyütmez)
+- Fotoğrafları JPEG, az renkli görselleri ve ekran görüntülerini (daha
+  küçük çıkıyorsa) 256 renk palet PNG olarak yeniden sıkıştırır
+- Sonucu kaynak dosyanın içerik hash'i ile cache/covers altında saklar
+
+Görsel çözme işlemleri iş parçacığı havuzunda yapılır (Pillow çözme ve
+yeniden boyutlandırma sırasında GIL'i bırakır).
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from caching import cached_file_sha256
+from config import COVER_CACHE_DIR, COVER_IMAGE_DPI, COVER_JPEG_QUALITY
+
+# Küçültme/sıkıştırma mantığı değiştiğinde artırılmalı
+COVER_CACHE_VERSION = 1
+
+IMAGE_EXTENSIONS = ('png', 'jpg', 'jpeg', 'gif', 'bmp')
+
+# A4 (595.27 x 841.89 pt), her kenarda 50 pt boşluk: _add_image_as_page ile aynı kutu
+COVER_BOX_POINTS = (595.27 - 2 * 50, 841.89 - 2 * 50)
+
+
+def is_cover_image(path: str) -> bool:
+    """Dosya uzantısı desteklenen bir görsel mi?"""
+    return bool(path) and path.lower().split('.')[-1] in IMAGE_EXTENSIONS
+
+
+def target_pixels(dpi: int = COVER_IMAGE_DPI) -> Tuple[int, int]:
+    """Çizim kutusunun verilen DPI'da gerektirdiği en büyük piksel boyutu"""
+    return tuple(int(points / 72 * dpi) for points in COVER_BOX_POINTS)
+
+
+def _cache_path(key: str, ext: str) -> Path:
+    return COVER_CACHE_DIR / f"{key}.{ext}"
+
+
+def _cached(key: str) -> Optional[str]:
+    for ext in ('jpg', 'png'):
+        path = _cache_path(key, ext)
+        if path.exists():
+            return str(path)
+    return None
+
+
+def _encode(image_path: str) -> Tuple[bytes, str]:
+    """
+    Görseli küçült ve yeniden sıkıştır
+
+    Returns:
+        (kodlanmış bayt, 'jpg' | 'png')
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(image_path) as img:
+        source_format = img.format
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail(target_pixels(), Image.LANCZOS)
+
+        # Saydam alanlar beyaz sayfa zeminine karşılık gelir
+        if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+            rgba = img.convert('RGBA')
+            img = Image.new('RGB', rgba.size, 'white')
+            img.paste(rgba, mask=rgba.getchannel('A'))
+        elif img.mode != 'RGB':
+            img = img.convert('RGB')
+
+        # Az renkli görseller (logolar, düz ekran görüntüleri) palet ile kayıpsız
+        if img.getcolors(256) is not None:
+            return _save(img.quantize(colors=256, method=Image.Quantize.MEDIANCUT), 'PNG'), 'png'
+
+        jpeg = _save(img, 'JPEG', quality=COVER_JPEG_QUALITY)
+        if source_format == 'JPEG':
+            return jpeg, 'jpg'
+
+        # PNG/GIF/BMP kaynaklar (genelde ekran görüntüsü): 256 renk palet daha küçükse o
+        palette = _save(img.quantize(colors=256, method=Image.Quantize.MEDIANCUT), 'PNG')
+        return (palette, 'png') if len(palette) < len(jpeg) else (jpeg, 'jpg')
+
+
+def _save(img, fmt: str, **params) -> bytes:
+    out = BytesIO()
+    img.save(out, fmt, optimize=True, **params)
+    return out.getvalue()
+
+
+def prepare_cover_image(image_path: str) -> str:
+    """
+    Kapak görselinin küçültülmüş/sıkıştırılmış kopyasının yolunu döndür
+
+    Sonuç önbellekteyse yeniden işlenmez. Sıkıştırılmış kopya asıl
+    dosyadan büyük olursa asıl dosya kopyalanır; görsel işlenemezse asıl
+    yol döner.
+    """
+    try:
+        key = f"{cached_file_sha256(image_path)}_v{COVER_CACHE_VERSION}_{COVER_IMAGE_DPI}_{COVER_JPEG_QUALITY}"
+        cached = _cached(key)
+        if cached:
+            return cached
+
+        data, ext = _encode(image_path)
+        if len(data) >= os.path.getsize(image_path) and image_path.lower().endswith(('.jpg', '.jpeg', '.png')):
+            with open(image_path, 'rb') as f:
+                data = f.read()
+            ext = 'png' if image_path.lower().endswith('.png') else 'jpg'
+
+        COVER_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _cache_path(key, ext)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return str(path)
+    except Exception as e:
+        print(f"⚠️  Kapak görseli optimize edilemedi ({image_path}): {e}")
+        return image_path
+
+
+def prepare_cover_images(image_paths: Iterable[str], workers: Optional[int] = None) -> Dict[str, str]:
+    """
+    Görselleri iş parçacığı havuzunda hazırla
+
+    Returns:
+        {asıl yol: hazırlanmış yol}
+    """
+    paths: List[str] = list(dict.fromkeys(p for p in image_paths if p and os.path.exists(p)))
+    if not paths:
+        return {}
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(prepare_cover_image, paths)))
@@ -5,11 +5,15 @@ DOKÜMAN OLUŞTURMA MODÜLÜ
 """
 
 import os
+import tempfile
+import threading
+from io import BytesIO
 from datetime import datetime
-from typing import List, Optional
+from typing import Callable, Iterable, List, Optional, Tuple
 from pathlib import Path
 
 # PDF oluşturma
+import reportlab
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm, mm
 from reportlab.lib.styles import ParagraphStyle
@@ -21,26 +25,53 @@ from reportlab.platypus import (
 )
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas as rl_canvas
+from reportlab.lib.colors import yellow
 
-# Excel oluşturma
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+# Excel oluşturma (openpyxl) yalnızca build_excel içinde yüklenir
 
 # PDF birleştirme
+import pypdf
 from pypdf import PdfReader, PdfWriter
 
+from pdf_concat import StreamingPDFConcatenator
+from caching import cached_file_sha256, get_segment_cache
+from pdf_optimizer import optimize_pdf
+from cover_images import COVER_CACHE_VERSION, is_cover_image, prepare_cover_image, prepare_cover_images
+
 from config import (
     SourceArticle, CitingArticle, CandidateInfo,
-    OUTPUT_DIR, sanitize_filename
+    OUTPUT_DIR, STREAMING_ASSEMBLY, PDF_PROCESS_WORKERS, SEGMENT_CACHE_ENABLED,
+    OPTIMIZE_FINAL_PDF, COVER_IMAGE_DPI, COVER_JPEG_QUALITY,
+    sanitize_filename
 )
 
 
 class StyleManager:
-    """PDF stilleri yöneticisi"""
+    """
+    PDF stilleri yöneticisi
+    
+    Fontlar süreç başına bir kez (ilk PDF üretiminde) kaydedilir ve stil
+    sözlüğü saklanır; PDF üretmeyen süreçler TTF ayrıştırma maliyetini
+    ödemez.
+    """
+    
+    _lock = threading.Lock()
+    _fonts_registered: Optional[bool] = None
+    _styles: Optional[dict] = None
     
     @staticmethod
     def register_fonts():
+        if StyleManager._fonts_registered is not None:
+            return StyleManager._fonts_registered
+        
+        with StyleManager._lock:
+            if StyleManager._fonts_registered is None:
+                StyleManager._fonts_registered = StyleManager._register_dejavu()
+        return StyleManager._fonts_registered
+    
+    @staticmethod
+    def _register_dejavu() -> bool:
         # DejaVu fonts
         project_fonts = Path(__file__).parent / "fonts" / "dejavu-fonts-ttf-2.37" / "ttf"
         
@@ -53,7 +84,14 @@ class StyleManager:
 
     @staticmethod
     def get_styles() -> dict:
-        StyleManager.register_fonts()
+        if StyleManager._styles is None:
+            StyleManager.register_fonts()
+            StyleManager._styles = StyleManager._build_styles()
+        # Sözlük kopyalanır; stil nesneleri paylaşılır (yalnızca okunur)
+        return dict(StyleManager._styles)
+    
+    @staticmethod
+    def _build_styles() -> dict:
         font_name = 'DejaVuSerif'
         
         return {
@@ -185,6 +223,8 @@ class CitationDocumentBuilder:
             return False
 
     def build_excel(self, output_path: str) -> bool:
+        from openpyxl import Workbook
+        
         try:
             wb = Workbook()
             ws_citations = wb.active
@@ -210,74 +250,138 @@ class CitationDocumentBuilder:
             return False
 
 
-class FinalDocumentAssembler:
-    """
-    Final doküman birleştirici
+class SectionHeaderBatch:
     """
+    Bölüm başlığı sayfaları (tek reportlab belgesi)
     
-    def __init__(self, source_article: SourceArticle):
-        self.source = source_article
+    Tüm başlıklar önce planlanır, sonra tek bir canvas'ta sayfa sayfa
+    çizilir; font bir kez gömülür ve tüm başlık sayfaları aynı font
+    nesnesine referans verir.
+    """
     
-    def _highlight_page(self, page, bbox: List[float]):
-        from io import BytesIO
-        from reportlab.pdfgen import canvas as rl_canvas
-        from reportlab.lib.colors import yellow
-        from pypdf import PdfReader as PyPdfReader
+    def __init__(self, texts: Iterable[str]):
+        self._index = {text: i for i, text in enumerate(dict.fromkeys(texts))}
+        self.reader = None
+        if not self._index:
+            return
         
-        if not bbox: return page
-
-        media_box = page.mediabox
-        page_width = float(media_box.width)
-        page_height = float(media_box.height)
+        font_name = 'DejaVuSerif-Bold' if StyleManager.register_fonts() else 'Helvetica-Bold'
         
         packet = BytesIO()
-        c = rl_canvas.Canvas(packet, pagesize=(page_width, page_height))
-        
-        x0, top, x1, bottom = bbox
-        y0 = page_height - bottom
-        y1 = page_height - top
-        
-        c.setFillColor(yellow)
-        c.setFillAlpha(0.3)
-        c.rect(x0, y0, x1 - x0, y1 - y0, fill=True, stroke=False)
+        c = rl_canvas.Canvas(packet, pagesize=A4)
+        for text in self._index:
+            c.setFont(font_name, 14)
+            # Başlığı sayfanın üst kısmına yaz
+            c.drawString(2.5*cm, A4[1] - 2.5*cm, text)
+            c.showPage()
         c.save()
         
         packet.seek(0)
-        overlay_reader = PyPdfReader(packet)
-        overlay_page = overlay_reader.pages[0]
-        
-        page.merge_page(overlay_page)
-        return page
+        self.reader = PdfReader(packet)
     
-    def _create_section_header(self, writer, text: str):
-        """Bölüm başlığı sayfası oluştur"""
-        from io import BytesIO
-        from reportlab.pdfgen import canvas as rl_canvas
-        from reportlab.lib.pagesizes import A4
+    def __contains__(self, text: str) -> bool:
+        return text in self._index
+    
+    def page(self, text: str):
+        """Başlık metninin sayfası"""
+        return self.reader.pages[self._index[text]]
+
+
+class HighlightOverlayBatch:
+    """
+    Sarı vurgu katmanları (tek reportlab belgesi)
+    
+    Her vurgu, hedef sayfa boyutunda bir katman sayfasıdır; tümü tek
+    canvas'ta çizildiği için saydamlık (ExtGState) kaynağı paylaşılır.
+    """
+    
+    def __init__(self, targets: List[Tuple[object, List[float]]]):
+        """targets: [(pypdf sayfası, bbox [x0, top, x1, bottom]), ...]"""
+        self.reader = None
+        if not targets:
+            return
         
         packet = BytesIO()
-        c = rl_canvas.Canvas(packet, pagesize=A4)
-        
-        # DejaVu font kullan
-        try:
-            c.setFont('DejaVuSerif-Bold', 14)
-        except:
-            c.setFont('Helvetica-Bold', 14)
-        
-        # Başlığı sayfanın üst kısmına yaz
-        c.drawString(2.5*cm, A4[1] - 2.5*cm, text)
+        c = rl_canvas.Canvas(packet)
+        for page, bbox in targets:
+            media_box = page.mediabox
+            page_width = float(media_box.width)
+            page_height = float(media_box.height)
+            c.setPageSize((page_width, page_height))
+            
+            x0, top, x1, bottom = bbox
+            y0 = page_height - bottom
+            y1 = page_height - top
+            
+            c.setFillColor(yellow)
+            c.setFillAlpha(0.3)
+            c.rect(x0, y0, x1 - x0, y1 - y0, fill=True, stroke=False)
+            c.showPage()
         c.save()
         
         packet.seek(0)
-        from pypdf import PdfReader as PyPdfReader
-        header_reader = PyPdfReader(packet)
-        writer.add_page(header_reader.pages[0])
+        self.reader = PdfReader(packet)
+    
+    def page(self, i: int):
+        """i. vurgunun katman sayfası"""
+        return self.reader.pages[i]
+
+
+# Segment içeriğini etkileyen kod (kapak, vurgu, sayfa seçimi) değiştiğinde artırılmalı
+SEGMENT_CACHE_VERSION = 2
+
+
+class FinalDocumentAssembler:
+    """
+    Final doküman birleştirici
+    """
+    
+    def __init__(self, source_article: SourceArticle):
+        self.source = source_article
+        self._headers: Optional[SectionHeaderBatch] = None
+    
+    @staticmethod
+    def _section_titles(index: int) -> Tuple[str, str, str, str]:
+        """Atıf bölümünün dört başlığı (kapak, başlık, atıf, kaynakça)"""
+        return (
+            f"A.{index}. Yayının Ünvan Sayfası (kitap, dergi, vb.)",
+            f"A{index}. Eserin Başlık Sayfası",
+            f"A{index}. Eserde atıf yapılan sayfa(lar)",
+            f"A{index}. Kaynakça Sayfası",
+        )
+    
+    def _prepare_headers(self):
+        """PDF'i olan tüm atıfların başlıklarını tek seferde üret"""
+        texts = []
+        for i, article in enumerate(self.source.citing_articles, 1):
+            if article.pdf_path and os.path.exists(article.pdf_path):
+                texts.extend(self._section_titles(i))
+        self._headers = SectionHeaderBatch(texts)
+    
+    def _prepare_covers(self):
+        """PDF'i olan atıfların kapak görsellerini iş parçacığı havuzunda hazırla"""
+        paths = []
+        for article in self.source.citing_articles:
+            if article.pdf_path and os.path.exists(article.pdf_path):
+                paths.extend(p for p in (article.cover_pages_all or []) if is_cover_image(p))
+                if is_cover_image(article.cover_page_path):
+                    paths.append(article.cover_page_path)
+        prepare_cover_images(paths)
+    
+    def _create_section_header(self, writer, text: str):
+        """Bölüm başlığı sayfası ekle (toplu üretilmiş başlıklardan)"""
+        if self._headers is None or text not in self._headers:
+            # Planlanmamış başlık: yalnızca bu metin için üret
+            self._headers = SectionHeaderBatch([text])
+        writer.add_page(self._headers.page(text))
     
     def _add_image_as_page(self, writer, image_path: str):
-        """Convert an image file to a PDF page and add to writer"""
-        from io import BytesIO
-        from reportlab.pdfgen import canvas as rl_canvas
-        from reportlab.lib.pagesizes import A4
+        """
+        Convert an image file to a PDF page and add to writer
+        
+        Görsel önce sayfa için küçültülür/sıkıştırılır (cover_images); hazır
+        kopya hiçbir zaman sayfa kutusundan küçük olmadığı için yerleşim değişmez.
+        """
         from reportlab.lib.utils import ImageReader
         from pypdf import PdfReader as PyPdfReader
         
@@ -287,7 +391,7 @@ class FinalDocumentAssembler:
             c = rl_canvas.Canvas(packet, pagesize=A4)
             
             # Get image dimensions
-            img = ImageReader(image_path)
+            img = ImageReader(prepare_cover_image(image_path))
             img_width, img_height = img.getSize()
             
             # Scale to fit A4 page with margins
@@ -317,7 +421,8 @@ class FinalDocumentAssembler:
         except Exception as e:
             print(f"Error converting image to PDF: {e}")
     
-    def assemble(self, base_pdf_path: str, output_path: str) -> bool:
+    def assemble(self, base_pdf_path: str, output_path: str, streaming: Optional[bool] = None,
+                 workers: Optional[int] = None, optimize: Optional[bool] = None) -> bool:
         """
         Base PDF (Liste + Ayraçlar) ile Tam Metin Sayfalarını Birleştir
         
@@ -327,10 +432,21 @@ class FinalDocumentAssembler:
         3. AN. Eserin Başlık Sayfası (PDF sayfa 1)
         4. AN. Eserde atıf yapılan sayfalar (TÜM atıf sayfaları, sarı highlight)
         5. AN. Kaynakça Sayfası (referans sayfası, sarı highlight)
+        
+        streaming: True ise her atıfın bölümü (segment) ayrı bir dosyaya
+            yazılır ve çıktıya akışlı eklenir; bellek kullanımı en büyük tek
+            atıfla sınırlı kalır. None: config.STREAMING_ASSEMBLY
+        workers: Akışlı modda segmentleri paralel üreten süreç sayısı
+            (None: config.PDF_PROCESS_WORKERS, 1: sıralı)
+        optimize: True ise yazılan dosya pdf_optimizer ile küçültülür
+            (None: config.OPTIMIZE_FINAL_PDF)
         """
+        if streaming is None:
+            streaming = STREAMING_ASSEMBLY
+        if optimize is None:
+            optimize = OPTIMIZE_FINAL_PDF
+        
         try:
-            writer = PdfWriter()
-            
             if not os.path.exists(base_pdf_path):
                 return False
                 
@@ -343,132 +459,382 @@ class FinalDocumentAssembler:
             
             if num_list_pages < 1: num_list_pages = 1
             
-            # 1. Add List Pages (Atıf Listesi)
-            for i in range(num_list_pages):
-                if i < len(base_pages):
-                    writer.add_page(base_pages[i])
+            # Tüm bölüm başlıkları tek belgede, tek font ile
+            self._prepare_headers()
+            # Kapak görselleri paralel küçültülür (sonuçlar önbellekte kalır)
+            self._prepare_covers()
             
-            separator_start_index = num_list_pages
+            if streaming:
+                self._assemble_streaming(base_pages, num_list_pages, output_path, workers)
+            else:
+                self._assemble_in_memory(base_pages, num_list_pages, output_path)
             
-            # 2. Her atıf için içerik ekle
-            for i, article in enumerate(self.source.citing_articles):
-                index = i + 1
-                
-                # A. Separator Page (Atıf N)
-                sep_idx = separator_start_index + i
-                if sep_idx < len(base_pages):
-                    writer.add_page(base_pages[sep_idx])
-                
-                # PDF yoksa devam et
-                if not article.pdf_path or not os.path.exists(article.pdf_path):
-                    continue
+            if optimize:
+                self._optimize_output(output_path)
+            return True
+            
+        except Exception as e:
+            print(f"Assemble Error: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
+    @staticmethod
+    def _optimize_output(output_path: str):
+        """Yazılan dokümanı optimize et; hata olursa optimize edilmemiş dosya kalır"""
+        try:
+            result = optimize_pdf(output_path)
+        except Exception as e:
+            print(f"⚠️  PDF optimizasyonu atlandı: {e}")
+            return
+        
+        if result.saved_bytes > 0:
+            print(f"🗜️  PDF optimize edildi: {result.original_bytes / 1024 / 1024:.1f} MB -> "
+                  f"{result.optimized_bytes / 1024 / 1024:.1f} MB "
+                  f"({result.saved_bytes / 1024 / 1024:.1f} MB kazanç)")
+        else:
+            print("🗜️  PDF optimizasyonu boyutu küçültmedi, dosya olduğu gibi bırakıldı")
+    
+    def _assemble_in_memory(self, base_pages: List, num_list_pages: int, output_path: str):
+        """Tüm çıktıyı tek PdfWriter'da biriktirip bir kerede yaz"""
+        writer = PdfWriter()
+        
+        # 1. Add List Pages (Atıf Listesi)
+        for i in range(num_list_pages):
+            if i < len(base_pages):
+                writer.add_page(base_pages[i])
+        
+        separator_start_index = num_list_pages
+        
+        # 2. Her atıf için içerik ekle
+        for i, article in enumerate(self.source.citing_articles):
+            # A. Separator Page (Atıf N)
+            sep_idx = separator_start_index + i
+            if sep_idx < len(base_pages):
+                writer.add_page(base_pages[sep_idx])
+            
+            self._add_segment(writer, i + 1, article)
+        
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+    
+    def _assemble_streaming(self, base_pages: List, num_list_pages: int, output_path: str,
+                            workers: Optional[int] = None):
+        """
+        Segmentleri diske yazıp çıktıya atıf sırasıyla akışlı olarak ekle
+        
+        Segment önbelleğinin boyut sınırı birleştirme bittikten sonra
+        uygulanır; aksi halde henüz eklenmemiş bir segment silinebilir.
+        """
+        try:
+            with tempfile.TemporaryDirectory(prefix="atif_segment_") as segment_dir, \
+                    StreamingPDFConcatenator(output_path) as out:
+                # 1. Add List Pages (Atıf Listesi)
+                for i in range(min(num_list_pages, len(base_pages))):
+                    out.add_page(base_pages[i])
                 
-                try:
-                    reader = PdfReader(article.pdf_path)
+                # 2. Her atıf: ayraç sayfası + diske yazılmış segment
+                segments = self._iter_segments(segment_dir, workers)
+                for i, (segment_path, layout, owned) in enumerate(segments):
+                    sep_idx = num_list_pages + i
+                    if sep_idx < len(base_pages):
+                        out.add_page(base_pages[sep_idx])
                     
-                    # B. A.N. Yayının Ünvan Sayfası (Kapak Görselleri)
-                    self._create_section_header(writer, f"A.{index}. Yayının Ünvan Sayfası (kitap, dergi, vb.)")
-                    
-                    # Kapak sayfalarını ekle - önce cover_pages_all listesini kontrol et
-                    cover_added = False
-                    
-                    # Tüm kapak sayfalarını ekle (yeni sistem)
-                    if article.cover_pages_all and len(article.cover_pages_all) > 0:
-                        for cover_path in article.cover_pages_all:
-                            if cover_path and os.path.exists(cover_path):
-                                try:
-                                    # Check file extension
-                                    ext = cover_path.lower().split('.')[-1]
-                                    if ext in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
-                                        # Convert image to PDF page
-                                        self._add_image_as_page(writer, cover_path)
-                                        cover_added = True
-                                    elif ext == 'pdf':
-                                        # PDF file - read directly
-                                        cover_reader = PdfReader(cover_path)
-                                        for p in cover_reader.pages:
-                                            writer.add_page(p)
-                                            cover_added = True
-                                except Exception as e:
-                                    print(f"Error adding cover {cover_path}: {e}")
-                    
-                    # Fallback: Eski cover_page_path kullan
-                    if not cover_added and article.cover_page_path and os.path.exists(article.cover_page_path):
+                    if layout is not None:
+                        self._stitch_segment(out, segment_path, layout)
+                        # Önbellekteki segmentler sonraki üretimler için kalır
+                        if owned:
+                            os.remove(segment_path)
+        finally:
+            if SEGMENT_CACHE_ENABLED:
+                get_segment_cache().evict()
+    
+    def _iter_segments(self, segment_dir: str, workers: Optional[int] = None):
+        """
+        Her atıf için (segment yolu, düzen, geçici mi) üçlüsünü atıf sırasıyla üret
+        
+        Girdileri değişmemiş segmentler önbellekten olduğu gibi kullanılır.
+        Kalanlar için birden fazla işçi varsa segmentler süreç havuzunda
+        paralel üretilir; her işçi bağımsız bir segment dosyası yazar,
+        sonuçlar yine sırayla döner. Aksi halde her segment ihtiyaç anında
+        üretilir.
+        """
+        articles = self.source.citing_articles
+        jobs = [
+            (i, article, os.path.join(segment_dir, f"segment_{i}.pdf"))
+            for i, article in enumerate(articles, 1)
+        ]
+        
+        cache = get_segment_cache() if SEGMENT_CACHE_ENABLED else None
+        keys = [self._segment_key(i, a) if cache else None for i, a, _ in jobs]
+        hits = [cache.get(key) if key else None for key in keys]
+        
+        with_pdf = sum(1 for key in keys if key)
+        reused = sum(1 for hit in hits if hit)
+        if reused:
+            print(f"♻️  {reused}/{with_pdf} atıf bölümü önbellekten kullanılıyor")
+        
+        def finish(key, segment_path, layout):
+            if layout is None or key is None:
+                return segment_path, layout, True
+            stored_path = cache.put(key, segment_path, layout, evict=False)
+            return stored_path, layout, stored_path == segment_path
+        
+        pending = [
+            (job, key) for job, key, hit in zip(jobs, keys, hits)
+            if hit is None and job[1].pdf_path and os.path.exists(job[1].pdf_path)
+        ]
+        workers = min(workers or PDF_PROCESS_WORKERS, len(pending))
+        
+        if workers <= 1:
+            for (index, article, segment_path), key, hit in zip(jobs, keys, hits):
+                if hit:
+                    yield hit[0], hit[1], False
+                else:
+                    yield finish(key, segment_path, self._write_segment(index, article, segment_path))
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        print(f"⚙️  {len(pending)} atıf bölümü {workers} işçi ile paralel hazırlanıyor...")
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {job[0]: executor.submit(build_segment_file, *job) for job, _ in pending}
+            for (index, _, segment_path), key, hit in zip(jobs, keys, hits):
+                if hit:
+                    yield hit[0], hit[1], False
+                    continue
+                layout = None
+                if index in futures:
+                    try:
+                        layout = futures[index].result()
+                    except Exception as e:
+                        print(f"Error building segment {index}: {e}")
+                yield finish(key, segment_path, layout)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _segment_key(self, index: int, article: CitingArticle) -> Optional[str]:
+        """
+        Segmenti belirleyen tüm girdilerin önbellek anahtarı
+        
+        PDF ve kapak dosyaları içerik hash'leri ile, sayfa seçimleri, vurgu
+        kutuları, başlık metinleri, kapak görseli ayarları (DPI, JPEG kalitesi)
+        ve segment baytlarını yazan kütüphanelerin sürümleri değerleriyle
+        anahtara girer; herhangi biri değişirse segment yeniden üretilir.
+        PDF yoksa None.
+        """
+        if not article.pdf_path or not os.path.exists(article.pdf_path):
+            return None
+        
+        kapak_path = os.path.join(os.path.dirname(article.pdf_path), f"kapak_{index}.pdf")
+        cover_candidates = list(article.cover_pages_all or []) + [article.cover_page_path, kapak_path]
+        try:
+            covers = [
+                [path, cached_file_sha256(path)]
+                for path in cover_candidates if path and os.path.exists(path)
+            ]
+            inputs = {
+                'version': SEGMENT_CACHE_VERSION,
+                'pdf': cached_file_sha256(article.pdf_path),
+                'covers': covers,
+                'title_page': article.title_page,
+                'citation_pages': article.citation_pages,
+                'citation_bboxes': article.citation_bboxes,
+                'reference_page': article.reference_page,
+                'reference_bbox': article.reference_bbox,
+                'headers': self._section_titles(index),
+                'cover_images': [COVER_CACHE_VERSION, COVER_IMAGE_DPI, COVER_JPEG_QUALITY],
+                'writers': [pypdf.__version__, reportlab.Version],
+            }
+            return get_segment_cache().make_key(inputs)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Segment anahtarı oluşturulamadı ({index}): {e}")
+            return None
+    
+    def _stitch_segment(self, out: StreamingPDFConcatenator, segment_path: str, layout: List[Tuple[int, str]]):
+        """
+        Segment sayfalarını, başlıkları kaydedilen konumlara yerleştirerek ekle
+        
+        Başlık sayfaları ortak okuyucudan geldiği için fontları çıktıya bir
+        kez yazılır.
+        """
+        reader = PdfReader(segment_path)
+        try:
+            position = 0
+            for at, text in layout:
+                out.add_pages(reader, range(position, at))
+                out.add_page(self._headers.page(text))
+                position = at
+            out.add_pages(reader, range(position, len(reader.pages)))
+        finally:
+            out.release(reader)
+    
+    def _write_segment(self, index: int, article: CitingArticle, segment_path: str) -> Optional[List[Tuple[int, str]]]:
+        """
+        Tek atıfın bölümünü (ayraç ve başlıklar hariç) bağımsız bir PDF olarak yaz
+        
+        Returns:
+            [(segmentteki sayfa konumu, başlık metni), ...] veya PDF yoksa None
+        """
+        writer = PdfWriter()
+        layout: List[Tuple[int, str]] = []
+        
+        def record_header(w, text):
+            layout.append((len(w.pages), text))
+        
+        self._add_segment(writer, index, article, add_header=record_header)
+        if not layout and len(writer.pages) == 0:
+            return None
+        with open(segment_path, 'wb') as f:
+            writer.write(f)
+        return layout
+    
+    def _add_segment(self, writer, index: int, article: CitingArticle,
+                     add_header: Optional[Callable] = None) -> bool:
+        """
+        Atıfın kapak, başlık, atıf ve kaynakça sayfalarını writer'a ekle
+        
+        add_header(writer, metin): bölüm başlığını ekler; varsayılan olarak
+            başlık sayfası doğrudan writer'a eklenir.
+        
+        Returns:
+            bool: PDF bulunup işlendiyse True
+        """
+        add_header = add_header or self._create_section_header
+        cover_title, title_title, citation_title, reference_title = self._section_titles(index)
+        # PDF yoksa devam et
+        if not article.pdf_path or not os.path.exists(article.pdf_path):
+            return False
+        
+        try:
+            reader = PdfReader(article.pdf_path)
+            
+            # B. A.N. Yayının Ünvan Sayfası (Kapak Görselleri)
+            add_header(writer, cover_title)
+            
+            # Kapak sayfalarını ekle - önce cover_pages_all listesini kontrol et
+            cover_added = False
+            
+            # Tüm kapak sayfalarını ekle (yeni sistem)
+            if article.cover_pages_all and len(article.cover_pages_all) > 0:
+                for cover_path in article.cover_pages_all:
+                    if cover_path and os.path.exists(cover_path):
                         try:
-                            ext = article.cover_page_path.lower().split('.')[-1]
+                            # Check file extension
+                            ext = cover_path.lower().split('.')[-1]
                             if ext in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
-                                self._add_image_as_page(writer, article.cover_page_path)
+                                # Convert image to PDF page
+                                self._add_image_as_page(writer, cover_path)
                                 cover_added = True
                             elif ext == 'pdf':
-                                cover_reader = PdfReader(article.cover_page_path)
+                                # PDF file - read directly
+                                cover_reader = PdfReader(cover_path)
                                 for p in cover_reader.pages:
                                     writer.add_page(p)
                                     cover_added = True
                         except Exception as e:
-                            print(f"Error adding fallback cover: {e}")
-                    
-                    # Kapak bulunamadıysa, downloads klasöründe ara
-                    if not cover_added:
-                        kapak_path = os.path.join(os.path.dirname(article.pdf_path), f"kapak_{index}.pdf")
-                        if os.path.exists(kapak_path):
-                            try:
-                                cover_reader = PdfReader(kapak_path)
-                                for p in cover_reader.pages:
-                                    writer.add_page(p)
-                                    cover_added = True
-                            except: pass
-                    
-                    # NOT: Kapak bulunamadığında artık PDF'in ilk sayfasını EKLEMİYORUZ
-                    # Çünkü bu sayfa zaten "Eserin Başlık Sayfası" bölümünde gösterilecek
-                    # Kullanıcı kapak yüklemediyse bu bölüm boş kalır - bu beklenen davranış
-                    
-                    # C. AN. Eserin Başlık Sayfası (PDF ilk sayfa)
-                    self._create_section_header(writer, f"A{index}. Eserin Başlık Sayfası")
-                    
-                    if article.title_page and 1 <= article.title_page <= len(reader.pages):
-                        writer.add_page(reader.pages[article.title_page - 1])
-                    elif len(reader.pages) > 0:
-                        writer.add_page(reader.pages[0])
-                    
-                    # D. AN. Eserde atıf yapılan sayfalar (TÜM sayfalar, highlight ile)
-                    self._create_section_header(writer, f"A{index}. Eserde atıf yapılan sayfa(lar)")
-                    
-                    # citation_pages listesindeki TÜM sayfaları ekle
-                    if article.citation_pages and len(article.citation_pages) > 0:
-                        added_pages = set()
-                        for page_idx, page_num in enumerate(article.citation_pages):
-                            if page_num and 1 <= page_num <= len(reader.pages):
-                                if page_num not in added_pages:
-                                    page = reader.pages[page_num - 1]
-                                    # Bu sayfa için bbox varsa highlight ekle
-                                    if article.citation_bboxes and page_idx < len(article.citation_bboxes):
-                                        try:
-                                            page = self._highlight_page(page, article.citation_bboxes[page_idx])
-                                        except: pass
-                                    writer.add_page(page)
-                                    added_pages.add(page_num)
-                    
-                    # E. AN. Kaynakça Sayfası (highlight ile)
-                    self._create_section_header(writer, f"A{index}. Kaynakça Sayfası")
-                    
-                    if article.reference_page and 1 <= article.reference_page <= len(reader.pages):
-                        page = reader.pages[article.reference_page - 1]
-                        if article.reference_bbox:
-                            try:
-                                page = self._highlight_page(page, article.reference_bbox)
-                            except: pass
-                        writer.add_page(page)
-                    
+                            print(f"Error adding cover {cover_path}: {e}")
+            
+            # Fallback: Eski cover_page_path kullan
+            if not cover_added and article.cover_page_path and os.path.exists(article.cover_page_path):
+                try:
+                    ext = article.cover_page_path.lower().split('.')[-1]
+                    if ext in ['png', 'jpg', 'jpeg', 'gif', 'bmp']:
+                        self._add_image_as_page(writer, article.cover_page_path)
+                        cover_added = True
+                    elif ext == 'pdf':
+                        cover_reader = PdfReader(article.cover_page_path)
+                        for p in cover_reader.pages:
+                            writer.add_page(p)
+                            cover_added = True
                 except Exception as e:
-                    print(f"Error processing PDF {article.pdf_path}: {e}")
+                    print(f"Error adding fallback cover: {e}")
             
-            with open(output_path, 'wb') as f:
-                writer.write(f)
-                
-            return True
+            # Kapak bulunamadıysa, downloads klasöründe ara
+            if not cover_added:
+                kapak_path = os.path.join(os.path.dirname(article.pdf_path), f"kapak_{index}.pdf")
+                if os.path.exists(kapak_path):
+                    try:
+                        cover_reader = PdfReader(kapak_path)
+                        for p in cover_reader.pages:
+                            writer.add_page(p)
+                            cover_added = True
+                    except: pass
+            
+            # NOT: Kapak bulunamadığında artık PDF'in ilk sayfasını EKLEMİYORUZ
+            # Çünkü bu sayfa zaten "Eserin Başlık Sayfası" bölümünde gösterilecek
+            # Kullanıcı kapak yüklemediyse bu bölüm boş kalır - bu beklenen davranış
+            
+            # C. AN. Eserin Başlık Sayfası (PDF ilk sayfa)
+            add_header(writer, title_title)
+            
+            if article.title_page and 1 <= article.title_page <= len(reader.pages):
+                writer.add_page(reader.pages[article.title_page - 1])
+            elif len(reader.pages) > 0:
+                writer.add_page(reader.pages[0])
+            
+            # D/E için plan: eklenecek sayfalar ve vurgular (katmanlar tek belgede üretilir)
+            citation_entries = []
+            # citation_pages listesindeki TÜM sayfaları ekle
+            if article.citation_pages and len(article.citation_pages) > 0:
+                added_pages = set()
+                for page_idx, page_num in enumerate(article.citation_pages):
+                    if page_num and 1 <= page_num <= len(reader.pages):
+                        if page_num not in added_pages:
+                            bbox = None
+                            # Bu sayfa için bbox varsa highlight ekle
+                            if article.citation_bboxes and page_idx < len(article.citation_bboxes):
+                                bbox = article.citation_bboxes[page_idx]
+                            citation_entries.append((reader.pages[page_num - 1], bbox))
+                            added_pages.add(page_num)
+            
+            reference_entry = None
+            if article.reference_page and 1 <= article.reference_page <= len(reader.pages):
+                reference_entry = (reader.pages[article.reference_page - 1], article.reference_bbox)
+            
+            # Vurgulanacak her sayfa için katman sırası
+            highlight_targets = []
+            overlay_index = {}
+            for entry in citation_entries + ([reference_entry] if reference_entry else []):
+                if entry[1]:
+                    overlay_index[id(entry)] = len(highlight_targets)
+                    highlight_targets.append(entry)
+            try:
+                overlays = HighlightOverlayBatch(highlight_targets)
+            except Exception as e:
+                print(f"Error creating highlights: {e}")
+                overlay_index = {}
+            
+            def highlighted(entry):
+                page = entry[0]
+                if id(entry) in overlay_index:
+                    try:
+                        page.merge_page(overlays.page(overlay_index[id(entry)]))
+                    except: pass
+                return page
+            
+            # D. AN. Eserde atıf yapılan sayfalar (TÜM sayfalar, highlight ile)
+            add_header(writer, citation_title)
+            for entry in citation_entries:
+                writer.add_page(highlighted(entry))
+            
+            # E. AN. Kaynakça Sayfası (highlight ile)
+            add_header(writer, reference_title)
+            if reference_entry:
+                writer.add_page(highlighted(reference_entry))
             
+            return True
         except Exception as e:
-            print(f"Assemble Error: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
\ No newline at end of file
+            print(f"Error processing PDF {article.pdf_path}: {e}")
+            return False
+
+
+def build_segment_file(index: int, article: CitingArticle, segment_path: str) -> Optional[List[Tuple[int, str]]]:
+    """
+    Süreç havuzu işçisi: tek atıfın segmentini diske yaz
+    
+    Segment yalnızca atıfın kendi dosyalarına bağlıdır; başlık sayfaları
+    ana süreçte ortak belgeden eklenir.
+    """
+    return FinalDocumentAssembler(SourceArticle())._write_segment(index, article, segment_path)
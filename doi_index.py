@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+DOI İNDEKSİ
+===========
+İndirilen PDF'lerin DOI -> dosya eşlemesi (kalıcı, artımlı)
+
+İşlevler:
+- İndirme klasöründeki PDF'lerin ilk sayfasından DOI çıkarma
+- Sonuçların diskte (JSON) saklanması
+- Yalnızca yeni veya değişmiş (boyut/mtime) dosyaların yeniden taranması
+- DOI ile O(1) dosya arama (bulunamazsa indekslenen DOI'lerde alt dize arama)
+
+Tarama pdfplumber ile yapıldığı için CPU yoğundur; birden fazla dosya
+taranacaksa süreç havuzu kullanılır.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import DOI_INDEX_PATH, PDF_PROCESS_WORKERS
+from extract_doi import clean_doi, find_dois
+
+# İndeks biçimi veya DOI çıkarma mantığı değiştiğinde artırılmalı
+DOI_INDEX_VERSION = 1
+DOI_SCAN_PAGES = 1  # DOI genelde ilk sayfadadır
+
+
+def scan_pdf_dois(pdf_path: str) -> List[str]:
+    """
+    PDF'in ilk sayfa(lar)ındaki DOI'leri döndür (süreç havuzu işçisi)
+
+    Okunamayan dosyalar için boş liste döner; böylece dosya değişmedikçe
+    tekrar taranmaz.
+    """
+    import pdfplumber
+
+    try:
+        with pdfplumber.open(pdf_path) as pdf:
+            dois: List[str] = []
+            for page in pdf.pages[:DOI_SCAN_PAGES]:
+                for doi in find_dois(page.extract_text() or ""):
+                    if doi not in dois:
+                        dois.append(doi)
+            return dois
+    except Exception:
+        return []
+
+
+def pdf_file_stats(directory: Path) -> Dict[str, Tuple[int, int]]:
+    """Klasördeki PDF'lerin {dosya adı: (boyut, mtime_ns)} eşlemesi"""
+    stats: Dict[str, Tuple[int, int]] = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith('.pdf'):
+                    st = entry.stat()
+                    stats[entry.name] = (st.st_size, st.st_mtime_ns)
+    except OSError:
+        pass
+    return stats
+
+
+class DOIIndex:
+    """
+    İndirme klasörü için kalıcı DOI indeksi
+
+    Dosya başına boyut, mtime ve bulunan DOI'ler saklanır. refresh()
+    yalnızca klasörü listeler ve stat bilgisi değişen dosyaları tarar;
+    find() bellekteki DOI sözlüğünden arar.
+    """
+
+    def __init__(self, directory: Path, index_path: Optional[Path] = None,
+                 workers: Optional[int] = None):
+        self.directory = Path(directory)
+        self.index_path = Path(index_path) if index_path else DOI_INDEX_PATH
+        self.workers = workers or PDF_PROCESS_WORKERS
+        self._files: Dict[str, dict] = {}
+        self._by_doi: Dict[str, str] = {}
+        self._loaded = False
+        self._refreshed = False
+
+    # ------------------------------------------------------------------
+    # Kalıcılık
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        """İndeksi diskten oku (klasör veya sürüm farklıysa boş başla)"""
+        self._loaded = True
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if data.get('version') != DOI_INDEX_VERSION or data.get('directory') != str(self.directory):
+            return
+        self._files = data.get('files') or {}
+        self._rebuild_lookup()
+
+    def _save(self):
+        """İndeksi diske yaz (geçici dosya + atomik yer değiştirme)"""
+        data = {
+            'version': DOI_INDEX_VERSION,
+            'directory': str(self.directory),
+            'files': self._files,
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️ DOI indeksi kaydedilemedi: {e}")
+
+    def _rebuild_lookup(self):
+        self._by_doi = {}
+        for name in sorted(self._files):
+            for doi in self._files[name].get('dois', []):
+                self._by_doi.setdefault(doi, name)
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """
+        Klasörü listele, yeni/değişmiş dosyaları tara, silinenleri çıkar
+
+        Returns:
+            int: Taranan dosya sayısı
+        """
+        if not self._loaded:
+            self._load()
+        self._refreshed = True
+
+        current = pdf_file_stats(self.directory)
+
+        removed = [name for name in self._files if name not in current]
+        for name in removed:
+            del self._files[name]
+
+        to_scan = [
+            name for name, (size, mtime) in current.items()
+            if (self._files.get(name, {}).get('size'), self._files.get(name, {}).get('mtime')) != (size, mtime)
+        ]
+
+        if to_scan:
+            print(f"🔎 DOI indeksi güncelleniyor: {len(to_scan)} PDF taranıyor...")
+            for name, dois in zip(to_scan, self._scan(to_scan)):
+                size, mtime = current[name]
+                self._files[name] = {'size': size, 'mtime': mtime, 'dois': dois}
+
+        if to_scan or removed:
+            self._rebuild_lookup()
+            self._save()
+
+        return len(to_scan)
+
+    def _scan(self, names: List[str]) -> List[List[str]]:
+        """Dosyaları (gerekirse paralel) tara, aynı sırada DOI listeleri döndür"""
+        paths = [str(self.directory / name) for name in names]
+        workers = min(self.workers, len(paths))
+        if workers <= 1:
+            return [scan_pdf_dois(path) for path in paths]
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(scan_pdf_dois, paths))
+
+    # ------------------------------------------------------------------
+    # Arama
+    # ------------------------------------------------------------------
+
+    def find(self, doi: str) -> Optional[str]:
+        """
+        DOI'ye ait PDF'in yolunu döndür
+
+        İndeks hiç yenilenmemişse önce bir kez yenilenir; toplu kontrollerden
+        önce refresh() çağrılması yeterlidir.
+        """
+        if not doi:
+            return None
+        if not self._refreshed:
+            self.refresh()
+
+        doi = clean_doi(doi.strip())
+        name = self._by_doi.get(doi)
+        if name is None:
+            # Metinde DOI'ye bitişik yazılan kelime (örn. "...-0001-xReceived")
+            # indekslenen DOI'nin parçası olur; eski alt dize aramasıyla eşleşir
+            name = next((name for indexed, name in self._by_doi.items() if doi in indexed), None)
+        if name is None:
+            return None
+
+        path = self.directory / name
+        return str(path) if path.exists() else None
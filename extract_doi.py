@@ -10,6 +10,36 @@ import json
 import re
 import os
 
+# DOI pattern'leri
+# Standard: 10.xxxx/xxxxx
+DOI_PATTERNS = [
+    re.compile(r'(?:doi\s*[:.]?\s*)(10\.\d{4,}/[^\s\]>\)]+)', re.IGNORECASE),  # doi: 10.xxx/xxx
+    re.compile(r'(?:https?://doi\.org/)(10\.\d{4,}/[^\s\]>\)]+)', re.IGNORECASE),  # https://doi.org/10.xxx
+    re.compile(r'(?:https?://dx\.doi\.org/)(10\.\d{4,}/[^\s\]>\)]+)', re.IGNORECASE),  # https://dx.doi.org/10.xxx
+    re.compile(r'\b(10\.\d{4,}/[^\s\]>\),]+)', re.IGNORECASE),  # Bare DOI: 10.xxx/xxx
+]
+
+_TRAILING_PUNCT_RE = re.compile(r'[.,;:\s]+$')
+
+
+def clean_doi(doi):
+    """Sondaki noktalama işaretlerini kaldır ve küçük harfe çevir"""
+    return _TRAILING_PUNCT_RE.sub('', doi).lower()
+
+
+def find_dois(text):
+    """
+    Metindeki tüm DOI'leri (temizlenmiş, küçük harf, tekrarsız) döndür
+    """
+    dois = []
+    for pattern in DOI_PATTERNS:
+        for match in pattern.findall(text):
+            doi = clean_doi(match)
+            if doi not in dois:
+                dois.append(doi)
+    return dois
+
+
 def extract_doi_from_pdf(pdf_path):
     """
     PDF dosyasından DOI çıkar
@@ -29,24 +59,13 @@ def extract_doi_from_pdf(pdf_path):
                 page = pdf.pages[page_num]
                 text = page.extract_text() or ""
                 
-                # DOI pattern'leri
-                # Standard: 10.xxxx/xxxxx
-                doi_patterns = [
-                    r'(?:doi\s*[:.]?\s*)(10\.\d{4,}/[^\s\]>\)]+)',  # doi: 10.xxx/xxx
-                    r'(?:https?://doi\.org/)(10\.\d{4,}/[^\s\]>\)]+)',  # https://doi.org/10.xxx
-                    r'(?:https?://dx\.doi\.org/)(10\.\d{4,}/[^\s\]>\)]+)',  # https://dx.doi.org/10.xxx
-                    r'\b(10\.\d{4,}/[^\s\]>\),]+)',  # Bare DOI: 10.xxx/xxx
-                ]
-                
-                for pattern in doi_patterns:
-                    matches = re.findall(pattern, text, re.IGNORECASE)
+                for pattern in DOI_PATTERNS:
+                    matches = pattern.findall(text)
                     if matches:
                         # En uzun DOI'yi seç (daha complete olma ihtimali)
                         doi = max(matches, key=len)
-                        # Temizlik: sondaki noktalama işaretlerini kaldır
-                        doi = re.sub(r'[.,;:\s]+$', '', doi)
                         return {
-                            "doi": doi.lower(),
+                            "doi": clean_doi(doi),
                             "source": f"page_{page_num + 1}",
                             "found": True
                         }
@@ -57,6 +76,14 @@ def extract_doi_from_pdf(pdf_path):
         return {"doi": None, "source": "error", "error": str(e), "found": False}
 
 
+def run_extract(pdf_path):
+    """Tek bir PDF yolu için JSON sonucunu döndür (dosya yoksa hata)"""
+    if not pdf_path or not os.path.exists(pdf_path):
+        return {"found": False, "error": f"File not found: {pdf_path}"}
+    
+    return extract_doi_from_pdf(pdf_path)
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(json.dumps({"found": False, "error": "Missing PDF path argument"}))
@@ -68,5 +95,5 @@ if __name__ == "__main__":
         print(json.dumps({"found": False, "error": f"File not found: {pdf_path}"}))
         sys.exit(1)
     
-    result = extract_doi_from_pdf(pdf_path)
+    result = run_extract(pdf_path)
     print(json.dumps(result))
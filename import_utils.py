@@ -3,50 +3,130 @@
 Web of Science Dosya İçe Aktarma Modülü
 ========================================
 WoS 'Plain Text' (tab-delimited veya tagged) formatındaki dosyaları okur.
+
+WoS dışa aktarımları 500/1000 kayıtla sınırlı olduğundan birden çok dosya
+parse_files ile birlikte (paralel) okunup UT ve DOI üzerinden tekilleştirilir.
 """
 
 import os
-from typing import List, Tuple, Optional
-from config import CitingArticle, SourceArticle
+import re
+import csv
+import codecs
+from typing import Iterable, Iterator, List, Tuple, Optional
+from config import CitingArticle, SourceArticle, PDF_PROCESS_WORKERS
+
+# Kodlama tespiti için okunan dosya başı (bayt)
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Liste olması gereken alanlar
+LIST_TAGS = ("AU", "AF", "CR", "C1")
+
+# Tab-delimited formatta liste alanlarının ayırıcısı
+TAB_LIST_SEPARATOR = "; "
+
+_DOI_PREFIX_RE = re.compile(r'^(?:https?://(?:dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
 
 class WoSFileImporter:
     """Web of Science .txt export dosyası okuyucu (Field Tagged format)"""
     
     @staticmethod
-    def parse_file(file_path: str) -> List[CitingArticle]:
+    def detect_encoding(file_path: str, sample_size: int = ENCODING_SAMPLE_BYTES) -> str:
         """
-        WoS Plain Text export dosyasını okur ve CitingArticle listesi döner.
-        Beklenen format: Field Tagged (örn: PT J, AU ..., TI ..., ER)
+        Dosya kodlamasını yalnızca dosya başından (bayt düzeyinde) tespit et
+        
+        BOM varsa ona göre; yoksa örnek UTF-8 olarak çözülebiliyorsa (örneğin
+        sonunda yarım kalmış çok baytlı karakter hariç) 'utf-8', aksi halde
+        'latin-1' döner.
+        """
+        with open(file_path, 'rb') as f:
+            sample = f.read(sample_size)
+        
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+        
+        try:
+            sample.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError as e:
+            # Örnek bir karakterin ortasında kesilmiş olabilir
+            if len(sample) == sample_size and e.start >= len(sample) - 3 and e.reason == 'unexpected end of data':
+                return 'utf-8'
+        return 'latin-1'
+    
+    @staticmethod
+    def iter_file(file_path: str) -> Iterator[CitingArticle]:
         """
-        articles = []
+        WoS Plain Text export dosyasını satır satır okuyup her kayıt (ER)
+        tamamlandığında CitingArticle üretir.
         
+        Bellek kullanımı dosya boyutundan bağımsızdır: yalnızca o an okunan
+        kaydın alanları tutulur.
+        """
         if not os.path.exists(file_path):
             print(f"❌ Dosya bulunamadı: {file_path}")
-            return []
+            return
+        
+        encoding = WoSFileImporter.detect_encoding(file_path)
+        file_format = WoSFileImporter.detect_format(file_path, encoding)
+        print(f"📄 Dosya okunuyor (encoding: {encoding}, format: {file_format})")
+        
+        if file_format == "tab-delimited":
+            yield from WoSFileImporter._iter_tab_delimited(file_path, encoding)
+        else:
+            yield from WoSFileImporter._iter_tagged(file_path, encoding)
+    
+    @staticmethod
+    def detect_format(file_path: str, encoding: str) -> str:
+        """İlk satırdan formatı tespit et: 'tab-delimited' veya 'tagged'"""
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+            first_line = f.readline().lstrip('\ufeff')
+        if first_line.startswith("PT\t"):
+            return "tab-delimited"
+        return "tagged"
+    
+    @staticmethod
+    def _iter_tab_delimited(file_path: str, encoding: str) -> Iterator[CitingArticle]:
+        """
+        Tab-delimited export: ilk satır tag başlıkları, sonraki her satır bir
+        kayıt. Çok değerli alanlar (AU, AF, CR, C1) "; " ile ayrılır.
+        """
+        with open(file_path, 'r', encoding=encoding, errors='replace', newline='') as f:
+            reader = csv.reader(f, delimiter='\t', quoting=csv.QUOTE_NONE)
+            header = next(reader, None)
+            if not header:
+                return
+            header = [h.lstrip('\ufeff').strip() for h in header]
             
+            for row in reader:
+                current_article = {}
+                for tag, value in zip(header, row):
+                    value = value.strip()
+                    if not tag or not value:
+                        continue
+                    if tag in LIST_TAGS:
+                        current_article[tag] = [v.strip() for v in value.split(TAB_LIST_SEPARATOR) if v.strip()]
+                    else:
+                        current_article[tag] = value
+                
+                if current_article:
+                    article = WoSFileImporter._dict_to_article(current_article)
+                    if article:
+                        yield article
+    
+    @staticmethod
+    def _iter_tagged(file_path: str, encoding: str) -> Iterator[CitingArticle]:
+        """Field Tagged export: her alan 'XX değer' satırı, kayıt sonu 'ER'"""
         current_article = {}
         current_tag = ""
         
-        try:
-            # Önce farklı encodingleri dene
-            content = ""
-            for encoding in ['utf-8-sig', 'utf-8', 'latin-1', 'cp1254']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    print(f"📄 Dosya okundu (encoding: {encoding})")
-                    break
-                except UnicodeDecodeError:
-                    continue
-            
-            if not content:
-                print("❌ Dosya hiçbir encoding ile okunamadı!")
-                return []
-
-            lines = content.splitlines()
-                
-            for line in lines:
+        # Örnekten sonra geçersiz bayt çıkarsa okuma durmasın
+        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+            for line in f:
                 # Satır sonu karakterlerini temizle ama baştaki boşlukları koru (devam satırları için)
+                line = line.rstrip('\r\n')
                 line_stripped = line.rstrip()
                 if not line_stripped:
                     continue
@@ -78,7 +158,7 @@ class WoSFileImporter:
                             # Nesneye dönüştür
                             article = WoSFileImporter._dict_to_article(current_article)
                             if article:
-                                articles.append(article)
+                                yield article
                         current_article = {}
                         current_tag = ""
                     elif tag == "EF": # End of File
@@ -87,7 +167,7 @@ class WoSFileImporter:
                         pass
                     elif tag == "VR": # Version (Header) - Yoksay
                         pass
-                    elif tag in ["AU", "AF", "CR", "C1"]: # Liste olması gereken alanlar
+                    elif tag in LIST_TAGS: # Liste olması gereken alanlar
                         if tag not in current_article:
                             current_article[tag] = []
                         current_article[tag].append(value)
@@ -99,18 +179,81 @@ class WoSFileImporter:
                     value = line.strip()
                     if not value: continue
                     
-                    if current_tag in ["AU", "AF", "CR", "C1"]:
+                    if current_tag in LIST_TAGS:
                         current_article[current_tag].append(value)
                     else:
                         # Metin alanları için boşlukla ekle
                         current_article[current_tag] += " " + value
-                        
+    
+    @staticmethod
+    def parse_file(file_path: str) -> List[CitingArticle]:
+        """
+        WoS Plain Text export dosyasını okur ve CitingArticle listesi döner.
+        Beklenen format: Field Tagged (örn: PT J, AU ..., TI ..., ER)
+        """
+        if not os.path.exists(file_path):
+            print(f"❌ Dosya bulunamadı: {file_path}")
+            return []
+        
+        try:
+            articles = list(WoSFileImporter.iter_file(file_path))
             print(f"✅ {len(articles)} makale başarıyla okundu.")
             return articles
             
         except Exception as e:
             print(f"❌ Beklenmeyen hata: {e}")
             return []
+    
+    @staticmethod
+    def parse_files(file_paths: List[str], workers: Optional[int] = None) -> List[CitingArticle]:
+        """
+        Birden çok WoS export dosyasını (tagged veya tab-delimited) paralel
+        okur ve çakışan kayıtları UT / DOI üzerinden tekilleştirir.
+        
+        Kayıt sırası dosya sırasını izler; bir kayıt ilk görüldüğü yerde kalır.
+        """
+        file_paths = list(file_paths)
+        workers = min(workers or PDF_PROCESS_WORKERS, len(file_paths))
+        
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(WoSFileImporter.parse_file, file_paths))
+        else:
+            results = [WoSFileImporter.parse_file(path) for path in file_paths]
+        
+        total = sum(len(articles) for articles in results)
+        articles = WoSFileImporter.deduplicate(a for articles in results for a in articles)
+        if len(file_paths) > 1:
+            print(f"✅ {len(file_paths)} dosyadan {total} kayıt okundu, "
+                  f"{total - len(articles)} tekrar çıkarıldı: {len(articles)} makale.")
+        return articles
+    
+    @staticmethod
+    def deduplicate(articles: Iterable[CitingArticle]) -> List[CitingArticle]:
+        """UT (WoS ID) ve normalize DOI hash indeksiyle tekrarları çıkar (doğrusal zaman)"""
+        seen = set()
+        unique = []
+        for article in articles:
+            keys = []
+            if article.wos_id:
+                keys.append(("UT", article.wos_id.strip().upper()))
+            doi = WoSFileImporter.normalize_doi(article.doi)
+            if doi:
+                keys.append(("DI", doi))
+            
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+            unique.append(article)
+        return unique
+    
+    @staticmethod
+    def normalize_doi(doi: str) -> str:
+        """DOI'yi karşılaştırma için normalize et (önek yok, küçük harf)"""
+        if not doi:
+            return ""
+        return _DOI_PREFIX_RE.sub('', doi.strip()).lower()
 
     @staticmethod
     def _dict_to_article(data: dict) -> Optional[CitingArticle]:
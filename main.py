@@ -13,22 +13,30 @@ Kullanım:
     3. Kullanıcıdan PDF'leri ve kapak dosyalarını indirmesini iste
     4. PDF'leri işle
     5. Final dokümanı oluştur
+    
+    (İsteğe bağlı) İzleme modu: PDF'ler indirme klasörüne düştükçe
+    eşleştirilip arka planda işlenir.
 """
 
 import os
 import sys
-import json
+import glob
+import time
 from pathlib import Path
 from datetime import datetime
 from typing import List, Optional
 
 from config import (
     CandidateInfo, SourceArticle, CitingArticle,
-    DOWNLOADS_DIR, OUTPUT_DIR, print_banner, print_step
+    DOWNLOADS_DIR, OUTPUT_DIR, PDF_PROCESS_WORKERS, WATCH_POLL_INTERVAL,
+    ensure_dir, print_banner, print_step
 )
 from import_utils import WoSFileImporter
-from pdf_processor import PDFProcessor, CitationFinder, PDFDownloadManager
-from document_builder import CitationDocumentBuilder, FinalDocumentAssembler
+from session_store import SessionStore
+from pdf_processor import (
+    PDFProcessor, CitationFinder, PDFDownloadManager, DownloadWatcher,
+    analyze_citing_pdf, _init_analysis_worker, source_for_workers
+)
 
 
 class CitationApp:
@@ -39,117 +47,42 @@ class CitationApp:
         self.source_article: Optional[SourceArticle] = None
         self.download_manager = PDFDownloadManager()
         
-        # Veri dosyası (devam etmek için)
-        self.data_file = OUTPUT_DIR / "session_data.json"
+        # Oturum deposu (devam etmek için; her makale sonucu anında kaydedilir)
+        self.session = SessionStore()
     
     def save_session(self):
-        """Oturum verilerini kaydet"""
+        """Oturumun tamamını kaydet (makale listesi değiştiğinde)"""
         if not self.source_article:
             return
         
-        data = {
-            "candidate": {
-                "name": self.candidate.name if self.candidate else "",
-                "institution": self.candidate.institution if self.candidate else "",
-                "department": self.candidate.department if self.candidate else "",
-                "application_period": self.candidate.application_period if self.candidate else "",
-            },
-            "source_article": {
-                "title": self.source_article.title,
-                "authors": self.source_article.authors,
-                "journal": self.source_article.journal,
-                "year": self.source_article.year,
-                "volume": self.source_article.volume,
-                "issue": self.source_article.issue,
-                "pages": self.source_article.pages,
-                "doi": self.source_article.doi,
-                "wos_id": self.source_article.wos_id,
-            },
-            "citing_articles": [
-                {
-                    "title": a.title,
-                    "authors": a.authors,
-                    "journal": a.journal,
-                    "year": a.year,
-                    "volume": a.volume,
-                    "issue": a.issue,
-                    "pages": a.pages,
-                    "doi": a.doi,
-                    "wos_id": a.wos_id,
-                    "pdf_path": a.pdf_path,
-                    "title_page": a.title_page,
-                    "citation_page": a.citation_page,
-                    "reference_page": a.reference_page,
-                    "reference_number": a.reference_number,
-                    "cover_page_path": getattr(a, 'cover_page_path', None),
-                }
-                for a in self.source_article.citing_articles
-            ],
-            "saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        print(f"💾 Oturum kaydedildi: {self.data_file}")
+        if self.session.save(self.candidate, self.source_article):
+            print(f"💾 Oturum kaydedildi: {self.session.db_path}")
+    
+    def save_meta(self):
+        """Aday ve kaynak makale bilgisini kaydet (makaleler yeniden yazılmaz)"""
+        if self.source_article:
+            self.session.save_meta(self.candidate, self.source_article)
+    
+    def save_article(self, index: int, article: CitingArticle):
+        """Tek makalenin sonucunu hemen kaydet (1 tabanlı sıra)"""
+        if self.source_article:
+            self.session.save_article(index, article)
     
     def load_session(self) -> bool:
         """Önceki oturumu yükle"""
         try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Aday bilgisi
-            if data.get("candidate"):
-                c = data["candidate"]
-                self.candidate = CandidateInfo(
-                    name=c.get("name", ""),
-                    institution=c.get("institution", ""),
-                    department=c.get("department", ""),
-                    application_period=c.get("application_period", "")
-                )
-            
-            # Kaynak makale
-            if data.get("source_article"):
-                s = data["source_article"]
-                self.source_article = SourceArticle(
-                    title=s.get("title", ""),
-                    authors=s.get("authors", []),
-                    journal=s.get("journal", ""),
-                    year=s.get("year", 0),
-                    volume=s.get("volume", ""),
-                    issue=s.get("issue", ""),
-                    pages=s.get("pages", ""),
-                    doi=s.get("doi", ""),
-                    wos_id=s.get("wos_id", ""),
-                )
-            
-            # Atıf yapan makaleler
-            for a in data.get("citing_articles", []):
-                article = CitingArticle(
-                    title=a.get("title", ""),
-                    authors=a.get("authors", []),
-                    journal=a.get("journal", ""),
-                    year=a.get("year", 0),
-                    volume=a.get("volume", ""),
-                    issue=a.get("issue", ""),
-                    pages=a.get("pages", ""),
-                    doi=a.get("doi", ""),
-                    wos_id=a.get("wos_id", ""),
-                    pdf_path=a.get("pdf_path"),
-                    title_page=a.get("title_page"),
-                    citation_page=a.get("citation_page"),
-                    reference_page=a.get("reference_page"),
-                    reference_number=a.get("reference_number"),
-                )
-                self.source_article.citing_articles.append(article)
-            
-            print(f"📂 Önceki oturum yüklendi ({data.get('saved_at', '')})")
-            return True
-            
+            candidate, source_article = self.session.load()
         except Exception as e:
             print(f"⚠️  Oturum yükleme hatası: {e}")
             return False
+        
+        if source_article is None:
+            return False
+        
+        self.candidate = candidate
+        self.source_article = source_article
+        print("📂 Önceki oturum yüklendi")
+        return True
     
     def get_candidate_info(self):
         """Kullanıcı bilgilerini al"""
@@ -163,6 +96,7 @@ class CitationApp:
         self.candidate.application_period = input("Başvuru Dönemi (örn: 2025 Mart): ").strip() or "2025 Mart"
         
         print(f"\n✅ Aday bilgileri alındı: {self.candidate.name}")
+        self.save_meta()
     
     def import_wos_file(self):
         """WoS export dosyasını yükle"""
@@ -171,11 +105,13 @@ class CitationApp:
         print("Lütfen Web of Science'dan 'Export > Plain Text File' seçeneği ile")
         print("indirdiğiniz dosyanın tam yolunu girin. (Content: Full Record)")
         print("Varsayılan: savedrecs.txt")
+        print("Birden fazla dosya için ';' ile ayırın veya joker kullanın (örn: savedrecs*.txt)")
         
-        path = input("\nDosya yolu [savedrecs.txt]: ").strip() or "savedrecs.txt"
+        entry = input("\nDosya yolu [savedrecs.txt]: ").strip() or "savedrecs.txt"
+        paths = self._expand_import_paths(entry)
         
-        if not os.path.exists(path):
-            print(f"❌ Dosya bulunamadı: {path}")
+        if not paths:
+            print(f"❌ Dosya bulunamadı: {entry}")
             return False
             
         # Kaynak makale bilgilerini al (eğer yoksa)
@@ -205,8 +141,8 @@ class CitationApp:
                 print("❌ Başlık girilmedi, işlem iptal.")
                 return False
         
-        print(f"\n📂 '{path}' dosyası okunuyor...")
-        articles = WoSFileImporter.parse_file(path)
+        print(f"\n📂 {len(paths)} dosya okunuyor: {', '.join(os.path.basename(p) for p in paths)}")
+        articles = WoSFileImporter.parse_files(paths)
         
         if articles:
             self.source_article.citing_articles = articles
@@ -218,6 +154,22 @@ class CitationApp:
             print("⚠️ Dosyadan hiç makale okunamadı.")
             return False
     
+    @staticmethod
+    def _expand_import_paths(entry: str) -> List[str]:
+        """';' ile ayrılmış yolları ve joker desenlerini var olan dosyalara aç"""
+        paths = []
+        for part in entry.split(';'):
+            part = part.strip().strip('"')
+            if not part:
+                continue
+            matches = sorted(glob.glob(part)) if glob.has_magic(part) else [part]
+            for path in matches:
+                if os.path.isfile(path) and path not in paths:
+                    paths.append(path)
+                elif not glob.has_magic(part):
+                    print(f"⚠️ Dosya bulunamadı, atlanıyor: {path}")
+        return paths
+    
     def show_download_instructions(self):
         """PDF indirme talimatlarını göster"""
         print_step(3, "PDF İNDİRME TALİMATLARI")
@@ -255,6 +207,7 @@ Her atıf için 2 dosya indirmeniz gerekmektedir:
         print("İNDİRİLMESİ GEREKEN MAKALELER:")
         print("="*70)
         
+        self.download_manager.refresh_index()
         for i, article in enumerate(self.source_article.citing_articles, 1):
             pdf_exists = self.download_manager.check_pdf_exists(article)
             status = "✓ PDF VAR" if pdf_exists else "✗ PDF BEKLİYOR"
@@ -279,6 +232,7 @@ Her atıf için 2 dosya indirmeniz gerekmektedir:
             return False
             
         all_found = True
+        self.download_manager.refresh_index()
         for article in self.source_article.citing_articles:
             pdf_path = self.download_manager.find_pdf_for_article(article)
             if pdf_path:
@@ -290,41 +244,184 @@ Her atıf için 2 dosya indirmeniz gerekmektedir:
         
         return all_found
     
-    def process_pdfs(self):
-        """PDF'leri işle ve atıf sayfalarını bul"""
+    def process_pdfs(self, workers: Optional[int] = None):
+        """
+        PDF'leri işle ve atıf sayfalarını bul
+        
+        Args:
+            workers: İşçi süreç sayısı (None: config.PDF_PROCESS_WORKERS, 1: sıralı)
+        """
         print_step(4, "PDF İŞLEME")
         
         if not self.source_article:
             print("❌ Önce atıflar yüklenmeli!")
             return
         
+        articles = self.source_article.citing_articles
+        pending = [(i, a) for i, a in enumerate(articles, 1) if a.pdf_path]
+        workers = workers or PDF_PROCESS_WORKERS
+        
+        # PDF'i ve kaynak makalesi değişmemiş atıflar yeniden analiz edilmez
         finder = CitationFinder(self.source_article)
+        to_analyze = []
+        for i, article in pending:
+            if finder.apply_cached_result(article.pdf_path, article):
+                self.save_article(i, article)
+            else:
+                to_analyze.append((i, article))
+        if finder.cache_hits:
+            print(f"♻️  {finder.cache_hits}/{len(pending)} PDF sonucu önbellekten alındı, "
+                  f"{len(to_analyze)} PDF analiz edilecek")
+        
+        if workers > 1 and len(to_analyze) > 1:
+            self._process_pdfs_parallel(to_analyze, min(workers, len(to_analyze)))
+        else:
+            for i, article in to_analyze:
+                print(f"\n[{i}/{len(articles)}] İşleniyor...")
+                finder.process_pdf(article.pdf_path, article)
+                self.save_article(i, article)
         
         processed = 0
-        for i, article in enumerate(self.source_article.citing_articles, 1):
-            if article.pdf_path:
-                print(f"\n[{i}/{len(self.source_article.citing_articles)}] İşleniyor...")
-                article = finder.process_pdf(article.pdf_path, article)
-                
-                if article.citation_page:
-                    print(f"   ✓ Atıf sayfası: {article.citation_page}")
-                    processed += 1
-                else:
-                    print(f"   ⚠️  Atıf sayfası otomatik bulunamadı")
+        for i, article in pending:
+            if article.citation_pages:
+                print(f"   ✓ [{i}] Atıf sayfası: {', '.join(map(str, article.citation_pages))}")
+                processed += 1
+            else:
+                print(f"   ⚠️  [{i}] Atıf sayfası otomatik bulunamadı")
+        
+        print(f"\n📊 İşleme Sonucu: {processed}/{len(articles)} başarılı")
+        print(f"💾 Sonuçlar işlendikçe kaydedildi: {self.session.db_path}")
+    
+    def _process_pdfs_parallel(self, pending: List, workers: int):
+        """PDF'leri süreç havuzunda analiz et, sonuçları sırayla uygula"""
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        print(f"⚙️  {len(pending)} PDF {workers} işçi ile paralel işleniyor...")
+        
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_analysis_worker,
+            initargs=(source_for_workers(self.source_article),)
+        ) as executor:
+            futures = {
+                executor.submit(analyze_citing_pdf, i, article): i
+                for i, article in pending
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    index, fields = future.result()
+                    results[index] = fields
+                except Exception as e:
+                    print(f"❌ [{i}] PDF işleme hatası: {e}")
+        
+        # Sonuçları atıf sırasına göre uygula (deterministik)
+        for index in sorted(results):
+            self._apply_analysis_result(index, results[index])
+    
+    def _apply_analysis_result(self, index: int, fields: dict):
+        """İşçiden gelen analiz sonucunu (1 tabanlı sıra) makaleye uygula ve kaydet"""
+        article = self.source_article.citing_articles[index - 1]
+        for name, value in fields.items():
+            setattr(article, name, value)
+        self.save_article(index, article)
+    
+    def watch_downloads(self, poll_interval: float = WATCH_POLL_INTERVAL, workers: Optional[int] = None):
+        """
+        İndirme klasörünü izle; yeni PDF'leri eşleştirip arka planda işle
+        
+        Her PDF bittiğinde oturum kaydedilir. Tüm makaleler işlenince veya
+        Ctrl+C ile izleme sona erer.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        print_step(7, "İNDİRME KLASÖRÜNÜ İZLEME")
+        
+        if not self.source_article:
+            print("❌ Önce atıflar yüklenmeli!")
+            return
         
-        print(f"\n📊 İşleme Sonucu: {processed}/{len(self.source_article.citing_articles)} başarılı")
+        articles = self.source_article.citing_articles
+        watcher = DownloadWatcher(self.download_manager.download_dir)
+        watcher.prime()
         
-        # Oturumu güncelle
-        self.save_session()
+        workers = max(1, workers or PDF_PROCESS_WORKERS)
+        futures = {}
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_analysis_worker,
+            initargs=(source_for_workers(self.source_article),)
+        )
+        
+        def is_done(article: CitingArticle) -> bool:
+            # title_page yalnızca PDF analiz edildiğinde doldurulur
+            return bool(article.pdf_path and article.title_page)
+        
+        def submit(i: int, article: CitingArticle, pdf_path: str):
+            article.pdf_path = pdf_path
+            print(f"   📥 [{i}] {article.title[:40]}... -> {os.path.basename(pdf_path)}")
+            futures[executor.submit(analyze_citing_pdf, i, article)] = i
+        
+        print(f"👀 İzleniyor: {self.download_manager.download_dir}")
+        print("   (Durdurmak için Ctrl+C)")
+        
+        try:
+            # Klasörde zaten bulunan ama henüz işlenmemiş PDF'ler
+            self.download_manager.refresh_index()
+            for i, article in enumerate(articles, 1):
+                pdf_path = self.download_manager.find_pdf_for_article(article)
+                if pdf_path and not is_done(article):
+                    submit(i, article, pdf_path)
+            
+            while True:
+                ready = watcher.poll()
+                if ready:
+                    self.download_manager.refresh_index()
+                    in_flight = set(futures.values())
+                    for i, article in enumerate(articles, 1):
+                        if i in in_flight:
+                            continue
+                        pdf_path = self.download_manager.find_pdf_for_article(article)
+                        if pdf_path in ready:
+                            submit(i, article, pdf_path)
+                
+                for future in [f for f in futures if f.done()]:
+                    i = futures.pop(future)
+                    try:
+                        index, fields = future.result()
+                    except Exception as e:
+                        print(f"❌ [{i}] PDF işleme hatası: {e}")
+                        continue
+                    self._apply_analysis_result(index, fields)
+                    article = articles[index - 1]
+                    if article.citation_pages:
+                        print(f"   ✓ [{i}] Atıf sayfası: {', '.join(map(str, article.citation_pages))}")
+                    else:
+                        print(f"   ⚠️  [{i}] Atıf sayfası otomatik bulunamadı")
+                
+                if not futures and all(is_done(a) for a in articles):
+                    print("\n✅ Tüm PDF'ler işlendi, izleme sona erdi.")
+                    break
+                
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            print("\n⏹️  İzleme durduruldu.")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def generate_documents(self):
         """Final dokümanları oluştur"""
+        # reportlab/openpyxl yalnızca doküman üretilirken yüklenir
+        from document_builder import CitationDocumentBuilder, FinalDocumentAssembler
+        
         print_step(5, "DOKÜMAN OLUŞTURMA")
         
         if not self.source_article or not self.candidate:
             print("❌ Eksik veriler!")
             return
         
+        ensure_dir(OUTPUT_DIR)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # PDF builder
@@ -356,9 +453,12 @@ Her atıf için 2 dosya indirmeniz gerekmektedir:
         """Ana program döngüsü"""
         print_banner()
         
-        # Önceki oturum var mı kontrol et
-        if self.data_file.exists():
-            choice = input("\n📂 Önceki oturum bulundu. Devam etmek ister misiniz? (E/H): ").strip().upper()
+        # Önceki oturum var mı kontrol et (makaleler yalnızca devam edilirse yüklenir)
+        summary = self.session.summary() if self.session.exists() else None
+        if summary:
+            print(f"\n📂 Önceki oturum bulundu: {summary['title'][:50]}... "
+                  f"({summary['article_count']} atıf, {summary['saved_at']})")
+            choice = input("   Devam etmek ister misiniz? (E/H): ").strip().upper()
             if choice == 'E':
                 if self.load_session():
                     print(f"   Makale: {self.source_article.title[:50]}...")
@@ -375,6 +475,7 @@ Her atıf için 2 dosya indirmeniz gerekmektedir:
 4. İndirilen PDF'leri kontrol et
 5. PDF'leri işle (atıf sayfalarını bul)
 6. Final dokümanları oluştur
+7. İndirme klasörünü izle (yeni PDF'leri otomatik işle)
 
 0. Çıkış
             """)
@@ -398,6 +499,9 @@ Her atıf için 2 dosya indirmeniz gerekmektedir:
                 
             elif choice == '6':
                 self.generate_documents()
+            
+            elif choice == '7':
+                self.watch_downloads()
 
             elif choice == '0':
                 print("\n👋 Güle güle!")
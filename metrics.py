@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""
+ÖLÇÜM MODÜLÜ
+============
+Atıf analizinin PDF başına aşama süreleri ve sayaçları
+
+İşlevler:
+- Aşama zamanlayıcıları (metin çıkarma, kaynakça eşleştirme, işaret
+  taraması, bbox aramaları, sonuç önbelleği)
+- Sayfa/kelime çıkarma ve önbellek isabeti sayaçları
+- PDF başına makine tarafından okunabilir kayıt (as_dict) ve isteğe bağlı
+  NDJSON günlüğü (config.METRICS_LOG_PATH)
+- Tek bir belge için isteğe bağlı cProfile dökümü
+
+Aşamalar iç içe çalışabilir (örn. kaynakça taraması sırasında sayfa metni
+tembel çıkarılır); her aşamaya yalnızca kendi süresi yazılır, iç aşamanın
+süresi dıştakinden düşülür. Böylece aşama süreleri toplanabilir.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Kayıtta her zaman (sıfır da olsa) yer alan aşamalar
+PHASES = (
+    "load",                    # PDF açma, sayfa sayısı, önbellekten sayfa okuma
+    "extract_text",            # pdfplumber sayfa metni + kaynakça sınıflandırma
+    "extract_words",           # pdfplumber kelime koordinatları
+    "references",              # PHASE 1: kaynakça sayfalarını gezme, ön filtre
+    "reference_doi",           # PHASE 1A: DOI eşleşmesi ve numara çıkarma
+    "reference_author_year",   # PHASE 1B: Yazar + Yıl deseni
+    "reference_proximity",     # PHASE 1 yedeği: yakınlık araması
+    "markers",                 # PHASE 2: gövde atıf işareti taraması
+    "bbox",                    # Atıf işareti ve kaynakça girişi koordinatları
+    "result_cache",            # Analiz sonucu önbelleği (anahtar, okuma/yazma)
+)
+
+
+@dataclass
+class PDFMetrics:
+    """Tek bir PDF analizinin ölçümleri"""
+    pdf_path: str = ""
+    page_count: int = 0
+    pages_extracted: int = 0    # Metni pdfplumber ile çıkarılan sayfalar
+    pages_cached: int = 0       # Metni çıkarma önbelleğinden gelen sayfalar
+    words_extracted: int = 0    # Kelimeleri pdfplumber ile çıkarılan sayfalar
+    words_cached: int = 0
+    result_cache_hit: bool = False
+    total_seconds: float = 0.0
+    timings: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+    _stack: List[str] = field(default_factory=list, repr=False)
+    _mark: float = field(default=0.0, repr=False)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Bloğun süresini aşamaya yaz (iç aşamaların süresi hariç)"""
+        now = time.perf_counter()
+        if self._stack:
+            parent = self._stack[-1]
+            self.timings[parent] = self.timings.get(parent, 0.0) + now - self._mark
+        self._stack.append(name)
+        self._mark = now
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self.timings[name] = self.timings.get(name, 0.0) + now - self._mark
+            self._stack.pop()
+            self._mark = now
+
+    def as_dict(self) -> dict:
+        """JSON'a yazılabilir kayıt (süreler milisaniye)"""
+        return {
+            "pdf": os.path.basename(self.pdf_path),
+            "page_count": self.page_count,
+            "pages_extracted": self.pages_extracted,
+            "pages_cached": self.pages_cached,
+            "words_extracted": self.words_extracted,
+            "words_cached": self.words_cached,
+            "result_cache_hit": self.result_cache_hit,
+            "total_ms": round(self.total_seconds * 1000, 2),
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.timings.items()},
+        }
+
+
+def append_metrics(metrics: PDFMetrics, log_path) -> None:
+    """Kaydı NDJSON günlüğüne tek satır olarak ekle (hata analizi durdurmaz)"""
+    try:
+        with open(log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(metrics.as_dict(), ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"⚠️  Ölçüm günlüğü yazılamadı: {e}")
+
+
+@contextmanager
+def profiled(output_path: Optional[str]):
+    """output_path verilmişse bloğu cProfile ile çalıştırıp dökümü yaz"""
+    if not output_path:
+        yield
+        return
+
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(output_path)
+        print(f"📊 Profil kaydedildi: {output_path}")
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+AKIŞLI PDF BİRLEŞTİRME MODÜLÜ
+=============================
+Sayfaları bellekte biriktirmeden, eklendikleri anda diske yazan birleştirici
+
+PdfWriter tüm sayfaları ve bağlı nesneleri write() çağrılana kadar bellekte
+tutar. StreamingPDFConcatenator ise her sayfanın nesne ağacını (içerik,
+kaynaklar, fontlar, görseller) yeni nesne numaralarıyla hemen çıktı
+dosyasına yazar; yalnızca nesne ofsetleri ve sayfa numaraları bellekte
+kalır. Aynı okuyucudan gelen sayfalar ortak nesneleri (örn. font) bir kez
+yazar.
+
+Kullanım:
+    with StreamingPDFConcatenator("out.pdf") as out:
+        out.add_page(reader.pages[0])
+        out.add_file("segment.pdf")
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from pypdf import PdfReader, PageObject
+from pypdf.generic import (
+    ArrayObject, DictionaryObject, IndirectObject, NameObject, NullObject,
+    PdfObject, StreamObject
+)
+
+# Sayfa sözlüğünden kopyalanmayan anahtarlar (sayfa ağacı ve belge düzeyi yapılar)
+EXCLUDED_PAGE_KEYS = ("/Parent", "/StructParents", "/B")
+
+
+class StreamingPDFConcatenator:
+    """
+    Sayfa sayfa PDF birleştirici
+
+    Nesne 1 katalog, nesne 2 sayfa ağacı kökü için ayrılır ve close()
+    sırasında yazılır; diğer tüm nesneler eklendikleri anda yazılır.
+    """
+
+    CATALOG_NUM = 1
+    PAGES_NUM = 2
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self._file = open(output_path, 'wb')
+        self._offsets: Dict[int, int] = {}
+        self._next_num = self.PAGES_NUM + 1
+        self._kids: List[int] = []
+        self._written_pages: Set[int] = set()  # _kids ile aynı numaralar (hızlı üyelik)
+        # id(okuyucu) -> {(eski numara, nesil): yeni numara}
+        self._maps: Dict[int, Dict[Tuple[int, int], int]] = {}
+        self._readers: Dict[int, PdfReader] = {}
+        self._file.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            try:
+                os.remove(self.output_path)
+            except OSError:
+                pass
+        return False
+
+    @property
+    def page_count(self) -> int:
+        return len(self._kids)
+
+    # ------------------------------------------------------------------
+    # Sayfa ekleme
+    # ------------------------------------------------------------------
+
+    def add_page(self, page: PageObject):
+        """
+        Tek bir sayfayı ve bağlı olduğu tüm nesneleri hemen yaz
+
+        Aynı kaynak sayfa birden çok kez eklenebilir; her ekleme yeni bir
+        sayfa nesnesi olarak yazılır (paylaşılan kaynaklar bir kez yazılır).
+        """
+        reader = page.pdf
+        mapping = self._mapping(reader)
+        ref = page.indirect_reference
+
+        page_num = None
+        if ref is not None:
+            page_num = mapping.get((ref.idnum, ref.generation))
+        if page_num is None or page_num in self._written_pages:
+            page_num = self._allocate()
+            if ref is not None:
+                mapping.setdefault((ref.idnum, ref.generation), page_num)
+
+        queue: List[Tuple[int, PdfObject]] = []
+        new_page = DictionaryObject()
+        for key, value in page.items():
+            if key not in EXCLUDED_PAGE_KEYS:
+                new_page[NameObject(key)] = self._remap(value, mapping, queue)
+        new_page[NameObject("/Parent")] = IndirectObject(self.PAGES_NUM, 0, None)
+
+        self._write_object(page_num, new_page)
+        self._kids.append(page_num)
+        self._written_pages.add(page_num)
+
+        # Sayfanın erişebildiği nesneler (derinlik öncelikli, her biri bir kez)
+        while queue:
+            num, obj = queue.pop()
+            self._write_object(num, self._copy(obj, mapping, queue))
+
+    def add_pages(self, reader: PdfReader, indices: Optional[Iterable[int]] = None) -> int:
+        """Okuyucudan (verilen sıradaki) sayfaları ekle"""
+        pages = reader.pages
+        indices = range(len(pages)) if indices is None else list(indices)
+
+        # Eklenecek sayfalar önceden numaralanır; aralarındaki bağlantılar korunur
+        mapping = self._mapping(reader)
+        for i in indices:
+            ref = pages[i].indirect_reference
+            if ref is not None and (ref.idnum, ref.generation) not in mapping:
+                mapping[(ref.idnum, ref.generation)] = self._allocate()
+
+        count = 0
+        for i in indices:
+            self.add_page(pages[i])
+            count += 1
+        return count
+
+    def add_file(self, pdf_path: str, indices: Optional[Iterable[int]] = None) -> int:
+        """PDF dosyasının sayfalarını ekle ve okuyucuyu hemen bırak"""
+        reader = PdfReader(pdf_path)
+        try:
+            return self.add_pages(reader, indices)
+        finally:
+            self.release(reader)
+
+    def release(self, reader: PdfReader):
+        """Okuyucunun numara eşlemesini unut (bellek sınırı için)"""
+        self._maps.pop(id(reader), None)
+        self._readers.pop(id(reader), None)
+
+    # ------------------------------------------------------------------
+    # Nesne kopyalama
+    # ------------------------------------------------------------------
+
+    def _mapping(self, reader) -> Dict[Tuple[int, int], int]:
+        key = id(reader)
+        if key not in self._maps:
+            self._maps[key] = {}
+            # id() yeniden kullanılmasın diye okuyucu canlı tutulur
+            self._readers[key] = reader
+        return self._maps[key]
+
+    def _allocate(self) -> int:
+        num = self._next_num
+        self._next_num += 1
+        return num
+
+    def _remap(self, obj: PdfObject, mapping, queue) -> PdfObject:
+        """Dolaylı referansları yeni numaralara çevir; yeni hedefleri kuyruğa ekle"""
+        if isinstance(obj, IndirectObject):
+            key = (obj.idnum, obj.generation)
+            num = mapping.get(key)
+            if num is None:
+                target = obj.get_object()
+                # Eklenmeyen sayfalara/sayfa ağacına bağlantılar tüm belgeyi çekmesin
+                if isinstance(target, DictionaryObject) and target.get("/Type") in ("/Page", "/Pages"):
+                    return NullObject()
+                num = self._allocate()
+                mapping[key] = num
+                queue.append((num, target))
+            return IndirectObject(num, 0, None)
+        if isinstance(obj, (DictionaryObject, ArrayObject)):
+            return self._copy(obj, mapping, queue)
+        return obj
+
+    def _copy(self, obj: PdfObject, mapping, queue) -> PdfObject:
+        if isinstance(obj, StreamObject):
+            new_stream = StreamObject()
+            for key, value in obj.items():
+                if key != "/Length":
+                    new_stream[NameObject(key)] = self._remap(value, mapping, queue)
+            new_stream._data = obj._data
+            return new_stream
+        if isinstance(obj, DictionaryObject):
+            new_dict = DictionaryObject()
+            for key, value in obj.items():
+                new_dict[NameObject(key)] = self._remap(value, mapping, queue)
+            return new_dict
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._remap(value, mapping, queue) for value in obj)
+        if obj is None:
+            return NullObject()
+        return obj
+
+    def _write_object(self, num: int, obj: PdfObject):
+        self._offsets[num] = self._file.tell()
+        self._file.write(f"{num} 0 obj\n".encode())
+        obj.write_to_stream(self._file)
+        self._file.write(b"\nendobj\n")
+
+    # ------------------------------------------------------------------
+    # Kapanış
+    # ------------------------------------------------------------------
+
+    def close(self):
+        """Sayfa ağacını, kataloğu ve xref tablosunu yazıp dosyayı kapat"""
+        if self._file.closed:
+            return
+
+        kids = " ".join(f"{num} 0 R" for num in self._kids)
+        self._write_raw(self.PAGES_NUM, f"<< /Type /Pages /Kids [{kids}] /Count {len(self._kids)} >>")
+        self._write_raw(self.CATALOG_NUM, f"<< /Type /Catalog /Pages {self.PAGES_NUM} 0 R >>")
+
+        size = self._next_num
+        xref_offset = self._file.tell()
+        lines = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        for num in range(1, size):
+            offset = self._offsets.get(num)
+            # Ayrılıp yazılmayan numaralar (örn. hiç eklenmeyen sayfa) boş kayıt
+            lines.append(f"{offset:010d} 00000 n \n" if offset is not None else "0000000000 65535 f \n")
+        self._file.write("".join(lines).encode())
+        self._file.write(
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_NUM} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode()
+        )
+        self._file.close()
+        self._maps.clear()
+        self._readers.clear()
+
+    def _write_raw(self, num: int, body: str):
+        self._offsets[num] = self._file.tell()
+        self._file.write(f"{num} 0 obj\n{body}\nendobj\n".encode())
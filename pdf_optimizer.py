@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+PDF OPTİMİZASYON MODÜLÜ
+=======================
+Birleştirilmiş final dokümanın boyutunu küçülten, isteğe bağlı son aşama
+
+İşlevler:
+- Sayfa kaynaklarından (/Font, /XObject) içerikte kullanılmayanları çıkarma
+  (dergi PDF'lerinde tüm sayfalar belgenin bütün fontlarını taşıyan ortak
+  bir kaynak sözlüğünü paylaşır)
+- Sıkıştırılmamış içerik akışlarını Flate ile sıkıştırma
+- Aynı içerikli nesneleri (fontlar, görseller) birleştirme ve hiçbir yerden
+  başvurulmayan nesneleri silme
+
+Bu aşama belgenin tamamını belleğe yükler; akışlı birleştirmenin bellek
+sınırı gerekiyorsa kapalı tutulmalıdır (config.OPTIMIZE_FINAL_PDF).
+"""
+
+import os
+import re
+import shutil
+from typing import NamedTuple, Set
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import DictionaryObject, NameObject
+
+# İçerikte ad ile başvurulan ve budanan kaynak türleri
+PRUNED_RESOURCE_TYPES = ("/Font", "/XObject")
+
+_NAME_TOKEN_RE = re.compile(rb'/([^\s/\[\]<>(){}%]+)')
+
+
+class OptimizationResult(NamedTuple):
+    """Optimizasyon öncesi/sonrası dosya boyutları (bayt)"""
+    original_bytes: int
+    optimized_bytes: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.optimized_bytes
+
+
+def _content_names(page) -> Set[str]:
+    """Sayfa içerik akışında geçen tüm PDF adları (örn. '/F1', '/Im0')"""
+    contents = page.get_contents()
+    if contents is None:
+        return set()
+    return {"/" + m.group(1).decode('latin-1') for m in _NAME_TOKEN_RE.finditer(contents.get_data())}
+
+
+def prune_page_resources(page) -> int:
+    """
+    İçerikte kullanılmayan font ve XObject kaynaklarını sayfadan çıkar
+
+    Kaynak sözlükleri sayfalar arasında paylaşılabildiği için sayfaya
+    budanmış bir kopya atanır; paylaşılan sözlük değişmez.
+
+    Returns:
+        int: Çıkarılan kaynak sayısı
+    """
+    resources = page.get("/Resources")
+    if resources is None:
+        return 0
+    resources = resources.get_object()
+
+    names = _content_names(page)
+    # Kaçış dizili (#xx) adlar güvenle eşleştirilemez; sayfa olduğu gibi kalır
+    if any('#' in name for name in names):
+        return 0
+
+    # Kendi kaynakları olmayan form XObject'ler sayfanın kaynaklarını kullanır
+    xobjects = resources.get("/XObject")
+    for xobj in (xobjects.get_object().values() if xobjects is not None else ()):
+        xobj = xobj.get_object()
+        if xobj.get("/Subtype") == "/Form" and "/Resources" not in xobj:
+            return 0
+
+    pruned = DictionaryObject(resources)
+    removed = 0
+    for res_type in PRUNED_RESOURCE_TYPES:
+        entries = resources.get(res_type)
+        if entries is None:
+            continue
+        entries = entries.get_object()
+        kept = DictionaryObject({k: v for k, v in entries.items() if k in names})
+        removed += len(entries) - len(kept)
+        pruned[NameObject(res_type)] = kept
+
+    if removed:
+        page[NameObject("/Resources")] = pruned
+    return removed
+
+
+def _needs_compression(page) -> bool:
+    """Sayfanın içerik akışlarından herhangi biri sıkıştırılmamış mı?"""
+    contents = page.get("/Contents")
+    if contents is None:
+        return False
+    contents = contents.get_object()
+    streams = contents if isinstance(contents, list) else [contents]
+    return any("/Filter" not in stream.get_object() for stream in streams)
+
+
+def optimize_pdf(pdf_path: str, output_path: str = None) -> OptimizationResult:
+    """
+    PDF'i optimize et; sonuç daha küçükse dosyanın yerine yaz
+
+    output_path verilmezse pdf_path yerinde güncellenir. Optimize edilmiş
+    dosya küçük değilse asıl dosya olduğu gibi bırakılır.
+    """
+    output_path = output_path or pdf_path
+    original_bytes = os.path.getsize(pdf_path)
+
+    writer = PdfWriter(clone_from=PdfReader(pdf_path))
+    for page in writer.pages:
+        prune_page_resources(page)
+        if _needs_compression(page):
+            page.compress_content_streams()
+
+    # pypdf >= 4.3: aynı nesneleri birleştir, başvurulmayanları sil
+    if hasattr(writer, "compress_identical_objects"):
+        writer.compress_identical_objects()
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            writer.write(f)
+        optimized_bytes = os.path.getsize(tmp_path)
+        if optimized_bytes < original_bytes:
+            os.replace(tmp_path, output_path)
+            return OptimizationResult(original_bytes, optimized_bytes)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    if output_path != pdf_path:
+        shutil.copyfile(pdf_path, output_path)
+    return OptimizationResult(original_bytes, original_bytes)
@@ -15,20 +15,44 @@ Tam metinlerden atıf sayfalarını bulma ve çıkarma
 import os
 import re
 import difflib
+import hashlib
 import io
-from typing import List, Optional, Tuple, Dict
+import json
+import dataclasses
+import time
+from typing import List, Optional, Tuple, Dict, Sequence, Callable
 from pathlib import Path
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 
-# PDF işleme kütüphaneleri
-import pdfplumber
-from pypdf import PdfReader, PdfWriter
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import mm
-from reportlab.pdfgen import canvas
-from reportlab.lib.colors import yellow, red
+# PDF işleme kütüphaneleri (pdfplumber, pypdf, reportlab) yalnızca kullanan
+# metotlarda içe aktarılır; modülü içe aktaran CLI/işçi süreçleri hızlı açılır
 
-from config import CitingArticle, SourceArticle, DOWNLOADS_DIR
+from config import (
+    CitingArticle, SourceArticle, DOWNLOADS_DIR, EXTRACTION_CACHE_ENABLED, ANALYSIS_CACHE_ENABLED,
+    METRICS_LOG_PATH
+)
+from caching import ExtractionCache, cached_file_sha256, get_extraction_cache
+from citation_scanner import CitationScanner, CitationMarkerIndex, MultiSourceScanner, normalize_text
+from doi_index import DOIIndex, pdf_file_stats
+from metrics import PDFMetrics, append_metrics, profiled
+
+# Metin çıkarma mantığı değiştiğinde artırılmalı (önbellek anahtarının parçası)
+EXTRACTOR_VERSION = "1"
+
+# Atıf bulma algoritması (kaynakça/işaret/bbox tespiti) değiştiğinde artırılmalı
+ANALYSIS_VERSION = "2"
+
+
+@lru_cache(maxsize=None)
+def pdfplumber_version() -> str:
+    """Kurulu pdfplumber sürümü (önbellek isabetinde kütüphane yüklenmez)"""
+    from importlib import metadata
+    try:
+        return metadata.version("pdfplumber")
+    except metadata.PackageNotFoundError:
+        import pdfplumber
+        return pdfplumber.__version__
 
 
 @dataclass
@@ -39,91 +63,214 @@ class PageInfo:
     has_citation: bool = False
     is_reference_page: bool = False
     reference_number: Optional[int] = None
+    _normalized: Optional[str] = field(default=None, repr=False, compare=False)
+    
+    @property
+    def normalized_text(self) -> str:
+        """normalize_text(text) sonucu (sayfa başına bir kez hesaplanır)"""
+        if self._normalized is None:
+            self._normalized = normalize_text(self.text)
+        return self._normalized
 
-def normalize_text(text: str) -> str:
-    """Türkçe karakterleri normalize et (Lowercase + ASCII)"""
-    if not text: return ""
-    tr_map = str.maketrans("ğĞüÜşŞıİöÖçÇ", "gGuUsSiIoOcC")
-    return text.translate(tr_map).lower()
+
+class LazyPageList(Sequence):
+    """
+    Sayfaları ilk erişimde çıkaran PageInfo listesi
+    
+    Metin, sayfa okunduğunda (indeks, dilim veya iterasyon ile) loader
+    çağrılarak çıkarılır; önbellekten gelen sayfalar önceden yerleştirilir.
+    """
+    
+    def __init__(self, page_count: int, loader: Callable[[int], PageInfo]):
+        self._pages: List[Optional[PageInfo]] = [None] * page_count
+        self._loader = loader
+    
+    def __len__(self) -> int:
+        return len(self._pages)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._pages)
+        if not 0 <= index < len(self._pages):
+            raise IndexError("page index out of range")
+        
+        page = self._pages[index]
+        if page is None:
+            page = self._pages[index] = self._loader(index + 1)
+        return page
+    
+    def put(self, page_info: PageInfo):
+        """Önceden çıkarılmış bir sayfayı yerleştir"""
+        self._pages[page_info.page_number - 1] = page_info
+    
+    def is_loaded(self, page_number: int) -> bool:
+        """Sayfa metni çıkarıldı mı?"""
+        return self._pages[page_number - 1] is not None
+    
+    @property
+    def loaded_count(self) -> int:
+        """Metni çıkarılmış sayfa sayısı"""
+        return sum(1 for p in self._pages if p is not None)
 
 
 
 class PDFProcessor:
     """PDF işleme sınıfı"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[ExtractionCache] = None):
         self.current_pdf_path: Optional[str] = None
-        self.pages: List[PageInfo] = []
+        self.pages: Sequence[PageInfo] = []
+        self.cache_key: Optional[str] = None
+        self._pdf = None  # Açık pdfplumber belgesi (sayfa nesneleri tekrar kullanılır)
+        self._page_words: Dict[int, List[dict]] = {}
+        self.marker_index = CitationMarkerIndex()
+        self.metrics = PDFMetrics()  # Son yüklenen PDF'in aşama süreleri ve sayaçları
+        if cache is None and EXTRACTION_CACHE_ENABLED:
+            cache = get_extraction_cache()
+        self.cache = cache
     
-    def load_pdf(self, pdf_path: str) -> bool:
+    def load_pdf(self, pdf_path: str, metrics: Optional[PDFMetrics] = None) -> bool:
         """
-        PDF dosyasını yükle ve analiz et
+        PDF dosyasını yükle
+        
+        Sayfa metinleri burada çıkarılmaz; self.pages tembel bir listedir ve
+        her sayfa ilk okunduğunda çıkarılır (önbellekte varsa oradan gelir).
         
         Args:
             pdf_path: PDF dosyasının yolu
+            metrics: Ölçümlerin yazılacağı kayıt (None: yeni kayıt açılır)
             
         Returns:
             bool: Başarılı ise True
         """
+        self.metrics = metrics if metrics is not None else PDFMetrics(pdf_path=pdf_path)
         if not os.path.exists(pdf_path):
             print(f"❌ Dosya bulunamadı: {pdf_path}")
             return False
         
+        self.close()
         self.current_pdf_path = pdf_path
         self.pages = []
+        self.marker_index = CitationMarkerIndex()
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for i, page in enumerate(pdf.pages, 1):
-                    text = page.extract_text() or ""
-                    
-                    page_info = PageInfo(
-                        page_number=i,
-                        text=text
-                    )
-                    
-                    # Referans sayfası mı kontrol et
-                    if self._is_reference_page(text):
-                        page_info.is_reference_page = True
-                    
-                    self.pages.append(page_info)
+            with self.metrics.phase("load"):
+                # Önbellekte olan sayfalar için pdfplumber hiç çalıştırılmaz
+                cache_key = self._cache_key(pdf_path)
+                self.cache_key = cache_key
+                cached = self.cache.get_pages(cache_key) if cache_key else None
+                
+                if cached:
+                    page_count, cached_pages = cached
+                else:
+                    page_count, cached_pages = len(self._open_pdf().pages), {}
+                    if cache_key:
+                        self.cache.put_pages(cache_key, page_count, [])
+                
+                self.pages = LazyPageList(page_count, self._extract_page)
+                for n, (text, is_ref) in cached_pages.items():
+                    self.pages.put(PageInfo(page_number=n, text=text, is_reference_page=is_ref))
             
-            print(f"✅ PDF yüklendi: {len(self.pages)} sayfa")
+            self.metrics.page_count = page_count
+            self.metrics.pages_cached = len(cached_pages)
+            source = " (önbellek)" if cached_pages else ""
+            print(f"✅ PDF yüklendi{source}: {page_count} sayfa")
             return True
             
         except Exception as e:
             print(f"❌ PDF okuma hatası: {e}")
+            self.close()
             return False
     
-    def _is_reference_page(self, text: str) -> bool:
-        """Metnin referans sayfası olup olmadığını kontrol et"""
-        reference_headers = [
-            r'\bReferences\b',
-            r'\bBibliography\b',
-            r'\bLiterature\s+Cited\b',
-            r'\bKaynakça\b',
-            r'\bKaynaklar\b',
-            r'\bWorks\s+Cited\b',
-        ]
+    def _extract_page(self, page_number: int) -> PageInfo:
+        """Tek bir sayfanın metnini çıkar, sınıflandır ve önbelleğe yaz"""
+        with self.metrics.phase("extract_text"):
+            self.metrics.pages_extracted += 1
+            try:
+                text = self._open_pdf().pages[page_number - 1].extract_text() or ""
+            except Exception as e:
+                print(f"⚠️  Sayfa {page_number} okunamadı: {e}")
+                return PageInfo(page_number=page_number, text="")
+            
+            page_info = PageInfo(
+                page_number=page_number,
+                text=text,
+                is_reference_page=self._is_reference_page(text)
+            )
+            
+            if self.cache_key:
+                self.cache.put_pages(
+                    self.cache_key, len(self.pages),
+                    [(page_number, text, page_info.is_reference_page)]
+                )
+            return page_info
+    
+    def _open_pdf(self):
+        """Geçerli PDF için pdfplumber belgesini (gerekirse) aç"""
+        if self._pdf is None:
+            import pdfplumber
+            self._pdf = pdfplumber.open(self.current_pdf_path)
+        return self._pdf
+    
+    def close(self):
+        """Açık pdfplumber belgesini kapat ve kelime deposunu boşalt"""
+        if self._pdf is not None:
+            try:
+                self._pdf.close()
+            except Exception:
+                pass
+            self._pdf = None
+        self._page_words = {}
+    
+    def get_page_words(self, page_num: int) -> List[dict]:
+        """
+        Sayfanın kelimelerini ve koordinatlarını döndür
         
-        for pattern in reference_headers:
-            if re.search(pattern, text, re.IGNORECASE):
-                return True
+        Sonuç bellekte ve önbellekte tutulur; aynı sayfa bir PDF işlemi
+        boyunca yalnızca bir kez ayrıştırılır.
+        """
+        if page_num in self._page_words:
+            return self._page_words[page_num]
         
-        # Referans formatı kontrolü (numaralı referanslar)
-        ref_pattern = r'^\s*\[\d+\]|\s+\d+\.\s+[A-Z][a-z]+'
-        matches = re.findall(ref_pattern, text, re.MULTILINE)
-        if len(matches) > 5:  # En az 5 referans formatı
-            return True
+        words = None
+        if self.cache_key:
+            words = self.cache.get_words(self.cache_key, page_num)
+        
+        if words is None:
+            with self.metrics.phase("extract_words"):
+                self.metrics.words_extracted += 1
+                page = self._open_pdf().pages[page_num - 1]
+                words = [
+                    {'text': w['text'], 'x0': w['x0'], 'top': w['top'], 'x1': w['x1'], 'bottom': w['bottom']}
+                    for w in page.extract_words()
+                ]
+                if self.cache_key:
+                    self.cache.put_words(self.cache_key, page_num, words)
+        else:
+            self.metrics.words_cached += 1
         
-        return False
+        self._page_words[page_num] = words
+        return words
+    
+    def _cache_key(self, pdf_path: str) -> Optional[str]:
+        """PDF için önbellek anahtarı (önbellek kapalıysa None)"""
+        if not self.cache:
+            return None
+        version = f"{EXTRACTOR_VERSION}-pdfplumber{pdfplumber_version()}"
+        return ExtractionCache.make_key(pdf_path, version)
+    
+    def _is_reference_page(self, text: str) -> bool:
+        """Metnin referans sayfası olup olmadığını kontrol et"""
+        return CitationScanner.is_reference_page(text)
     
     def find_citation_page(self, source_article: SourceArticle) -> Optional[Tuple[int, int, Optional[List[float]]]]:
         """
         Kaynak makalenin atıf yapıldığı sayfayı bul (Legacy single-page return).
         Backward compatible wrapper.
         """
-        result = self.find_citation_info(source_article)
+        result = self.find_citation_info(source_article, max_citation_pages=1)
         if result:
             ref_page, ref_num, citation_pages = result
             # Return first citation page for backward compatibility
@@ -132,10 +279,18 @@ class PDFProcessor:
             return (first_citation_page, ref_num, first_citation_bbox)
         return None
     
-    def find_citation_info(self, source_article: SourceArticle) -> Optional[Tuple[int, int, List[Tuple[int, Optional[List[float]]]]]]:
+    def find_citation_info(self, source_article: SourceArticle,
+                           max_citation_pages: Optional[int] = None,
+                           scanner: Optional[CitationScanner] = None) -> Optional[Tuple[int, int, List[Tuple[int, Optional[List[float]]]]]]:
         """
         Kapsamlı atıf arama.
         
+        Args:
+            source_article: Kaynak makale
+            max_citation_pages: Bu kadar atıf sayfası bulununca gövde taraması
+                durur (None: tüm sayfalar)
+            scanner: Kaynak makale için önceden kurulmuş desen tarayıcısı
+        
         Returns:
             (reference_page_num, ref_num, [(citation_page_num, bbox), ...])
             or None if not found.
@@ -145,251 +300,319 @@ class PDFProcessor:
         
         print(f"🔍 Atıf aranıyor: {source_article.authors} ({source_article.year})")
         
-        # Hazırlık
-        clean_doi = ""
-        if source_article.doi:
-            clean_doi = re.sub(r'\s+', '', source_article.doi).lower()
+        # Hazırlık: desenler kaynak makale başına bir kez derlenir
+        if scanner is None:
+            scanner = CitationScanner(source_article)
+
+        with self.metrics.phase("references"):
+            entry = self._locate_reference_entries([scanner])[0]
+        if not entry:
+            print("❌ Referans girişi bulunamadı.")
+            return None
         
-        first_author = ""
-        first_author_norm = ""
-        if source_article.authors:
-            first_author = source_article.authors[0].split()[-1]
-            first_author_norm = normalize_text(first_author)
-            
-        year_str = str(source_article.year) if source_article.year else ""
+        ref_page_num, ref_num = entry
+        print(f"   -> Referans Numarası: {ref_num}, Referans Sayfası: {ref_page_num}")
+        with self.metrics.phase("markers"):
+            citation_results = self._collect_citation_pages(scanner, ref_page_num, ref_num, max_citation_pages)
+        return (ref_page_num, ref_num, citation_results)
+
+    def find_citation_info_multi(self, scanners: List[CitationScanner],
+                                 max_citation_pages: Optional[int] = None,
+                                 multi_scanner: Optional[MultiSourceScanner] = None
+                                 ) -> List[Optional[Tuple[int, int, List[Tuple[int, Optional[List[float]]]]]]]:
+        """
+        Birden çok kaynak makale için atıf arama (PDF tek kez taranır)
+        
+        Kaynakça sayfaları tüm kaynaklar için tek geçişte, birleşik DOI/yazar
+        ön filtresiyle taranır; gövde sayfaları bir kez indekslenir ve her
+        kaynak için yalnızca referans numarası sorgulanır.
+        
+        Returns:
+            scanners ile aynı sırada, her kaynak için find_citation_info sonucu
+        """
+        if not self.pages:
+            return [None] * len(scanners)
         
-        # YEAR TOLERANCE
-        years_pattern = year_str
-        if source_article.year:
-            y = source_article.year
-            years_pattern = f"({y}|{y-1}|{y+1})"
+        print(f"🔍 Atıf aranıyor: {len(scanners)} kaynak makale")
+        with self.metrics.phase("references"):
+            entries = self._locate_reference_entries(scanners, multi_scanner)
+        
+        results = []
+        for scanner, entry in zip(scanners, entries):
+            if not entry:
+                results.append(None)
+                continue
+            ref_page_num, ref_num = entry
+            print(f"   -> {scanner.first_author} ({scanner.year_str}): Referans Numarası: {ref_num}, Referans Sayfası: {ref_page_num}")
+            with self.metrics.phase("markers"):
+                citation_results = self._collect_citation_pages(scanner, ref_page_num, ref_num, max_citation_pages)
+            results.append((ref_page_num, ref_num, citation_results))
+        return results
 
-        # ===== PHASE 1: Find Reference Entry (ONLY in Reference Pages) =====
-        ref_pages = [p for p in self.pages if p.is_reference_page]
-        if not ref_pages:
-            # Fallback: last 3 pages often have references
-            ref_pages = self.pages[-3:] if len(self.pages) >= 3 else self.pages
-        
-        ref_num = None
-        ref_page_num = None
-        
-        # STEP 1A: DOI Match FIRST (scan ALL reference pages for DOI - strongest signal)
-        if clean_doi:
-            for page in ref_pages:
-                page_text_clean = re.sub(r'\s+', '', page.text).lower()
-                if clean_doi in page_text_clean:
-                    print(f"✅ DOI Eşleşmesi: Sayfa {page.page_number}")
-                    ref_num = self._extract_ref_number_smart(page.text, first_author, year_str, clean_doi)
-                    if ref_num:
-                        ref_page_num = page.page_number
-                        page.is_reference_page = True
-                        break
+    def _locate_reference_entries(self, scanners: List[CitationScanner],
+                                  multi_scanner: Optional[MultiSourceScanner] = None
+                                  ) -> List[Optional[Tuple[int, int]]]:
+        """
+        PHASE 1: Kaynakça girişlerini bul (yalnızca kaynakça sayfalarında)
         
-        # STEP 1B: Author + Year Match (only if DOI not found)
-        if not ref_num and first_author_norm and year_str:
-            for page in ref_pages:
-                page_text_norm = normalize_text(page.text)
-                norm_author_esc = re.escape(first_author_norm)
-                # Pattern: Must start at line beginning, number then dot, NOT followed by digit
-                pattern = rf'(?:^|\n)\s*(\d+)\s*\.\s*(?!\s*\d)(?:(?!\n\d+\s*\.\s).)*?{norm_author_esc}.*?{years_pattern}'
-                
-                match = re.search(pattern, page_text_norm, re.IGNORECASE | re.DOTALL)
-                if match and match.group(0).count('\n') < 15:
-                    print(f"✅ Referans Eşleşmesi: Sayfa {page.page_number}")
-                    ref_num = int(match.group(1))
-                    ref_page_num = page.page_number
+        Returns:
+            Her kaynak için (reference_page_num, ref_num) veya None
+        """
+        entries: List[Optional[Tuple[int, int]]] = [None] * len(scanners)
+        pending = set(range(len(scanners)))
+        if multi_scanner is None and len(scanners) > 1:
+            multi_scanner = MultiSourceScanner(scanners)
+        
+        # Yazar + Yıl adayları: DOI eşleşmesi her sayfada önceliklidir, bu
+        # yüzden adaylar ancak tüm kaynakça sayfaları DOI için tarandıktan
+        # sonra kullanılır. Sondan başa gezildiği için en öndeki sayfa kalır.
+        author_year: List[Optional[Tuple[PageInfo, int]]] = [None] * len(scanners)
+        
+        def match_page(page: PageInfo):
+            indices = pending
+            if multi_scanner is not None:
+                # Tek geçişli ön filtre: sayfada DOI'si/yazarı geçmeyen kaynaklar atlanır
+                indices = pending & multi_scanner.candidates(page.text, page.normalized_text)
+            for i in sorted(indices):
+                ref_num = self._match_reference_doi(page, scanners[i])
+                if ref_num:
+                    entries[i] = (page.page_number, ref_num)
                     page.is_reference_page = True
+                    pending.discard(i)
+                    continue
+                ref_num = self._match_reference_author_year(page, scanners[i])
+                if ref_num:
+                    author_year[i] = (page, ref_num)
+        
+        # Kaynakça genelde sondadır: sayfalar sondan başa doğru, gerektikçe
+        # çıkarılır; tüm kaynaklar DOI ile bulunduğu anda veya kaynakça
+        # bölümünün başı geçildiğinde (ilk kaynakça dışı sayfa) durulur.
+        ref_pages = []
+        
+        # STEP 1A: DOI (strongest signal) - tüm kaynakça sayfalarında
+        for page in reversed(self.pages):
+            if not pending:
+                break
+            if not page.is_reference_page:
+                if ref_pages:
                     break
+                continue
+            ref_pages.append(page)
+            match_page(page)
+        
+        ref_pages.reverse()
+        if not ref_pages:
+            # Fallback: last 3 pages often have references
+            ref_pages = self.pages[-3:] if len(self.pages) >= 3 else list(self.pages)
+            for page in reversed(ref_pages):
+                if not pending:
+                    break
+                match_page(page)
+        
+        # STEP 1B: Author + Year (only if DOI not found)
+        for i in sorted(pending):
+            if author_year[i]:
+                page, ref_num = author_year[i]
+                print(f"✅ Referans Eşleşmesi: Sayfa {page.page_number}")
+                entries[i] = (page.page_number, ref_num)
+                page.is_reference_page = True
+                pending.discard(i)
         
         # Fallback: Proximity search for tricky PDFs (only in reference pages)
         # Enhanced to handle two-column layouts and bracket-style references
-        if not ref_num and first_author_norm:
-            for page in ref_pages:
-                text_norm = normalize_text(page.text)
-                for m in re.finditer(re.escape(first_author_norm), text_norm, re.IGNORECASE):
-                    start_idx = m.start()
-                    # Wider window for two-column layouts (100 chars back)
-                    window_start = max(0, start_idx - 100)
-                    window_text = text_norm[window_start:start_idx]
-                    
-                    # Try [31] format first (bracket style)
-                    match_bracket = re.search(r'\[(\d+)\]\s*$', window_text.strip())
-                    if match_bracket:
-                        potential_ref = int(match_bracket.group(1))
-                        window_end = min(len(text_norm), start_idx + 300)
-                        after_text = text_norm[start_idx:window_end]
-                        if re.search(years_pattern, after_text):
+        with self.metrics.phase("reference_proximity"):
+            for i in sorted(pending):
+                for page in ref_pages:
+                    for style, potential_ref in scanners[i].iter_proximity_matches(page.normalized_text):
+                        if style == 'bracket':
                             print(f"✅ Proximity Match (bracket): Sayfa {page.page_number} -> Ref [{potential_ref}]")
-                            ref_num = potential_ref
-                            ref_page_num = page.page_number
-                            page.is_reference_page = True
-                            break
-                    
-                    # Try 31. format (dot style)
-                    match_back = re.search(r'(\d+)\s*\.\s*$', window_text.strip())
-                    if match_back:
-                        potential_ref = int(match_back.group(1))
-                        window_end = min(len(text_norm), start_idx + 300)
-                        after_text = text_norm[start_idx:window_end]
-                        if re.search(years_pattern, after_text):
+                        else:
                             print(f"✅ Proximity Match (dot): Sayfa {page.page_number} -> Ref {potential_ref}")
-                            ref_num = potential_ref
-                            ref_page_num = page.page_number
-                            page.is_reference_page = True
-                            break
-                if ref_num:
-                    break
-        
-        if not ref_num:
-            print("❌ Referans girişi bulunamadı.")
-            return None
+                        entries[i] = (page.page_number, potential_ref)
+                        page.is_reference_page = True
+                        break
+                    if entries[i]:
+                        break
         
-        print(f"   -> Referans Numarası: {ref_num}, Referans Sayfası: {ref_page_num}")
+        return entries
+
+    def _collect_citation_pages(self, scanner: CitationScanner, ref_page_num: int, ref_num: int,
+                                max_citation_pages: Optional[int] = None) -> List[Tuple[int, Optional[List[float]]]]:
+        """PHASE 2: Gövde sayfalarındaki TÜM atıf işaretlerini bul"""
+        first_author = scanner.first_author
+        year_str = scanner.year_str
         
-        # ===== PHASE 2: Find ALL Citation Markers in Body Pages =====
-        body_pages = [p for p in self.pages if not p.is_reference_page]
+        # Gövde sayfaları bu aşamada, sırayla ve ihtiyaç oldukça çıkarılır
+        _, super_pattern = scanner.marker_patterns(ref_num)
         citation_results: List[Tuple[int, Optional[List[float]]]] = []
         
-        for page in body_pages:
-            # Search for [ref_num] in various formats:
-            # - Isolated: [33]
-            # - Start of list: [33, 34...
-            # - Middle of list: [..., 33, ...]
-            # - End of list: [..., 33]
-            # - With ranges: [33-35] or [30–33] (en-dash)
-            grouped_pattern = rf'\[(?:[^\]]*[,\s–-])?{ref_num}(?:[,\s–-][^\]]*|\s*)?\]'
-            if re.search(grouped_pattern, page.text):
-                print(f"   📍 Atıf işareti bulundu: Sayfa {page.page_number} -> [{ref_num}]")
+        def body_pages():
+            for index in range(len(self.pages)):
+                if max_citation_pages and len(citation_results) >= max_citation_pages:
+                    return
+                page = self.pages[index]
+                if not page.is_reference_page:
+                    yield page
+        
+        for page in body_pages():
+            # Sayfa bir kez indekslenir; [33], [33, 34], [..., 33], [30–35]
+            # gibi gruplu ve aralıklı işaretler açılmış olarak sorgulanır
+            self.marker_index.add_page(page.page_number, page.text)
+            if self.marker_index.cites(page.page_number, ref_num):
+                marker = self.marker_index.hits(ref_num, page.page_number)[0].marker
+                print(f"   📍 Atıf işareti bulundu: Sayfa {page.page_number} -> {marker}")
                 page.has_citation = True
                 
                 # Get bbox
-                bbox = self._find_citation_marker_bbox(page.page_number, ref_num, first_author, year_str)
+                with self.metrics.phase("bbox"):
+                    bbox = self._find_citation_marker_bbox(page.page_number, ref_num, first_author, year_str, marker)
                 citation_results.append((page.page_number, bbox))
         
         # If no bracketed citations found, try superscript (bare number near punctuation)
         if not citation_results:
             print("   ⚠️ Köşeli parantez atıf bulunamadı, üslü sayı aranıyor...")
-            for page in body_pages:
-                # Superscript often appears near punctuation: "text.21" or "text,21" or "text21"
-                # This is risky but can help
-                super_pattern = rf'(?<=[.,;:)\s]){ref_num}(?=[\s.,;:\[]|$)'
-                if re.search(super_pattern, page.text):
+            for page in body_pages():
+                # Superscript near punctuation - risky but can help
+                if super_pattern.search(page.text):
                     print(f"   📍 Muhtemel üslü atıf: Sayfa {page.page_number}")
-                    bbox = self._find_citation_marker_bbox(page.page_number, ref_num, first_author, year_str)
+                    with self.metrics.phase("bbox"):
+                        bbox = self._find_citation_marker_bbox(page.page_number, ref_num, first_author, year_str)
                     citation_results.append((page.page_number, bbox))
         
         if not citation_results:
             print("   ⚠️ Gövde metinde atıf işareti bulunamadı, referans sayfası kullanılıyor.")
             citation_results.append((ref_page_num, None))
         
-        return (ref_page_num, ref_num, citation_results)
+        return citation_results
+
+    def _match_reference_doi(self, page: PageInfo, scanner: CitationScanner) -> Optional[int]:
+        """STEP 1A: Sayfada kaynak DOI'si geçiyorsa girişin numarasını döndür"""
+        with self.metrics.phase("reference_doi"):
+            if not scanner.contains_doi(page.text):
+                return None
+            print(f"✅ DOI Eşleşmesi: Sayfa {page.page_number}")
+            return self._extract_ref_number_smart(page.text, scanner.first_author, scanner.year_str, scanner.clean_doi)
+
+    def _match_reference_author_year(self, page: PageInfo, scanner: CitationScanner) -> Optional[int]:
+        """STEP 1B: Numaralı girişte Yazar + Yıl eşleşmesi"""
+        with self.metrics.phase("reference_author_year"):
+            return scanner.match_author_year(page.normalized_text)
 
     def find_reference_bbox(self, page_num: int, ref_num: int, source_article: SourceArticle) -> Optional[List[float]]:
         """Find the bbox of the reference entry in the bibliography"""
         try:
             if not self.current_pdf_path: return None
             
-            with pdfplumber.open(self.current_pdf_path) as pdf:
-                page = pdf.pages[page_num - 1]
-                words = page.extract_words()
+            words = self.get_page_words(page_num)
+            
+            if ref_num:
+                target_bracket = f"[{ref_num}]"
+                target_dot = f"{ref_num}."
+                target_str = str(ref_num)
                 
-                if ref_num:
-                    target_bracket = f"[{ref_num}]"
-                    target_dot = f"{ref_num}."
-                    target_str = str(ref_num)
-                    
-                    for i, w in enumerate(words):
-                        txt = w['text']
-                        # Only check near left margin for reference list items? (x0 < 100)
-                        if w['x0'] > 150: # Heuristic: Ref numbers are usually on the left
-                            continue
-                            
-                        # 1. "[12]"
-                        if target_bracket in txt:
-                            return [w['x0'], w['top'], w['x1'], w['bottom']]
+                for i, w in enumerate(words):
+                    txt = w['text']
+                    # Only check near left margin for reference list items? (x0 < 100)
+                    if w['x0'] > 150: # Heuristic: Ref numbers are usually on the left
+                        continue
                         
-                        # 2. "12."
-                        if target_dot in txt:
-                             return [w['x0'], w['top'], w['x1'], w['bottom']]
-                             
-                        # 3. "12" then "."
-                        if txt == target_str:
-                             if i + 1 < len(words) and "." in words[i+1]['text']:
-                                  return [w['x0'], w['top'], w['x1'], w['bottom']]
-
-                # Fallback: Search for author name in reference page
-                if source_article.authors:
-                     first_author = source_article.authors[0].split()[-1]
-                     for w in words:
-                          if first_author.lower() in w['text'].lower():
-                               return [w['x0'], w['top'], w['x1'], w['bottom']]
+                    # 1. "[12]"
+                    if target_bracket in txt:
+                        return [w['x0'], w['top'], w['x1'], w['bottom']]
+                    
+                    # 2. "12."
+                    if target_dot in txt:
+                         return [w['x0'], w['top'], w['x1'], w['bottom']]
+                         
+                    # 3. "12" then "."
+                    if txt == target_str:
+                         if i + 1 < len(words) and "." in words[i+1]['text']:
+                              return [w['x0'], w['top'], w['x1'], w['bottom']]
+
+            # Fallback: Search for author name in reference page
+            if source_article.authors:
+                 first_author = source_article.authors[0].split()[-1]
+                 for w in words:
+                      if first_author.lower() in w['text'].lower():
+                           return [w['x0'], w['top'], w['x1'], w['bottom']]
             
             return None
         except:
             return None
 
-    def _find_citation_marker_bbox(self, page_num: int, ref_num: int, author: str, year: str) -> Optional[List[float]]:
-        """Find the bbox of [12] or (Author, 2024) on the specific page"""
+    def _find_citation_marker_bbox(self, page_num: int, ref_num: int, author: str, year: str,
+                                   marker: Optional[str] = None) -> Optional[List[float]]:
+        """Find the bbox of [12] or (Author, 2024) on the specific page
+        
+        marker: İndeksten gelen işaret metni (örn. "[30–35]"); numara işarette
+        açıkça geçmiyorsa (aralık) bu işaretin kelimesi vurgulanır.
+        """
         try:
             if not self.current_pdf_path: return None
             
-            with pdfplumber.open(self.current_pdf_path) as pdf:
-                page = pdf.pages[page_num - 1]
-                words = page.extract_words()
+            words = self.get_page_words(page_num)
+            
+            if ref_num > 0:
+                target_bracket = f"[{ref_num}]"
+                target_dot = f"{ref_num}."
+                target_str = str(ref_num)
                 
-                if ref_num > 0:
-                    target_bracket = f"[{ref_num}]"
-                    target_dot = f"{ref_num}."
-                    target_str = str(ref_num)
-                    
-                    # PASS 1: High Priority - Exact Bracket Match "[21]"
-                    for w in words:
-                        if target_bracket in w['text']:
-                             return [w['x0'], w['top'], w['x1'], w['bottom']]
-                    
-                    # PASS 1.5: Bare number match "33" (for grouped brackets like [33, 34])
-                    # The word extractor often splits "[33," into multiple tokens
-                    for w in words:
-                        txt = w['text'].strip(',[]')
-                        if txt == target_str:
-                            return [w['x0'], w['top'], w['x1'], w['bottom']]
-
-                    # PASS 2: Medium Priority - "21." but NOT "21.269"
-                    for i, w in enumerate(words):
-                        txt = w['text']
-                        
-                        # Case: "12." inside text (e.g. "12.Author" or "12.")
-                        if target_dot in txt:
-                             # Check what comes after "12."
-                             # If "12.345", split gives "345"
-                             parts = txt.split(target_dot)
-                             if len(parts) > 1:
-                                 after = parts[1]
-                                 # If strictly digits follow, it's likely a float number (p < 0.05 etc)
-                                 if after and after[0].isdigit():
-                                     continue
-                             return [w['x0'], w['top'], w['x1'], w['bottom']]
-                             
-                        # Case: "12" then "." (broken by space)
-                        if txt == target_str:
-                            # Check next word for dot
-                            if i + 1 < len(words) and "." in words[i+1]['text']:
-                                # Ensure the dot is not part of a float in the next word? 
-                                # If next word is exactly ".", it's fine.
-                                # If next word is ".25", it might be a float 21 .25 (rare but possible)
-                                next_txt = words[i+1]['text']
-                                if next_txt == ".":
-                                    return [w['x0'], w['top'], w['x1'], w['bottom']]
-                                elif next_txt.startswith("."):
-                                    # Check if digit follows
-                                    if len(next_txt) > 1 and not next_txt[1].isdigit():
-                                         return [w['x0'], w['top'], w['x1'], w['bottom']]
+                # PASS 1: High Priority - Exact Bracket Match "[21]"
+                for w in words:
+                    if target_bracket in w['text']:
+                         return [w['x0'], w['top'], w['x1'], w['bottom']]
                 
-                # If no ref number or not found, try Author
-                if author:
+                # PASS 1.5: Bare number match "33" (for grouped brackets like [33, 34])
+                # The word extractor often splits "[33," into multiple tokens
+                for w in words:
+                    txt = w['text'].strip(',[]')
+                    if txt == target_str:
+                        return [w['x0'], w['top'], w['x1'], w['bottom']]
+
+                # PASS 1.7: Range marker "[30–35]" (number not written explicitly)
+                if marker:
+                    marker_compact = re.sub(r'\s+', '', marker)
                     for w in words:
-                        if author.lower() in w['text'].lower():
+                        txt = w['text'].rstrip(',;.')
+                        if txt.startswith('[') and len(txt) > 2 and txt in marker_compact:
                             return [w['x0'], w['top'], w['x1'], w['bottom']]
+
+                # PASS 2: Medium Priority - "21." but NOT "21.269"
+                for i, w in enumerate(words):
+                    txt = w['text']
+                    
+                    # Case: "12." inside text (e.g. "12.Author" or "12.")
+                    if target_dot in txt:
+                         # Check what comes after "12."
+                         # If "12.345", split gives "345"
+                         parts = txt.split(target_dot)
+                         if len(parts) > 1:
+                             after = parts[1]
+                             # If strictly digits follow, it's likely a float number (p < 0.05 etc)
+                             if after and after[0].isdigit():
+                                 continue
+                         return [w['x0'], w['top'], w['x1'], w['bottom']]
+                         
+                    # Case: "12" then "." (broken by space)
+                    if txt == target_str:
+                        # Check next word for dot
+                        if i + 1 < len(words) and "." in words[i+1]['text']:
+                            # Ensure the dot is not part of a float in the next word? 
+                            # If next word is exactly ".", it's fine.
+                            # If next word is ".25", it might be a float 21 .25 (rare but possible)
+                            next_txt = words[i+1]['text']
+                            if next_txt == ".":
+                                return [w['x0'], w['top'], w['x1'], w['bottom']]
+                            elif next_txt.startswith("."):
+                                # Check if digit follows
+                                if len(next_txt) > 1 and not next_txt[1].isdigit():
+                                     return [w['x0'], w['top'], w['x1'], w['bottom']]
+            
+            # If no ref number or not found, try Author
+            if author:
+                for w in words:
+                    if author.lower() in w['text'].lower():
+                        return [w['x0'], w['top'], w['x1'], w['bottom']]
             
             return None
         except Exception as e:
@@ -531,6 +754,8 @@ class PDFProcessor:
         Returns:
             bool: Başarılı ise True
         """
+        from pypdf import PdfReader, PdfWriter
+        
         if not self.current_pdf_path:
             print("❌ Önce PDF yüklenmeli!")
             return False
@@ -564,6 +789,10 @@ class PDFProcessor:
         Returns:
             bool: Başarılı ise True
         """
+        from pypdf import PdfReader, PdfWriter
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        
         if not self.current_pdf_path:
             return False
             
@@ -650,6 +879,8 @@ class PDFProcessor:
         Returns:
             bool: Başarılı ise True
         """
+        from pypdf import PdfReader, PdfWriter
+        
         try:
             writer = PdfWriter()
             
@@ -674,6 +905,8 @@ class PDFProcessor:
     @staticmethod
     def get_page_count(pdf_path: str) -> int:
         """PDF'deki sayfa sayısını döndür"""
+        from pypdf import PdfReader
+        
         try:
             reader = PdfReader(pdf_path)
             return len(reader.pages)
@@ -688,50 +921,118 @@ class CitationFinder:
     Tam metinden atıf bilgilerini otomatik çıkarır
     """
     
-    def __init__(self, source_article: SourceArticle):
+    def __init__(self, source_article: SourceArticle, use_result_cache: Optional[bool] = None,
+                 cache: Optional[ExtractionCache] = None):
         self.source = source_article
-        self.processor = PDFProcessor()
+        self.processor = PDFProcessor(cache=cache)
+        self.scanner = CitationScanner(source_article)
+        if use_result_cache is None:
+            use_result_cache = ANALYSIS_CACHE_ENABLED
+        self.result_cache = self.processor.cache if use_result_cache else None
+        self.cache_hits = 0  # Sonucu önbellekten gelen PDF sayısı
+        self.metrics = PDFMetrics()  # Son işlenen PDF'in ölçüm kaydı
     
-    def process_pdf(self, pdf_path: str, citing_article: CitingArticle) -> CitingArticle:
+    def process_pdf(self, pdf_path: str, citing_article: CitingArticle,
+                    profile_path: Optional[str] = None) -> CitingArticle:
         """
         PDF'i işle ve atıf bilgilerini doldur
         
+        PDF içeriği, kaynak makale (DOI, yazarlar, yıl) ve algoritma sürümü
+        önceki bir çalıştırmayla aynıysa sonuç önbellekten uygulanır.
+        Aşama süreleri ve sayaçlar self.metrics kaydına yazılır.
+        
         Args:
             pdf_path: PDF dosyasının yolu
             citing_article: Atıf yapan makale
+            profile_path: Verilirse analiz cProfile ile bu dosyaya dökülür
             
         Returns:
             CitingArticle: Güncellenmiş makale bilgileri
         """
+        self.metrics = PDFMetrics(pdf_path=pdf_path)
+        started = time.perf_counter()
+        try:
+            with profiled(profile_path):
+                return self._process_pdf(pdf_path, citing_article)
+        finally:
+            self.metrics.total_seconds = time.perf_counter() - started
+            if METRICS_LOG_PATH:
+                append_metrics(self.metrics, METRICS_LOG_PATH)
+    
+    def _process_pdf(self, pdf_path: str, citing_article: CitingArticle) -> CitingArticle:
+        with self.metrics.phase("result_cache"):
+            result_key = self._result_key(pdf_path)
+            hit = self._apply_cached_result(result_key, pdf_path, citing_article)
+        if hit:
+            self.metrics.result_cache_hit = True
+            print(f"\n♻️  Önbellekten: {os.path.basename(pdf_path)}")
+            return citing_article
+        
         print(f"\n📄 PDF işleniyor: {os.path.basename(pdf_path)}")
         
-        if not self.processor.load_pdf(pdf_path):
+        if not self.processor.load_pdf(pdf_path, self.metrics):
             return citing_article
         
-        citing_article.pdf_path = pdf_path
+        try:
+            result, found = self._fill_citation_info(pdf_path, citing_article)
+        finally:
+            self.processor.close()
         
-        # Başlık sayfası (1. sayfa)
-        citing_article.title_page = 1
+        # Yalnızca tamamlanan analiz, analizin yazdığı alanlarla önbelleğe girer
+        if result_key:
+            with self.metrics.phase("result_cache"):
+                self.result_cache.put_analysis(result_key, _analysis_record(result, found))
+        return result
+    
+    def apply_cached_result(self, pdf_path: str, citing_article: CitingArticle) -> bool:
+        """
+        PDF'i yüklemeden, önbellekte sonucu varsa makaleye uygula
         
-        # Atıf bilgilerini bul (yeni çoklu atıf desteği)
-        result = self.processor.find_citation_info(self.source)
-        if result:
-            ref_page_num, ref_num, citation_list = result
-            citing_article.reference_number = ref_num
-            citing_article.reference_page = ref_page_num
-            
-            # Tüm atıf sayfalarını kaydet
-            citing_article.citation_pages = [cp[0] for cp in citation_list]
-            citing_article.citation_bboxes = [cp[1] for cp in citation_list if cp[1]]
-            
-            # Referans bbox bul
-            citing_article.reference_bbox = self.processor.find_reference_bbox(
-                ref_page_num, 
-                ref_num,
-                self.source
-            )
+        Returns:
+            bool: Sonuç önbellekten uygulandıysa True
+        """
+        return self._apply_cached_result(self._result_key(pdf_path), pdf_path, citing_article)
+    
+    def _apply_cached_result(self, result_key: Optional[str], pdf_path: str,
+                             citing_article: CitingArticle) -> bool:
+        if not result_key:
+            return False
+        fields = self.result_cache.get_analysis(result_key)
+        if fields is None:
+            return False
+        for name, value in fields.items():
+            if name != 'found':
+                setattr(citing_article, name, value)
+        citing_article.pdf_path = pdf_path
+        self.cache_hits += 1
+        return True
+    
+    def _result_key(self, pdf_path: str) -> Optional[str]:
+        """Analiz sonucunu belirleyen girdilerin anahtarı (önbellek kapalıysa None)"""
+        if not self.result_cache:
+            return None
+        try:
+            pdf_hash = cached_file_sha256(pdf_path)
+        except OSError:
+            return None
+        inputs = {
+            'pdf': pdf_hash,
+            'doi': self.source.doi,
+            'authors': self.source.authors,
+            'year': self.source.year,
+            'version': f"{ANALYSIS_VERSION}-{EXTRACTOR_VERSION}-pdfplumber{pdfplumber_version()}",
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _fill_citation_info(self, pdf_path: str, citing_article: CitingArticle) -> Tuple[CitingArticle, bool]:
+        """
+        Yüklenmiş PDF'ten atıf bilgilerini makaleye işle
         
-        return citing_article
+        Returns:
+            (güncellenmiş makale, kaynakça girişi bulundu mu)
+        """
+        result = self.processor.find_citation_info(self.source, scanner=self.scanner)
+        return _apply_citation_result(self.processor, self.source, pdf_path, citing_article, result), bool(result)
     
     def get_required_pages(self, citing_article: CitingArticle) -> List[int]:
         """2025 yeni kriterlerine göre gerekli sayfaları döndür"""
@@ -754,6 +1055,144 @@ class CitationFinder:
         return sorted(pages)
 
 
+def _apply_citation_result(processor: PDFProcessor, source_article: SourceArticle, pdf_path: str,
+                           citing_article: CitingArticle, result) -> CitingArticle:
+    """find_citation_info sonucunu atıf yapan makaleye işle"""
+    citing_article.pdf_path = pdf_path
+    
+    # Başlık sayfası (1. sayfa)
+    citing_article.title_page = 1
+    
+    if result:
+        ref_page_num, ref_num, citation_list = result
+        citing_article.reference_number = ref_num
+        citing_article.reference_page = ref_page_num
+        
+        # Tüm atıf sayfalarını kaydet
+        citing_article.citation_pages = [cp[0] for cp in citation_list]
+        citing_article.citation_bboxes = [cp[1] for cp in citation_list if cp[1]]
+        
+        # Referans bbox bul
+        with processor.metrics.phase("bbox"):
+            citing_article.reference_bbox = processor.find_reference_bbox(
+                ref_page_num, 
+                ref_num,
+                source_article
+            )
+    
+    return citing_article
+
+
+class MultiSourceCitationFinder:
+    """
+    Çoklu kaynak atıf bulucu
+    
+    Adayın birden çok makalesine aynı PDF'te atıf yapılmış olabilir; PDF
+    her kaynak için ayrı ayrı değil, tüm kaynaklar için bir kez yüklenip
+    taranır. Sonuçlar kaynak makale sırasıyla döner.
+    """
+    
+    def __init__(self, source_articles: List[SourceArticle]):
+        self.sources = list(source_articles)
+        self.processor = PDFProcessor()
+        self.scanners = [CitationScanner(source) for source in self.sources]
+        self.multi_scanner = MultiSourceScanner(self.scanners)
+        self.metrics = PDFMetrics()  # Son işlenen PDF'in ölçüm kaydı
+    
+    def process_pdf(self, pdf_path: str,
+                    citing_articles: Optional[List[Optional[CitingArticle]]] = None,
+                    profile_path: Optional[str] = None) -> List[CitingArticle]:
+        """
+        PDF'i bir kez işle ve her kaynak makale için atıf bilgilerini doldur
+        
+        Args:
+            pdf_path: PDF dosyasının yolu
+            citing_articles: Her kaynak için (aynı sırada) doldurulacak atıf
+                yapan makale kaydı; None ise boş kayıt oluşturulur
+            profile_path: Verilirse analiz cProfile ile bu dosyaya dökülür
+            
+        Returns:
+            List[CitingArticle]: Kaynak makale sırasıyla güncellenmiş kayıtlar
+        """
+        self.metrics = PDFMetrics(pdf_path=pdf_path)
+        started = time.perf_counter()
+        try:
+            with profiled(profile_path):
+                return self._process_pdf(pdf_path, citing_articles)
+        finally:
+            self.metrics.total_seconds = time.perf_counter() - started
+            if METRICS_LOG_PATH:
+                append_metrics(self.metrics, METRICS_LOG_PATH)
+    
+    def _process_pdf(self, pdf_path: str,
+                     citing_articles: Optional[List[Optional[CitingArticle]]]) -> List[CitingArticle]:
+        if citing_articles is None:
+            citing_articles = [None] * len(self.sources)
+        articles = [article if article is not None else CitingArticle() for article in citing_articles]
+        
+        print(f"\n📄 PDF işleniyor ({len(self.sources)} kaynak): {os.path.basename(pdf_path)}")
+        
+        if not self.processor.load_pdf(pdf_path, self.metrics):
+            return articles
+        
+        try:
+            results = self.processor.find_citation_info_multi(self.scanners, multi_scanner=self.multi_scanner)
+            return [
+                _apply_citation_result(self.processor, source, pdf_path, article, result)
+                for source, article, result in zip(self.sources, articles, results)
+            ]
+        finally:
+            self.processor.close()
+
+
+# Paralel analizde işçiden ana sürece taşınan CitingArticle alanları
+CITATION_RESULT_FIELDS = (
+    'pdf_path', 'title_page', 'citation_pages', 'citation_bboxes',
+    'reference_page', 'reference_number', 'reference_bbox',
+)
+
+# Kaynakça girişi bulunamadığında analizin yazdığı tek alan
+NOT_FOUND_RESULT_FIELDS = ('title_page',)
+
+
+def _analysis_record(article: CitingArticle, found: bool) -> Dict:
+    """
+    Sonuç önbelleği kaydı: yalnızca _apply_citation_result'ın yazdığı alanlar
+    
+    Bulunamayan atıflar için makalede önceden kalan değerler yerine açık bir
+    "bulunamadı" kaydı (found=False) yazılır.
+    """
+    names = CITATION_RESULT_FIELDS if found else NOT_FOUND_RESULT_FIELDS
+    record = {name: getattr(article, name) for name in names if name != 'pdf_path'}
+    record['found'] = found
+    return record
+
+
+_worker_finder: Optional[CitationFinder] = None
+
+
+def _init_analysis_worker(source_article: SourceArticle):
+    """Süreç havuzu başlatıcısı: her işçide tek bir CitationFinder kur"""
+    global _worker_finder
+    _worker_finder = CitationFinder(source_article)
+
+
+def analyze_citing_pdf(index: int, citing_article: CitingArticle) -> Tuple[int, Dict]:
+    """
+    Süreç havuzu işçisi: tek bir atıf yapan PDF'i analiz et
+    
+    Returns:
+        (index, {alan adı: değer}) - ana süreç sonuçları bu sırayla uygular
+    """
+    result = _worker_finder.process_pdf(citing_article.pdf_path, citing_article)
+    return index, {name: getattr(result, name) for name in CITATION_RESULT_FIELDS}
+
+
+def source_for_workers(source_article: SourceArticle) -> SourceArticle:
+    """İşçilere gönderilecek, atıf listesi boşaltılmış kaynak makale kopyası"""
+    return dataclasses.replace(source_article, citing_articles=[])
+
+
 class PDFDownloadManager:
     """
     PDF indirme yöneticisi
@@ -764,6 +1203,7 @@ class PDFDownloadManager:
     def __init__(self, download_dir: str = None):
         self.download_dir = Path(download_dir) if download_dir else DOWNLOADS_DIR
         self.download_dir.mkdir(exist_ok=True)
+        self.doi_index = DOIIndex(self.download_dir)
     
     def get_expected_filename(self, article: CitingArticle) -> str:
         """Beklenen dosya adını oluştur"""
@@ -777,31 +1217,40 @@ class PDFDownloadManager:
             safe_title = re.sub(r'[<>:"/\\|?*]', '_', article.title[:50])
             return f"{safe_title}.pdf"
     
-    def check_pdf_exists(self, article: CitingArticle) -> Optional[str]:
+    def refresh_index(self) -> int:
+        """DOI indeksini güncelle (toplu kontrollerden önce bir kez çağrılır)"""
+        return self.doi_index.refresh()
+    
+    def find_pdf_for_article(self, article: CitingArticle) -> Optional[str]:
         """
-        PDF'in indirilip indirilmediğini kontrol et
+        Makaleye ait indirilmiş PDF'i bul
+        
+        Önce beklenen dosya adları (10_1111_adj_70022.pdf veya kullanıcıya
+        önerilen 10.1111_adj.70022.pdf), sonra DOI indeksi kontrol edilir.
         
         Returns:
             str: Dosya yolu veya None
         """
-        expected_name = self.get_expected_filename(article)
-        expected_path = self.download_dir / expected_name
+        candidates = [self.get_expected_filename(article)]
+        if article.doi:
+            candidates.append(f"{article.doi.replace('/', '_')}.pdf")
         
-        if expected_path.exists():
-            return str(expected_path)
+        for name in candidates:
+            expected_path = self.download_dir / name
+            if expected_path.exists():
+                return str(expected_path)
         
         # DOI ile ara (farklı dosya adı olabilir)
-        if article.doi:
-            for pdf_file in self.download_dir.glob("*.pdf"):
-                try:
-                    with pdfplumber.open(pdf_file) as pdf:
-                        first_page = pdf.pages[0].extract_text() or ""
-                        if article.doi in first_page:
-                            return str(pdf_file)
-                except:
-                    continue
+        return self.doi_index.find(article.doi)
+    
+    def check_pdf_exists(self, article: CitingArticle) -> Optional[str]:
+        """
+        PDF'in indirilip indirilmediğini kontrol et
         
-        return None
+        Returns:
+            str: Dosya yolu veya None
+        """
+        return self.find_pdf_for_article(article)
     
     def list_downloaded_pdfs(self) -> List[str]:
         """İndirilen PDF'lerin listesini döndür"""
@@ -810,12 +1259,54 @@ class PDFDownloadManager:
     def get_missing_pdfs(self, articles: List[CitingArticle]) -> List[CitingArticle]:
         """İndirilmemiş PDF'lerin listesini döndür"""
         missing = []
+        self.refresh_index()
         for article in articles:
             if not self.check_pdf_exists(article):
                 missing.append(article)
         return missing
 
 
+class DownloadWatcher:
+    """
+    İndirme klasörü izleyicisi (mtime/boyut yoklaması)
+    
+    Yeni veya değişmiş bir PDF, boyutu ve mtime'ı iki ardışık yoklamada
+    aynı kaldığında (indirme bitmiş) bir kez bildirilir.
+    """
+    
+    def __init__(self, download_dir: Path):
+        self.download_dir = Path(download_dir)
+        self._known: Dict[str, Tuple[int, int]] = {}    # Bildirilmiş (veya başlangıçta var olan) hal
+        self._pending: Dict[str, Tuple[int, int]] = {}  # Son yoklamada görülen, henüz kararlı değil
+    
+    def prime(self):
+        """Klasördeki mevcut dosyaları bilinen olarak işaretle"""
+        self._known = pdf_file_stats(self.download_dir)
+        self._pending = {}
+    
+    def poll(self) -> List[str]:
+        """Son yoklamadan beri kararlı hale gelen yeni/değişmiş PDF yolları"""
+        snapshot = pdf_file_stats(self.download_dir)
+        ready = []
+        
+        for name, stat in snapshot.items():
+            if self._known.get(name) == stat:
+                continue
+            if self._pending.get(name) == stat and stat[0] > 0:
+                del self._pending[name]
+                self._known[name] = stat
+                ready.append(str(self.download_dir / name))
+            else:
+                self._pending[name] = stat
+        
+        # Silinen dosyaları unut
+        for table in (self._known, self._pending):
+            for name in [n for n in table if n not in snapshot]:
+                del table[name]
+        
+        return sorted(ready)
+
+
 # ============================================================================
 # TEST FONKSİYONU
 # ============================================================================
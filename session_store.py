@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+OTURUM DEPOSU MODÜLÜ
+====================
+CLI oturumunun (aday, kaynak makale, atıf yapan makaleler) SQLite'ta saklanması
+
+İşlevler:
+- Her atıf yapan makalenin sonucunu hesaplandığı anda tek satır olarak
+  kaydetme (çökme durumunda yalnızca işlenmekte olan PDF kaybolur)
+- Dataclass'ların tüm alanlarını (citation_bboxes, cover_pages_all vb.)
+  kayıpsız saklama ve geri yükleme
+- Oturum özetini (başlık, atıf sayısı) makaleleri çözmeden okuma
+- Makaleleri tembel yükleme (her satır ilk erişimde çözülür)
+- Eski session_data.json oturumunu ilk açılışta içe aktarma
+
+Her yazma tek bir SQLite işlemidir; dosya hiçbir zaman yarım yazılmış
+durumda kalmaz.
+"""
+
+import json
+import sqlite3
+from collections.abc import Sequence
+from dataclasses import asdict, fields, replace
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from config import (
+    CandidateInfo, CitingArticle, SourceArticle, OUTPUT_DIR, SESSION_DB_PATH
+)
+
+LEGACY_SESSION_PATH = OUTPUT_DIR / "session_data.json"
+
+
+def _from_dict(cls, data: dict):
+    """Dataclass'ı bilinen alanlarla oluştur (eski/yeni sürüm alanları yok sayılır)"""
+    names = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in data.items() if k in names})
+
+
+def _source_dict(source: SourceArticle) -> dict:
+    # Makale listesi ayrı tabloda; asdict onu (tembel liste dahil) kopyalamasın
+    return asdict(replace(source, citing_articles=[]))
+
+
+class LazyArticleList(Sequence):
+    """
+    Satırları ilk erişimde CitingArticle'a çözen makale listesi
+
+    Çözülen nesne saklanır; üzerindeki değişiklikler sonraki erişimlerde
+    görülür. Ham JSON tutulduğu için liste süreçler arasında taşınabilir.
+    """
+
+    def __init__(self, rows: List[str]):
+        self._rows = rows
+        self._articles: List[Optional[CitingArticle]] = [None] * len(rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._rows)
+        if not 0 <= index < len(self._rows):
+            raise IndexError("article index out of range")
+
+        article = self._articles[index]
+        if article is None:
+            article = self._articles[index] = _from_dict(CitingArticle, json.loads(self._rows[index]))
+        return article
+
+
+class SessionStore:
+    """
+    SQLite oturum deposu
+
+    meta tablosu aday ve kaynak makaleyi, articles tablosu atıf yapan
+    makaleleri (1 tabanlı sıra ile, satır başına bir JSON) tutar.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS articles (
+            idx INTEGER PRIMARY KEY,
+            data TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, db_path: Optional[Path] = None, legacy_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else SESSION_DB_PATH
+        self.legacy_path = Path(legacy_path) if legacy_path else LEGACY_SESSION_PATH
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Bağlantıyı (ilk kullanımda) aç"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self._SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    def exists(self) -> bool:
+        """Kaydedilmiş (veya içe aktarılabilecek eski) bir oturum var mı?"""
+        if self.db_path.exists() and self._get_meta('source_article') is not None:
+            return True
+        return self.legacy_path.exists()
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def summary(self) -> Optional[dict]:
+        """Makaleleri çözmeden oturum özeti: {title, article_count, saved_at}"""
+        self._migrate_legacy()
+        source = self._get_meta('source_article')
+        if source is None:
+            return None
+        count = self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        return {
+            'title': json.loads(source).get('title', ''),
+            'article_count': count,
+            'saved_at': self._get_meta('saved_at') or '',
+        }
+
+    def load(self) -> Tuple[Optional[CandidateInfo], Optional[SourceArticle]]:
+        """
+        Oturumu yükle (gerekirse önce eski JSON oturumunu içe aktar)
+
+        Atıf yapan makaleler LazyArticleList olarak döner; satırlar okunur
+        ama her makale ilk erişimde çözülür.
+        """
+        self._migrate_legacy()
+
+        candidate = None
+        raw = self._get_meta('candidate')
+        if raw is not None:
+            candidate = _from_dict(CandidateInfo, json.loads(raw))
+
+        raw = self._get_meta('source_article')
+        if raw is None:
+            return candidate, None
+        source = _from_dict(SourceArticle, json.loads(raw))
+        source.citing_articles = LazyArticleList([
+            data for (data,) in self._connect().execute("SELECT data FROM articles ORDER BY idx")
+        ])
+        return candidate, source
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+
+    def save(self, candidate: Optional[CandidateInfo], source: SourceArticle) -> bool:
+        """Tüm oturumu tek işlemde yaz (makale listesi değiştiğinde)"""
+        return self._transaction(self._write_all, candidate, source)
+
+    def save_meta(self, candidate: Optional[CandidateInfo], source: SourceArticle) -> bool:
+        """Yalnızca aday ve kaynak makaleyi yaz (makale satırlarına dokunmaz)"""
+        return self._transaction(self._write_meta, candidate, source)
+
+    def save_article(self, index: int, article: CitingArticle) -> bool:
+        """Tek bir atıf yapan makaleyi (1 tabanlı sıra) kaydet"""
+        return self._transaction(self._write_article, index, article)
+
+    def _transaction(self, write, *args) -> bool:
+        """write(conn, ...) çağrısını tek işlemde çalıştır; hata olursa geri al"""
+        try:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                write(conn, *args)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return True
+        except sqlite3.Error as e:
+            print(f"⚠️  Oturum kaydetme hatası: {e}")
+            return False
+
+    def _write_all(self, conn, candidate: Optional[CandidateInfo], source: SourceArticle):
+        self._write_meta(conn, candidate, source)
+        conn.execute("DELETE FROM articles")
+        conn.executemany(
+            "INSERT INTO articles (idx, data) VALUES (?, ?)",
+            [
+                (i, json.dumps(asdict(article), ensure_ascii=False))
+                for i, article in enumerate(source.citing_articles, 1)
+            ]
+        )
+
+    def _write_article(self, conn, index: int, article: CitingArticle):
+        conn.execute(
+            "INSERT OR REPLACE INTO articles (idx, data) VALUES (?, ?)",
+            (index, json.dumps(asdict(article), ensure_ascii=False))
+        )
+        self._set_meta(conn, 'saved_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    def _write_meta(self, conn, candidate: Optional[CandidateInfo], source: SourceArticle):
+        if candidate is not None:
+            self._set_meta(conn, 'candidate', json.dumps(asdict(candidate), ensure_ascii=False))
+        self._set_meta(conn, 'source_article', json.dumps(_source_dict(source), ensure_ascii=False))
+        self._set_meta(conn, 'saved_at', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    @staticmethod
+    def _set_meta(conn, key: str, value: str):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ------------------------------------------------------------------
+    # Eski JSON oturumu
+    # ------------------------------------------------------------------
+
+    def _migrate_legacy(self) -> bool:
+        """Depo boşsa session_data.json içeriğini depoya aktar"""
+        if self._get_meta('source_article') is not None or not self.legacy_path.exists():
+            return False
+        try:
+            with open(self.legacy_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Eski oturum dosyası okunamadı: {e}")
+            return False
+        if not data.get('source_article'):
+            return False
+
+        candidate = _from_dict(CandidateInfo, data['candidate']) if data.get('candidate') else None
+        source = _from_dict(SourceArticle, data['source_article'])
+        source.citing_articles = [
+            _from_dict(CitingArticle, a) for a in data.get('citing_articles', [])
+        ]
+        if not self.save(candidate, source):
+            return False
+        if data.get('saved_at'):
+            self._set_meta(self._connect(), 'saved_at', data['saved_at'])
+        print(f"📦 Eski oturum dosyası içe aktarıldı: {self.legacy_path.name}")
+        return True
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Kalıcı Python İşçisi
+====================
+Web arayüzünün her PDF yüklemesinde yeni bir Python süreci başlatması
+yerine, ağır kütüphaneleri (pdfplumber, pypdf, reportlab) bir kez yükleyip
+stdin'den gelen istekleri sırayla işleyen uzun ömürlü işçi.
+
+Protokol (satır başına bir JSON):
+    İstek:
+        {"id": 1, "command": "check_citation", "pdf_path": "...", "article_data": {...}}
+        {"id": 6, "command": "check_citation", "pdf_path": "...", "article_data": {...}, "sources": [{...}, ...]}
+        {"id": 2, "command": "extract_doi", "pdf_path": "..."}
+        {"id": 5, "command": "check_citation_batch", "article_data": {...}, "pdfs": [...]}
+        {"id": 3, "command": "ping"}
+        {"id": 4, "command": "shutdown"}
+    Yanıt:
+        {"id": 1, "result": {...}}
+
+    "result", check_citation_cli.py / extract_doi.py betiklerinin tek
+    seferlik çalıştırmada yazdığı JSON ile aynıdır. Toplu istekte her PDF
+    için önce {"id": 5, "item": {...}} satırları, en sonda özet içeren
+    {"id": 5, "result": {...}} satırı yazılır. İşçi hazır olduğunda
+    ilk satır olarak {"event": "ready", "pid": ...} yazar.
+
+Kullanım:
+    python worker_cli.py
+"""
+
+import sys
+import os
+import json
+
+# Proje kökünü path'e ekle (betik başka dizinden çalıştırılabilir)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from check_citation_cli import run_check, run_batch
+from extract_doi import run_extract
+
+
+def handle_request(request):
+    """Tek bir isteği işle ve yanıt sonucunu döndür"""
+    command = request.get('command')
+
+    if command == 'check_citation':
+        return run_check(request)
+    if command == 'extract_doi':
+        return run_extract(request.get('pdf_path'))
+    if command == 'ping':
+        return {"status": "ok"}
+
+    return {"status": "error", "message": f"Unknown command: {command}"}
+
+
+def preload():
+    """
+    Ağır PDF kütüphanelerini "ready" olayından önce yükle
+
+    Modüller bu kütüphaneleri tembel içe aktarır (CLI'lar hızlı açılsın
+    diye); kalıcı işçide ise bedel ilk istek yerine açılışta ödenmelidir.
+    """
+    import pdfplumber
+    import pypdf
+    import reportlab.pdfgen.canvas
+    from pdf_processor import pdfplumber_version
+    pdfplumber_version()
+
+
+def serve(stdin=None, stdout=None):
+    """
+    İstekleri EOF veya 'shutdown' komutuna kadar işle
+
+    Protokol çıktısı dışındaki tüm print'ler stderr'e yönlendirilir,
+    böylece stdout yalnızca yanıt satırlarını içerir.
+    """
+    stdin = stdin or sys.stdin
+    out = stdout or sys.stdout
+    sys.stdout = sys.stderr
+
+    def respond(payload):
+        out.write(json.dumps(payload) + "\n")
+        out.flush()
+
+    preload()
+    respond({"event": "ready", "pid": os.getpid()})
+
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            respond({"id": None, "result": {"status": "error", "message": f"Invalid JSON: {e}"}})
+            continue
+        if not isinstance(request, dict):
+            respond({"id": None, "result": {"status": "error", "message": "Request must be a JSON object"}})
+            continue
+
+        request_id = request.get('id')
+        if request.get('command') == 'shutdown':
+            respond({"id": request_id, "result": {"status": "ok"}})
+            break
+
+        try:
+            if request.get('command') == 'check_citation_batch':
+                result = run_batch(request, lambda item: respond({"id": request_id, "item": item}))
+            else:
+                result = handle_request(request)
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+
+        respond({"id": request_id, "result": result})
+
+
+if __name__ == "__main__":
+    serve()